@@ -0,0 +1,8 @@
+"""
+GURT client benchmarks
+
+Run from the python-client directory:
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline results.json   # flag regressions against a stored run
+"""
@@ -0,0 +1,99 @@
+"""
+Benchmark runner
+
+    python -m benchmarks [--suite micro|e2e|startup|all] [--quick] [--filter TEXT]
+                         [--output results.json] [--baseline old.json] [--threshold 0.1]
+
+Exits with status 1 when a baseline is given and any checked metric got
+worse by more than the threshold.
+"""
+
+import argparse
+import fnmatch
+import logging
+import sys
+
+from . import bench_e2e, bench_message, bench_startup
+from .harness import DEFAULT_THRESHOLD, compare, format_duration, load_results, write_results
+
+SUITES = {
+    "micro": bench_message.run,
+    "e2e": bench_e2e.run,
+    "startup": bench_startup.run,
+}
+
+
+def _print_result(result) -> None:
+    metrics = result.metrics
+    if result.kind == "micro":
+        line = f"{format_duration(metrics['median']):>10}/op  ±{metrics['stdev'] / metrics['median'] * 100:4.1f}%"
+        if "mb_per_sec" in metrics:
+            line += f"  {metrics['mb_per_sec']:9.1f} MB/s"
+    elif result.kind == "startup":
+        line = f"{format_duration(metrics['median']):>10}     best {format_duration(metrics['best'])}"
+        if "request" in metrics:
+            line += (f"  (import {format_duration(metrics['import'])}, client {format_duration(metrics['client'])},"
+                     f" request {format_duration(metrics['request'])})")
+    else:
+        line = (
+            f"{metrics['rps']:9.0f} req/s  p50 {format_duration(metrics['p50'])}"
+            f"  p90 {format_duration(metrics['p90'])}  p99 {format_duration(metrics['p99'])}"
+        )
+        if metrics["errors"]:
+            line += f"  errors {metrics['errors']}"
+    print(f"{result.name:<48} {line}", flush=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="GURT client benchmarks")
+    parser.add_argument("--suite", choices=["all", *SUITES], default="all")
+    parser.add_argument("--quick", action="store_true", help="Shorter runs and fewer sizes")
+    parser.add_argument("--filter", action="append", metavar="PATTERN",
+                        help="Only run cases whose name matches this glob (repeatable)")
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", "-b", help="Compare against results from an earlier run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Relative change that counts as a regression (default {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    # Clients here run without certificate verification against the self-signed stand-in
+    logging.getLogger("gurt.client").setLevel(logging.ERROR)
+
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    selected = None
+    if args.filter:
+        selected = lambda name: any(fnmatch.fnmatchcase(name, pattern) for pattern in args.filter)
+
+    results = []
+    for suite, run in SUITES.items():
+        if args.suite in ("all", suite):
+            for result in run(quick=args.quick, selected=selected):
+                _print_result(result)
+                results.append(result)
+
+    if args.output:
+        write_results(args.output, results)
+        print(f"\nResults written to {args.output}")
+
+    if baseline is None:
+        return 0
+
+    comparisons = compare(baseline, results, args.threshold)
+    regressions = [c for c in comparisons if c.regression]
+    improvements = [c for c in comparisons if c.improvement]
+
+    print(f"\nCompared {len(comparisons)} metrics with {args.baseline} (threshold {args.threshold:.0%})")
+    for label, changes in (("Regressions", regressions), ("Improvements", improvements)):
+        if changes:
+            print(f"{label}:")
+            for c in changes:
+                print(f"  {c.name} {c.metric}: {c.baseline:.6g} -> {c.current:.6g} ({c.change:+.1%})")
+    if not regressions:
+        print("No regressions")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
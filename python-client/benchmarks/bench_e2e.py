@@ -0,0 +1,123 @@
+"""
+End-to-end request throughput and latency against the local stand-in server
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from gurt.client import GurtClient, GurtClientConfig
+
+from .harness import Result, LOWER, HIGHER, percentiles
+from .standin import StandinServer
+
+
+class Scenario:
+    """One load shape: request, connection reuse and concurrency"""
+
+    def __init__(self, name: str, path: str = "/", method: str = "GET", body_size: int = 0,
+                 reuse: bool = True, concurrency: int = 1):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.body_size = body_size
+        self.reuse = reuse
+        self.concurrency = concurrency
+
+    @property
+    def params(self):
+        return {
+            "path": self.path,
+            "method": self.method,
+            "body_size": self.body_size,
+            "reuse": self.reuse,
+            "concurrency": self.concurrency,
+        }
+
+
+SCENARIOS = [
+    Scenario("e2e.get[reuse,c=1]"),
+    Scenario("e2e.get[reuse,c=8]", concurrency=8),
+    Scenario("e2e.get[no-reuse,c=1]", reuse=False),
+    Scenario("e2e.get[no-reuse,c=8]", reuse=False, concurrency=8),
+    Scenario("e2e.get_1mb[reuse,c=1]", path="/bytes?n=1000000"),
+    Scenario("e2e.post_1mb[reuse,c=1]", method="POST", body_size=1_000_000),
+]
+
+
+def _worker(client: GurtClient, url: str, scenario: Scenario, body: bytes, deadline: float,
+            latencies: List[float], errors: List[BaseException]) -> None:
+    perf_counter = time.perf_counter
+    while perf_counter() < deadline:
+        start = perf_counter()
+        try:
+            if scenario.method == "POST":
+                response = client.post(url, body, content_type="application/octet-stream")
+            else:
+                response = client.get(url)
+            if not response.is_success():
+                raise RuntimeError(f"Unexpected status {response.status_code}")
+        except Exception as e:
+            errors.append(e)
+            continue
+        latencies.append(perf_counter() - start)
+
+
+def run_scenario(port: int, scenario: Scenario, duration: float, warmup: float) -> Result:
+    config = GurtClientConfig(
+        enable_connection_pooling=scenario.reuse,
+        max_connections_per_host=max(scenario.concurrency, 1),
+    )
+    client = GurtClient(config)
+    url = f"gurt://127.0.0.1:{port}{scenario.path}"
+    body = b"x" * scenario.body_size
+
+    def phase(seconds: float):
+        latencies: List[float] = []
+        errors: List[BaseException] = []
+        deadline = time.perf_counter() + seconds
+        threads = [
+            threading.Thread(target=_worker, args=(client, url, scenario, body, deadline, latencies, errors))
+            for _ in range(scenario.concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors, time.perf_counter() - started
+
+    try:
+        if warmup:
+            phase(warmup)
+        before = client.tls_session_stats()
+        latencies, errors, elapsed = phase(duration)
+        sessions = client.tls_session_stats()
+    finally:
+        client.close()
+
+    metrics = percentiles(latencies)
+    metrics["requests"] = len(latencies)
+    metrics["errors"] = len(errors)
+    metrics["rps"] = len(latencies) / elapsed
+    metrics["tls_full_handshakes"] = sessions["full_handshakes"] - before["full_handshakes"]
+    metrics["tls_resumed"] = sessions["resumed"] - before["resumed"]
+
+    if errors:
+        logging.getLogger(__name__).warning(f"{scenario.name}: {len(errors)} errors, first: {errors[0]!r}")
+
+    return Result(scenario.name, "e2e", metrics, {"rps": HIGHER, "p50": LOWER, "p99": LOWER},
+                  scenario.params)
+
+
+def run(quick: bool = False, selected: Optional[Callable[[str], bool]] = None) -> List[Result]:
+    """Run the end-to-end scenarios against a freshly started stand-in server"""
+    duration = 1.0 if quick else 5.0
+    warmup = 0.2 if quick else 1.0
+    scenarios = [s for s in SCENARIOS if selected is None or selected(s.name)]
+    if not scenarios:
+        return []
+
+    with StandinServer() as server:
+        return [run_scenario(server.port, scenario, duration, warmup) for scenario in scenarios]
@@ -0,0 +1,178 @@
+"""
+Microbenchmarks of message serialization and parsing
+"""
+
+from typing import Callable, List, Optional
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.codec import StdlibJSONCodec, OrjsonCodec, iter_json_items
+from gurt.message import GurtRequest, GurtResponse, GurtMethod, GurtParser
+from gurt.protocol import GurtStatusCode, DEFAULT_READ_CHUNK_SIZE
+
+from .harness import Result, LOWER, time_function
+
+# Body sizes from empty to the 10 MB message limit (decimal, so headers still fit)
+BODY_SIZES = [0, 1_000, 100_000, 1_000_000, 10_000_000]
+HEADER_COUNTS = [2, 20, 80]
+QUICK_BODY_SIZES = [0, 100_000, 1_000_000]
+QUICK_HEADER_COUNTS = [2, 20]
+
+HANDSHAKE_RESPONSE = (
+    b"GURT/1.0.0 101 SWITCHING_PROTOCOLS\r\n"
+    b"gurt-version: 1.0.0\r\n"
+    b"encryption: TLS/1.3\r\n"
+    b"alpn: GURT/1.0\r\n"
+    b"server: GURT/1.0.0\r\n"
+    b"date: Thu, 01 Jan 2026 00:00:00 GMT\r\n"
+    b"\r\n"
+)
+
+
+def _headers(count: int):
+    """Headers typical of a client request, padded with custom ones"""
+    headers = [
+        ("host", "example.real"),
+        ("user-agent", "GURT-Python-Client/1.0.0"),
+        ("content-type", "application/json"),
+        ("accept", "*/*"),
+    ][:count]
+    headers += [(f"x-custom-{i}", f"value-{i:04d}-abcdefghij") for i in range(count - len(headers))]
+    return headers
+
+
+def _request(headers: int, body_size: int) -> GurtRequest:
+    request = GurtRequest(GurtMethod.POST, "/api/v1/domains?page=1")
+    for key, value in _headers(headers):
+        request.with_header(key, value)
+    return request.with_body(b"x" * body_size)
+
+
+def _response(headers: int, body_size: int) -> GurtResponse:
+    response = GurtResponse.ok()
+    for key, value in _headers(headers):
+        response.with_header(key, value)
+    response.with_header("date", "Thu, 01 Jan 2026 00:00:00 GMT")
+    return response.with_body(b"x" * body_size)
+
+
+class _ReplaySocket:
+    """Socket stand-in that serves a fixed byte string through recv_into"""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.position = 0
+
+    def reset(self) -> '_ReplaySocket':
+        self.position = 0
+        return self
+
+    def recv_into(self, buffer, nbytes: int = 0) -> int:
+        view = memoryview(buffer)
+        nbytes = min(nbytes or len(view), len(view), len(self.data) - self.position)
+        view[:nbytes] = self.data[self.position:self.position + nbytes]
+        self.position += nbytes
+        return nbytes
+
+
+def _feed_parser(data: bytes) -> Callable[[], None]:
+    """Incremental parse in socket-sized pieces, as the client receives responses"""
+    view = memoryview(data)
+    chunk = DEFAULT_READ_CHUNK_SIZE
+
+    def run() -> None:
+        parser = GurtParser(max_message_size=len(data) + 1)
+        for offset in range(0, len(view), chunk):
+            parser.feed(view[offset:offset + chunk])
+
+    return run
+
+
+def _case(name: str, func: Callable[[], object], min_time: float, nbytes: int = 0,
+          **params) -> Result:
+    timing = time_function(func, min_time=min_time)
+    metrics = dict(timing)
+    metrics["ops_per_sec"] = 1 / timing["median"]
+    if nbytes:
+        metrics["mb_per_sec"] = nbytes / timing["median"] / 1e6
+    return Result(name, "micro", metrics, {"best": LOWER}, params)
+
+
+def run(quick: bool = False, selected: Optional[Callable[[str], bool]] = None) -> List[Result]:
+    """Run the message microbenchmarks; ``selected`` filters cases by name"""
+    min_time = 0.05 if quick else 0.2
+    body_sizes = QUICK_BODY_SIZES if quick else BODY_SIZES
+    header_counts = QUICK_HEADER_COUNTS if quick else HEADER_COUNTS
+    wanted = selected or (lambda name: True)
+    results = []
+
+    # Header count varies with an empty body, body size with a typical header set
+    shapes = [(h, 0) for h in header_counts] + [(header_counts[-1] // 4 or 1, b) for b in body_sizes if b]
+
+    for headers, body_size in shapes:
+        suffix = f"[headers={headers},body={body_size}]"
+
+        request = _request(headers, body_size)
+        request_bytes = request.to_bytes()
+        response = _response(headers, body_size)
+        response_bytes = response.to_bytes()
+
+        cases = [
+            ("request.to_bytes", request.to_bytes, len(request_bytes)),
+            ("request.parse", lambda data=request_bytes: GurtRequest.parse(data), len(request_bytes)),
+            ("response.to_bytes", response.to_bytes, len(response_bytes)),
+            ("response.parse", lambda data=response_bytes: GurtResponse.parse(data), len(response_bytes)),
+            ("parser.feed", _feed_parser(response_bytes), len(response_bytes)),
+        ]
+        for base, func, nbytes in cases:
+            name = base + suffix
+            if wanted(name):
+                results.append(_case(name, func, min_time, nbytes, headers=headers, body_size=body_size))
+
+    # Client-side work per request and per connection: the HANDSHAKE exchange and request building
+    client = GurtClient(GurtClientConfig(enable_connection_pooling=False, enable_tls_session_cache=False))
+    replay = _ReplaySocket(HANDSHAKE_RESPONSE)
+    if client._read_response(replay).status_code != GurtStatusCode.SWITCHING_PROTOCOLS:
+        raise RuntimeError("Handshake fixture did not parse as 101")
+
+    client_cases = [
+        ("handshake.request", lambda: client._create_handshake_request("example.real").to_bytes()),
+        ("handshake.parse", lambda: GurtResponse.parse(HANDSHAKE_RESPONSE)),
+        ("handshake.read_response", lambda: client._read_response(replay.reset())),
+        ("handshake.cached", lambda: client._handshake_data("example.real")),
+    ]
+
+    # A small JSON POST to a fixed endpoint: the get()/post() path against a prepared request
+    url = "gurt://example.real/api/v1/items"
+    prepared = client.prepare(GurtMethod.POST, url, content_type="application/json")
+
+    def build_request() -> bytes:
+        host, _, path = client._parse_gurt_url(url)
+        return client._build_request(GurtMethod.POST, host, path, b'{"id": 1}', "application/json").head_bytes()
+
+    client_cases += [
+        ("client.build_request", build_request),
+        ("client.prepared_request", lambda: prepared.build(b'{"id": 1}').head_bytes()),
+    ]
+    for name, func in client_cases:
+        if wanted(name):
+            results.append(_case(name, func, min_time))
+
+    # A DNS server /domains listing, decoded whole by each codec and item by item from chunks
+    listing = StdlibJSONCodec().dumps({"domains": [
+        {"name": f"site{i}", "tld": "web", "ip": f"10.0.{i // 256}.{i % 256}", "status": "approved"}
+        for i in range(1000)
+    ]})
+    chunks = [listing[i:i + DEFAULT_READ_CHUNK_SIZE] for i in range(0, len(listing), DEFAULT_READ_CHUNK_SIZE)]
+    codecs = [StdlibJSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        pass
+
+    json_cases = [(f"json.decode[codec={codec.name}]", lambda codec=codec: codec.loads(listing)) for codec in codecs]
+    json_cases.append(("json.iter_items", lambda: sum(1 for _ in iter_json_items(chunks, "domains"))))
+    for name, func in json_cases:
+        if wanted(name):
+            results.append(_case(name, func, min_time, len(listing)))
+
+    return results
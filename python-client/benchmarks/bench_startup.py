@@ -0,0 +1,100 @@
+"""
+Cold start: CLI start-up and the first request of a new process
+
+Each run is a fresh interpreter, so imports, TLS context set-up and the
+first connection are all paid again, as they are for a short-lived CLI
+call or a script that makes one request.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .harness import Result, LOWER
+from .standin import StandinServer
+
+CLIENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Reports its own phase times; run as ``python -c FIRST_REQUEST URL``
+FIRST_REQUEST = """
+import json, sys, time
+start = time.perf_counter()
+from gurt.client import GurtClient, GurtClientConfig
+imported = time.perf_counter()
+client = GurtClient(GurtClientConfig())
+created = time.perf_counter()
+response = client.get(sys.argv[1])
+done = time.perf_counter()
+assert response.is_success(), response.status_code
+print(json.dumps({"import": imported - start, "client": created - imported, "request": done - created}))
+"""
+
+
+def _run(args: List[str]) -> Tuple[float, str]:
+    """Wall time of one process, from spawn to exit, and its output"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], cwd=CLIENT_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)!r} failed: {result.stderr.strip()}")
+    return elapsed, result.stdout
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "runs": len(samples),
+    }
+
+
+def _timed_process(name: str, args: List[str], runs: int) -> Result:
+    _run(args)  # Warm the OS file cache and bytecode caches
+    return Result(name, "startup", _summary([_run(args)[0] for _ in range(runs)]), {"best": LOWER},
+                  {"command": " ".join(["python", *args])})
+
+
+def _first_request(port: int, runs: int) -> Result:
+    url = f"gurt://127.0.0.1:{port}/"
+    args = ["-c", FIRST_REQUEST, url]
+    _run(args)
+
+    totals = []
+    phases: Dict[str, List[float]] = {"import": [], "client": [], "request": []}
+    for _ in range(runs):
+        elapsed, output = _run(args)
+        totals.append(elapsed)
+        for phase, seconds in json.loads(output).items():
+            phases[phase].append(seconds)
+
+    metrics = _summary(totals)
+    for phase, samples in phases.items():
+        metrics[phase] = statistics.median(samples)
+    return Result("startup.first_request", "startup", metrics, {"best": LOWER, "client": LOWER},
+                  {"url": "gurt://127.0.0.1/ (stand-in)"})
+
+
+def run(quick: bool = False, selected: Optional[Callable[[str], bool]] = None) -> List[Result]:
+    """Time fresh processes: the bare interpreter for reference, CLI --help and a first request"""
+    runs = 5 if quick else 20
+    wanted = lambda name: selected is None or selected(name)
+
+    results = []
+    for name, args in (
+        ("startup.python", ["-c", "pass"]),
+        ("startup.import_gurt", ["-c", "import gurt"]),
+        ("startup.cli_help", ["gurt_cli.py", "--help"]),
+    ):
+        if wanted(name):
+            results.append(_timed_process(name, args, runs))
+
+    if wanted("startup.first_request"):
+        with StandinServer() as server:
+            results.append(_first_request(server.port, runs))
+    return results
@@ -0,0 +1,199 @@
+"""
+Timing, result files and baseline comparison shared by the benchmarks
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from gurt.protocol import GURT_VERSION
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.10  # Relative change counted as a regression
+
+# Metric directions: which way is better
+LOWER = "lower"
+HIGHER = "higher"
+
+
+class Result:
+    """Measurements of one benchmark case
+
+    ``metrics`` holds the numbers; ``compare`` names the metrics checked
+    against a baseline and whether lower or higher is better.
+    """
+
+    def __init__(self, name: str, kind: str, metrics: Dict[str, float], compare: Dict[str, str],
+                 params: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.metrics = metrics
+        self.compare = compare
+        self.params = params or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "params": self.params,
+            "metrics": self.metrics,
+            "compare": self.compare,
+        }
+
+
+def time_function(func: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """Time ``func`` like timeit: calibrate a loop count, then take ``repeat`` samples
+
+    Returns seconds per call (best, median, mean, stdev across samples) and
+    the number of calls per sample. The garbage collector is off while
+    timing so collections do not land in random samples.
+    """
+    loops = 1
+    while True:
+        elapsed = _run_loops(func, loops)
+        if elapsed >= min_time / 5 or loops >= 1 << 30:
+            break
+        loops *= 10 if elapsed < min_time / 50 else 2
+
+    loops = max(1, int(loops * (min_time / 5) / max(elapsed, 1e-9)))
+    samples = [_run_loops(func, loops) / loops for _ in range(repeat)]
+
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+    }
+
+
+def _run_loops(func: Callable[[], Any], loops: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """p50/p90/p99/max of a list of latencies in seconds"""
+    if not latencies:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+
+    ordered = sorted(latencies)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {
+        "p50": rank(50),
+        "p90": rank(90),
+        "p99": rank(99),
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Machine and build details stored with every run"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "gurt_version": GURT_VERSION,
+        "commit": _git_commit(),
+    }
+
+
+def write_results(path: str, results: List[Result]) -> None:
+    data = {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {data.get('version')}")
+    return data
+
+
+class Comparison:
+    """Change of one metric between a baseline and the current run"""
+
+    def __init__(self, name: str, metric: str, direction: str, baseline: float, current: float,
+                 threshold: float):
+        self.name = name
+        self.metric = metric
+        self.direction = direction
+        self.baseline = baseline
+        self.current = current
+        self.change = (current - baseline) / baseline if baseline else 0.0
+
+        worse = self.change if direction == LOWER else -self.change
+        self.regression = worse > threshold
+        self.improvement = -worse > threshold
+
+
+def compare(baseline: Dict[str, Any], results: List[Result],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """Compare the checked metrics of each result with the same case in ``baseline``
+
+    Cases missing from either side are skipped.
+    """
+    comparisons = []
+    stored = baseline.get("results", {})
+
+    for result in results:
+        previous = stored.get(result.name)
+        if previous is None:
+            continue
+        for metric, direction in result.compare.items():
+            if metric in previous["metrics"] and metric in result.metrics:
+                comparisons.append(Comparison(
+                    result.name, metric, direction,
+                    previous["metrics"][metric], result.metrics[metric], threshold
+                ))
+
+    return comparisons
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 1e-6:
+        return f"{seconds * 1e9:.0f}ns"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
@@ -0,0 +1,116 @@
+"""
+Local TLS GURT stand-in server for end-to-end benchmarks
+
+Runs gurt.server.GurtServer in its own process, so it does not compete
+with the client for the GIL:
+
+- ``/bytes?n=N`` returns N bytes
+- any other path returns a short body; request bodies are read and discarded
+
+    python -m benchmarks.standin --cert cert.pem --key key.pem [--port 0]
+
+The bound port is printed on the first line of stdout.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Optional, Tuple
+
+from gurt.message import GurtResponse
+from gurt.server import GurtServer
+
+
+def generate_certificate(directory: str) -> Tuple[str, str]:
+    """Create a self-signed certificate for localhost with openssl"""
+    if not shutil.which("openssl"):
+        raise RuntimeError("openssl is needed to generate the stand-in server certificate")
+
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+         "-nodes", "-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=localhost",
+         "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+def build_server(cert: str, key: str) -> GurtServer:
+    server = GurtServer(max_connections=4096).load_tls_certificates(cert, key)
+    bodies: Dict[int, bytes] = {}
+
+    @server.any("/bytes")
+    def sized(ctx):
+        size = int(ctx.path.partition("?n=")[2] or 0)
+        body = bodies.get(size)
+        if body is None:
+            body = bodies[size] = b"x" * size
+        return GurtResponse.ok().with_body(body)
+
+    @server.any("/*")
+    def default(ctx):
+        return GurtResponse.ok().with_body(b"ok")
+
+    return server
+
+
+async def serve(cert: str, key: str, port: int = 0) -> None:
+    server = build_server(cert, key)
+    await server.start("127.0.0.1", port)
+    print(server.port, flush=True)
+    await server.serve_forever()
+
+
+class StandinServer:
+    """Starts the stand-in server in a subprocess; use as a context manager"""
+
+    def __init__(self):
+        self.port = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._directory: Optional[str] = None
+
+    def __enter__(self) -> 'StandinServer':
+        self._directory = tempfile.mkdtemp(prefix="gurt-bench-")
+        cert, key = generate_certificate(self._directory)
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.standin", "--cert", cert, "--key", key],
+            stdout=subprocess.PIPE, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        line = self._process.stdout.readline()
+        if not line:
+            self.__exit__(None, None, None)
+            raise RuntimeError("Stand-in server failed to start")
+        self.port = int(line)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._process:
+            self._process.terminate()
+            self._process.wait()
+            self._process.stdout.close()
+        if self._directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GURT stand-in server for benchmarks")
+    parser.add_argument("--cert", required=True)
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.cert, args.key, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -73,11 +73,10 @@ def upload_file_example():
 
 
 def batch_requests_example():
-    """Example of making multiple requests"""
+    """Example of making multiple requests concurrently"""
     print("=== Batch Requests Example ===")
     
     config = GurtClientConfig(verify_tls=False, request_timeout=5.0)
-    client = GurtClient(config)
     
     endpoints = [
         "gurt://localhost:4878/",
@@ -88,26 +87,26 @@ def batch_requests_example():
     
     results = []
     
-    for endpoint in endpoints:
-        try:
-            print(f"Requesting {endpoint}...")
-            response = client.get(endpoint)
-            results.append({
-                "url": endpoint,
-                "status": response.status_code,
-                "success": response.is_success(),
-                "response_length": len(response.body)
-            })
-            print(f"  -> {response.status_code} {response.status_message}")
-            
-        except GurtError as e:
-            results.append({
-                "url": endpoint,
-                "status": None,
-                "success": False,
-                "error": str(e)
-            })
-            print(f"  -> Error: {e}")
+    with GurtClient(config) as client:
+        # Requests run in parallel; results arrive as each one completes
+        for result in client.fetch_many(endpoints, max_concurrency=4, per_host_limit=4):
+            if result.ok:
+                response = result.response
+                results.append({
+                    "url": result.request.url,
+                    "status": response.status_code,
+                    "success": response.is_success(),
+                    "response_length": len(response.body)
+                })
+                print(f"{result.request.url} -> {response.status_code} {response.status_message}")
+            else:
+                results.append({
+                    "url": result.request.url,
+                    "status": None,
+                    "success": False,
+                    "error": str(result.error)
+                })
+                print(f"{result.request.url} -> Error: {result.error}")
     
     print("\nBatch Results Summary:")
     successful = sum(1 for r in results if r.get("success", False))
@@ -2,22 +2,61 @@
 GURT Python Client
 
 A Python implementation of the GURT protocol for connecting to the Gurted network.
+
+Names are imported from their submodules on first use, so ``import gurt``
+stays cheap and the sync client never loads asyncio or the server.
 """
 
-from .client import GurtClient, GurtClientConfig
-from .message import GurtRequest, GurtResponse, GurtMethod
-from .protocol import GURT_VERSION, DEFAULT_PORT, GurtStatusCode
-from .errors import GurtError
+from importlib import import_module
+from typing import Any, List
 
 __version__ = "1.0.0"
-__all__ = [
-    "GurtClient",
-    "GurtClientConfig",
-    "GurtRequest", 
-    "GurtResponse",
-    "GurtMethod",
-    "GurtStatusCode",
-    "GurtError",
-    "GURT_VERSION",
-    "DEFAULT_PORT"
-]
\ No newline at end of file
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "GurtClient": "client",
+    "GurtClientConfig": "client",
+    "AsyncGurtClient": "async_client",
+    "GurtRequest": "message",
+    "GurtResponse": "message",
+    "GurtMethod": "message",
+    "GurtHeaders": "headers",
+    "JSONCodec": "codec",
+    "StdlibJSONCodec": "codec",
+    "OrjsonCodec": "codec",
+    "iter_json_items": "codec",
+    "GurtStatusCode": "protocol",
+    "GurtError": "errors",
+    "GurtDNSResolver": "dns",
+    "BatchRequest": "batch",
+    "BatchResult": "batch",
+    "PreparedRequest": "prepared",
+    "ResponseCache": "cache",
+    "RetryPolicy": "retry",
+    "RetryBudget": "retry",
+    "RateLimiter": "ratelimit",
+    "CircuitBreaker": "circuit",
+    "CircuitState": "circuit",
+    "Hooks": "hooks",
+    "LatencyCollector": "hooks",
+    "GurtServer": "server",
+    "ServerContext": "server",
+    "Route": "server",
+    "GURT_VERSION": "protocol",
+    "DEFAULT_PORT": "protocol",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,423 @@
+"""
+GURT asyncio client implementation with TLS 1.3 and handshake support
+"""
+
+import asyncio
+import ssl
+import time
+from typing import Optional, Set, Tuple, Any, AsyncIterator, Iterable
+import logging
+
+from .protocol import GURT_ALPN
+from .message import GurtRequest, GurtResponse, GurtMethod, GurtParser, BodyChunk
+from .pool import AsyncConnectionPool
+from .cache import CacheEntry, ResponseCache
+from .batch import BatchItem, BatchResult, DEFAULT_BATCH_CONCURRENCY, async_fetch_many
+from .client import GurtClientConfig, RequestBody, _GurtClientBase, _StaleConnectionError
+from .errors import (
+    GurtError, GurtConnectionError, GurtTimeoutError,
+    GurtTLSError, GurtHandshakeError, GurtProtocolError
+)
+
+logger = logging.getLogger(__name__)
+
+Streams = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncGurtClient(_GurtClientBase):
+    """GURT protocol client for asyncio with TLS 1.3 support"""
+
+    def __init__(self, config: Optional[GurtClientConfig] = None):
+        super().__init__(config)
+        self._pool: Optional[AsyncConnectionPool] = None
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+        if self.config.enable_connection_pooling:
+            self._pool = AsyncConnectionPool(
+                max_connections_per_host=self.config.max_connections_per_host,
+                idle_timeout=self.config.pool_idle_timeout
+            )
+
+    async def close(self) -> None:
+        """Close all pooled connections"""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._pool:
+            await self._pool.close()
+
+    async def __aenter__(self) -> 'AsyncGurtClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _resolve(self, host: str) -> str:
+        """Resolve through the configured resolver without blocking the event loop"""
+        resolver = self.config.resolver
+        if not resolver:
+            return host
+
+        address = resolver.cached(host)
+        if address:
+            return address
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, resolver.resolve, host)
+
+    async def _create_connection(self, host: str, port: int) -> Streams:
+        """Create a TCP connection to the host"""
+        address = await self._resolve(host)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.open_connection(address, port),
+                timeout=self.config.connection_timeout
+            )
+        except asyncio.TimeoutError:
+            raise GurtTimeoutError(f"Connection timeout to {host}:{port}")
+        except OSError as e:
+            raise GurtConnectionError(f"Failed to connect to {host}:{port}: {e}")
+
+    async def _start_tls(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str) -> Streams:
+        """Upgrade the plaintext streams to TLS in place"""
+        if hasattr(writer, "start_tls"):
+            # Python 3.11+ wraps loop.start_tls and rebinds the stream pair itself
+            await writer.start_tls(self._ssl_context, server_hostname=host)
+            return reader, writer
+
+        loop = asyncio.get_running_loop()
+        protocol = writer.transport.get_protocol()
+        transport = await loop.start_tls(
+            writer.transport, protocol, self._ssl_context, server_hostname=host
+        )
+        return reader, asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    async def _perform_handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str) -> Streams:
+        """Perform GURT handshake and upgrade to TLS"""
+        try:
+            # Send handshake request in plaintext
+            logger.debug(f"Sending handshake request to {host}")
+            writer.write(self._handshake_data(host))
+            await writer.drain()
+
+            handshake_response = await asyncio.wait_for(
+                self._read_response(reader),
+                timeout=self.config.handshake_timeout
+            )
+
+            if handshake_response.status_code != 101:  # Switching Protocols
+                raise GurtHandshakeError(
+                    f"Handshake failed: {handshake_response.status_code} {handshake_response.status_message}"
+                )
+
+            logger.debug(f"Handshake successful, upgrading to TLS")
+
+            reader, writer = await asyncio.wait_for(
+                self._start_tls(reader, writer, host),
+                timeout=self.config.handshake_timeout
+            )
+
+            # Verify ALPN negotiation
+            ssl_object = writer.get_extra_info("ssl_object")
+            selected_alpn = ssl_object.selected_alpn_protocol() if ssl_object else None
+            if selected_alpn != GURT_ALPN.decode('utf-8'):
+                raise GurtTLSError(f"ALPN negotiation failed. Expected {GURT_ALPN}, got {selected_alpn}")
+
+            logger.debug(f"TLS upgrade successful, ALPN: {selected_alpn}")
+            return reader, writer
+
+        except asyncio.TimeoutError:
+            raise GurtTimeoutError("Handshake timeout")
+        except ssl.SSLError as e:
+            raise GurtTLSError(f"TLS handshake failed: {e}")
+        except Exception as e:
+            if isinstance(e, (GurtHandshakeError, GurtTLSError, GurtTimeoutError)):
+                raise
+            raise GurtHandshakeError(f"Handshake failed: {e}")
+
+    async def _read_response(self, reader: asyncio.StreamReader, expect_body: bool = True) -> GurtResponse:
+        """Read and parse one complete response from the stream"""
+        parser = GurtParser(expect_body=expect_body)
+        body_parts = []
+        received = 0
+
+        while not parser.is_complete:
+            chunk = await reader.read(self.config.read_chunk_size)
+            if not chunk:
+                if not received:
+                    raise _StaleConnectionError("Connection closed before response", sent=True)
+                if parser.state == GurtParser.HEAD:
+                    raise GurtConnectionError("Connection closed while reading headers")
+                raise GurtConnectionError("Connection closed while reading body")
+            received += len(chunk)
+
+            for event in parser.feed(chunk):
+                if isinstance(event, BodyChunk):
+                    body_parts.append(event.data)
+
+        response = GurtResponse.from_head(parser.start_line, parser.headers)
+        response.body = b"".join(body_parts)
+        return response
+
+    async def _open_connection(self, host: str, port: int) -> Streams:
+        """Connect, perform the GURT handshake and return the upgraded streams"""
+        reader, writer = await self._create_connection(host, port)
+
+        try:
+            return await self._perform_handshake(reader, writer, host)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _acquire_connection(self, host: str, port: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Return (reader, writer, reused), preferring an idle pooled connection"""
+        if self._pool:
+            streams = self._pool.acquire(host, port)
+            if streams:
+                return streams[0], streams[1], True
+
+        reader, writer = await self._open_connection(host, port)
+        return reader, writer, False
+
+    async def _send_request(self, writer: asyncio.StreamWriter, request: GurtRequest) -> None:
+        """Send the request headers, then the body in chunks with backpressure"""
+        writer.write(request.head_bytes())
+
+        stream = request.body_stream
+        if stream is None:
+            if request.body_size():
+                writer.write(request.body)
+        elif hasattr(stream, '__aiter__'):
+            remaining = request.body_length
+            async for chunk in stream:
+                remaining -= len(chunk)
+                if remaining < 0:
+                    raise GurtProtocolError("Request body longer than content-length")
+                writer.write(chunk)
+                await writer.drain()
+            if remaining:
+                raise GurtProtocolError("Request body shorter than content-length")
+        else:
+            for chunk in request.iter_body(self.config.read_chunk_size):
+                # The transport may hold on to the data, and file chunks share one buffer
+                writer.write(bytes(chunk))
+                await writer.drain()
+
+        await writer.drain()
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Send a request on an upgraded connection and read the response"""
+        try:
+            logger.debug(f"Sending {request.method.value} request to {host}:{port}{request.path}")
+
+            try:
+                # A peer that stops reading would otherwise leave drain() waiting forever
+                await asyncio.wait_for(self._send_request(writer, request), timeout=self.config.request_timeout)
+            except (ssl.SSLError, ConnectionError) as e:
+                raise _StaleConnectionError(f"Failed to send request: {e}")
+
+            response = await asyncio.wait_for(
+                self._read_response(reader, expect_body=request.method != GurtMethod.HEAD),
+                timeout=self.config.request_timeout
+            )
+            logger.debug(f"Received response: {response.status_code} {response.status_message}")
+            self._decode_content(response)
+
+        except BaseException:
+            writer.close()
+            raise
+
+        keep_alive = (response.get_header("connection") or "").lower() != "close"
+        if self._pool and keep_alive:
+            self._pool.release(host, port, reader, writer)
+        else:
+            writer.close()
+
+        return response
+
+    async def _send_request_internal(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Send a request through every client layer"""
+        if self.config.compress_requests_min_size is not None:
+            self._compress_request(request)
+        response = await self._send_cached(host, port, request)
+        if self.config.json_codec is not None:
+            response.codec = self.config.json_codec
+        return response
+
+    async def _send_cached(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Send a request, answering GETs from the response cache when one is configured"""
+        cache = self.config.response_cache
+        if cache is None:
+            return await self._send_uncached(host, port, request)
+
+        url = f"gurt://{host}:{port}{request.path}"
+        if request.method != GurtMethod.GET:
+            response = await self._send_uncached(host, port, request)
+            cache.invalidate(url, request, response)
+            return response
+
+        entry = cache.lookup(url, request)
+        if entry is not None:
+            if entry.is_fresh():
+                return cache.hit(entry)
+            if entry.can_serve_stale():
+                if cache.begin_refresh(url):
+                    # Keep a reference so the task is not garbage collected while running
+                    task = asyncio.ensure_future(self._refresh_cached(cache, url, host, port, request, entry))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return cache.hit(entry, stale=True)
+
+        response = await self._send_uncached(host, port, cache.make_conditional(request, entry))
+        return cache.finish(url, request, response, entry)
+
+    async def _refresh_cached(self, cache: ResponseCache, url: str, host: str, port: int,
+                              request: GurtRequest, entry: CacheEntry) -> None:
+        """Revalidate a stale entry in the background (stale-while-revalidate)"""
+        try:
+            response = await self._send_uncached(host, port, cache.make_conditional(request, entry))
+            cache.finish(url, request, response, entry)
+        except GurtError as e:
+            logger.debug(f"Background revalidation of {url} failed: {e}")
+        finally:
+            cache.end_refresh(url)
+
+    async def _send_uncached(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Send a request, retrying transient failures as the retry policy allows"""
+        policy = self.config.retry_policy
+        if policy is None:
+            return await self._attempt(host, port, request)
+
+        policy.start(request)
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.monotonic()
+            try:
+                response = await self._attempt(host, port, request)
+            except GurtError as e:
+                delay = policy.evaluate(request, host, port, attempt, started, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = policy.evaluate(request, host, port, attempt, started, response=response)
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Make one attempt at a request through the circuit breaker and rate limiter"""
+        breaker = self.config.circuit_breaker
+        if breaker is None:
+            return await self._limited_send(host, port, request)
+
+        breaker.before_request(host, port)
+        try:
+            response = await self._limited_send(host, port, request)
+        except BaseException as e:
+            breaker.record(host, port, error=e)
+            raise
+        breaker.record(host, port, response=response)
+        return response
+
+    async def _limited_send(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Send once, awaiting a token from the rate limiter first"""
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return await self._send_once(host, port, request)
+
+        delay = limiter.acquire(host, port, request.path)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response = await self._send_once(host, port, request)
+        limiter.observe(host, port, request.path, response)
+        return response
+
+    async def _send_once(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
+        """Send a request over a pooled or new connection and return the response"""
+        try:
+            reader, writer, reused = await self._acquire_connection(host, port)
+
+            try:
+                return await self._exchange(reader, writer, host, port, request)
+            except _StaleConnectionError as e:
+                if not reused or not self._can_resend(request, e) or not request.rewind_body():
+                    raise
+                # The server dropped an idle connection, so retry once on a new one
+                logger.debug(f"Pooled connection to {host}:{port} was closed, reconnecting")
+                reader, writer = await self._open_connection(host, port)
+                return await self._exchange(reader, writer, host, port, request)
+
+        except asyncio.TimeoutError:
+            raise GurtTimeoutError("Request timeout")
+        except Exception as e:
+            if isinstance(e, GurtError):
+                raise
+            raise GurtConnectionError(f"Request failed: {e}")
+
+    async def get(self, url: str) -> GurtResponse:
+        """Send a GET request"""
+        host, port, path = self._parse_gurt_url(url)
+        request = self._build_request(GurtMethod.GET, host, path)
+
+        return await self._send_request_internal(host, port, request)
+
+    async def post(self, url: str, body: RequestBody = "", content_type: str = "text/plain",
+                   content_length: Optional[int] = None) -> GurtResponse:
+        """Send a POST request
+
+        ``body`` may also be a file object, an iterator or an async iterator of
+        bytes; iterators need an explicit ``content_length``.
+        """
+        host, port, path = self._parse_gurt_url(url)
+        request = self._build_request(GurtMethod.POST, host, path, body, content_type, content_length)
+
+        return await self._send_request_internal(host, port, request)
+
+    async def post_json(self, url: str, data: Any) -> GurtResponse:
+        """Send a POST request with JSON data"""
+        return await self.post(url, self.json_codec.dumps(data), "application/json")
+
+    async def put(self, url: str, body: RequestBody = "", content_type: str = "text/plain",
+                  content_length: Optional[int] = None) -> GurtResponse:
+        """Send a PUT request
+
+        ``body`` may also be a file object, an iterator or an async iterator of
+        bytes; iterators need an explicit ``content_length``.
+        """
+        host, port, path = self._parse_gurt_url(url)
+        request = self._build_request(GurtMethod.PUT, host, path, body, content_type, content_length)
+
+        return await self._send_request_internal(host, port, request)
+
+    async def delete(self, url: str) -> GurtResponse:
+        """Send a DELETE request"""
+        host, port, path = self._parse_gurt_url(url)
+        request = self._build_request(GurtMethod.DELETE, host, path)
+
+        return await self._send_request_internal(host, port, request)
+
+    async def head(self, url: str) -> GurtResponse:
+        """Send a HEAD request"""
+        host, port, path = self._parse_gurt_url(url)
+        request = self._build_request(GurtMethod.HEAD, host, path)
+
+        return await self._send_request_internal(host, port, request)
+
+    async def options(self, url: str) -> GurtResponse:
+        """Send an OPTIONS request"""
+        host, port, path = self._parse_gurt_url(url)
+        request = self._build_request(GurtMethod.OPTIONS, host, path)
+
+        return await self._send_request_internal(host, port, request)
+
+    def fetch_many(self, requests: Iterable[BatchItem], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                   per_host_limit: Optional[int] = None, ordered: bool = False) -> AsyncIterator[BatchResult]:
+        """Send many requests concurrently; use with ``async for``
+
+        See :meth:`GurtClient.fetch_many` for the arguments.
+        """
+        return async_fetch_many(self, requests, max_concurrency, per_host_limit, ordered)
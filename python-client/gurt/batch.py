@@ -0,0 +1,218 @@
+"""
+GURT batch requests - concurrent fan-out with per-host concurrency limits
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import AsyncIterator, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .message import GurtMethod, GurtResponse
+
+# Requests in flight across all hosts when no limit is given
+DEFAULT_BATCH_CONCURRENCY = 16
+
+_BODY_METHODS = (GurtMethod.POST, GurtMethod.PUT, GurtMethod.PATCH)
+
+
+class BatchRequest:
+    """One request of a batch; plain URL strings are treated as GET requests"""
+
+    def __init__(self, url: str, method: GurtMethod = GurtMethod.GET,
+                 body: Union[str, bytes] = "", content_type: str = "text/plain"):
+        self.url = url
+        self.method = method
+        self.body = body
+        self.content_type = content_type
+
+    def __repr__(self) -> str:
+        return f"BatchRequest({self.method.value} {self.url})"
+
+
+class BatchResult:
+    """Outcome of one batch request: either a response or the error it raised"""
+
+    def __init__(self, index: int, request: BatchRequest,
+                 response: Optional[GurtResponse] = None, error: Optional[Exception] = None):
+        self.index = index
+        self.request = request
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if a response was received (whatever its status code)"""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f"{self.response.status_code}" if self.ok else f"error={self.error!r}"
+        return f"BatchResult(#{self.index} {self.request.url} {outcome})"
+
+
+BatchItem = Union[str, BatchRequest]
+_Target = Tuple[str, int, str]
+
+
+class _Scheduler:
+    """Decides which requests may start, honouring the global and per-host limits
+
+    Requests wait in per-host queues rather than on a semaphore, so a slow
+    host never ties up workers that could serve other hosts.
+    """
+
+    def __init__(self, max_concurrency: int, per_host_limit: int):
+        if max_concurrency < 1 or per_host_limit < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self._queues: Dict[Tuple[str, int], Deque[Tuple[int, _Target]]] = {}
+        self._active: Dict[Tuple[str, int], int] = {}
+        self._running = 0
+
+    def add(self, index: int, target: _Target) -> None:
+        key = target[:2]
+        self._queues.setdefault(key, deque()).append((index, target))
+        self._active.setdefault(key, 0)
+
+    def startable(self) -> List[Tuple[int, _Target]]:
+        """Pop every queued request that fits within the limits now"""
+        started = []
+        progress = True
+        # Round-robin across hosts so one large host cannot starve the others
+        while progress and self._running < self.max_concurrency:
+            progress = False
+            for key, queue in self._queues.items():
+                if self._running >= self.max_concurrency:
+                    break
+                if queue and self._active[key] < self.per_host_limit:
+                    started.append(queue.popleft())
+                    self._active[key] += 1
+                    self._running += 1
+                    progress = True
+        return started
+
+    def finished(self, target: _Target) -> None:
+        self._active[target[:2]] -= 1
+        self._running -= 1
+
+
+class _Ordering:
+    """Releases results in completion order, or holds them back for input order"""
+
+    def __init__(self, ordered: bool):
+        self.ordered = ordered
+        self._next = 0
+        self._held: Dict[int, BatchResult] = {}
+
+    def push(self, result: BatchResult) -> List[BatchResult]:
+        if not self.ordered:
+            return [result]
+
+        self._held[result.index] = result
+        released = []
+        while self._next in self._held:
+            released.append(self._held.pop(self._next))
+            self._next += 1
+        return released
+
+
+def _prepare(client, requests: Iterable[BatchItem], max_concurrency: int,
+             per_host_limit: Optional[int]) -> Tuple[List[BatchRequest], _Scheduler, List[BatchResult]]:
+    """Normalise the batch and queue it; invalid URLs become immediate failures"""
+    if per_host_limit is None:
+        per_host_limit = client.config.max_connections_per_host
+
+    items = [item if isinstance(item, BatchRequest) else BatchRequest(item) for item in requests]
+    scheduler = _Scheduler(max_concurrency, per_host_limit)
+    failed = []
+
+    for index, item in enumerate(items):
+        try:
+            scheduler.add(index, client._parse_gurt_url(item.url))
+        except Exception as e:  # urlparse raises ValueError for a bad port, not GurtError
+            failed.append(BatchResult(index, item, error=e))
+
+    return items, scheduler, failed
+
+
+def _build(client, item: BatchRequest, target: _Target):
+    host, _, path = target
+    if item.method in _BODY_METHODS:
+        return client._build_request(item.method, host, path, item.body, item.content_type)
+    return client._build_request(item.method, host, path)
+
+
+def fetch_many(client, requests: Iterable[BatchItem], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+               per_host_limit: Optional[int] = None, ordered: bool = False) -> Iterator[BatchResult]:
+    """Send requests concurrently on a thread pool, yielding results as they finish
+
+    ``per_host_limit`` defaults to the client's ``max_connections_per_host`` so
+    every connection opened by the batch can go back to the pool. Errors are
+    reported per item in ``BatchResult.error`` instead of aborting the batch.
+    """
+    items, scheduler, failed = _prepare(client, requests, max_concurrency, per_host_limit)
+    ordering = _Ordering(ordered)
+
+    for result in failed:
+        yield from ordering.push(result)
+
+    def send(index: int, target: _Target) -> BatchResult:
+        item = items[index]
+        try:
+            response = client._send_request_internal(target[0], target[1], _build(client, item, target))
+            return BatchResult(index, item, response=response)
+        except Exception as e:  # Whatever one request raises must not end the batch
+            return BatchResult(index, item, error=e)
+
+    running = {}
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gurt-batch")
+    try:
+        while True:
+            for index, target in scheduler.startable():
+                running[executor.submit(send, index, target)] = target
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                scheduler.finished(running.pop(future))
+                yield from ordering.push(future.result())
+    finally:
+        # Stopping early lets requests already on the wire finish, but starts no new ones
+        executor.shutdown(wait=True)
+
+
+async def async_fetch_many(client, requests: Iterable[BatchItem], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                           per_host_limit: Optional[int] = None, ordered: bool = False) -> AsyncIterator[BatchResult]:
+    """Asyncio counterpart of :func:`fetch_many` running each request as a task"""
+    import asyncio  # Kept out of module import so sync-only users never load asyncio
+    items, scheduler, failed = _prepare(client, requests, max_concurrency, per_host_limit)
+    ordering = _Ordering(ordered)
+
+    for result in failed:
+        for released in ordering.push(result):
+            yield released
+
+    async def send(index: int, target: _Target) -> BatchResult:
+        item = items[index]
+        try:
+            response = await client._send_request_internal(target[0], target[1], _build(client, item, target))
+            return BatchResult(index, item, response=response)
+        except Exception as e:  # Whatever one request raises must not end the batch
+            return BatchResult(index, item, error=e)
+
+    running = {}
+    try:
+        while True:
+            for index, target in scheduler.startable():
+                running[asyncio.ensure_future(send(index, target))] = target
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                scheduler.finished(running.pop(task))
+                for released in ordering.push(task.result()):
+                    yield released
+    finally:
+        for task in running:
+            task.cancel()
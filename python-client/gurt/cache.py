@@ -0,0 +1,363 @@
+"""
+GURT response cache - HTTP-style freshness, validation and LRU storage
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+import logging
+
+from .protocol import GurtStatusCode
+from .message import GurtRequest, GurtResponse, GurtMethod, BufferLike
+from .headers import GurtHeaders
+
+logger = logging.getLogger(__name__)
+
+# Total size of cached responses kept in memory
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024  # 64MB
+
+# Number of URLs whose Vary header names are remembered
+DEFAULT_VARY_ENTRIES = 4096
+
+# Heuristic freshness (10% of the time since last-modified) is capped at one day
+MAX_HEURISTIC_LIFETIME = 24 * 60 * 60
+
+_CACHEABLE_STATUS = (GurtStatusCode.OK, GurtStatusCode.NO_CONTENT, GurtStatusCode.NOT_FOUND)
+
+# Headers describing the stored body that a 304 response must not replace
+_BODY_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a cache-control header into {directive: argument or None}"""
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.strip().lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    from email.utils import parsedate_to_datetime  # Slow to import and rarely needed
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class CacheEntry:
+    """A stored response together with what is needed to judge its freshness"""
+
+    def __init__(self, status_code: int, status_message: str, headers: Dict[str, str],
+                 body: BufferLike, stored_at: Optional[float] = None):
+        self.status_code = status_code
+        self.status_message = status_message
+        self.headers = headers
+        # Handed to every hit, so a caller must not be able to change it
+        self.body = body.toreadonly() if isinstance(body, memoryview) else bytes(body)
+        self.stored_at = time.time() if stored_at is None else stored_at
+        self.directives = parse_cache_control(headers.get("cache-control"))
+
+    @classmethod
+    def from_response(cls, response: GurtResponse) -> 'CacheEntry':
+        headers = dict(response.headers)
+        body = bytes(response.body)  # The client's body buffer stays with the caller
+        if response.decoded_encoding is not None:
+            # The body is stored decoded, so the headers must stop describing the compressed bytes
+            headers.pop("content-encoding", None)
+            headers["content-length"] = str(len(body))
+        return cls(int(response.status_code), response.status_message, headers, body)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory used by the entry"""
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def freshness_lifetime(self) -> float:
+        """Seconds the response may be served without revalidation"""
+        if "no-cache" in self.directives:
+            return 0
+
+        max_age = _seconds(self.directives.get("max-age"))
+        if max_age is not None:
+            return max_age
+
+        date = _http_date(self.headers.get("date")) or self.stored_at
+        expires = self.headers.get("expires")
+        if expires is not None:
+            expires_at = _http_date(expires)
+            return max(0.0, expires_at - date) if expires_at else 0
+
+        last_modified = _http_date(self.last_modified)
+        if last_modified and self.status_code == GurtStatusCode.OK:
+            return min(MAX_HEURISTIC_LIFETIME, max(0.0, (date - last_modified) / 10))
+        return 0
+
+    def age(self) -> float:
+        """Current age in seconds, including the age reported by the server"""
+        return (_seconds(self.headers.get("age")) or 0) + max(0.0, time.time() - self.stored_at)
+
+    def is_fresh(self) -> bool:
+        return self.age() < self.freshness_lifetime()
+
+    def stale_while_revalidate(self) -> float:
+        """Seconds past expiry during which the entry may be served while it is refreshed"""
+        if "must-revalidate" in self.directives or "no-cache" in self.directives:
+            return 0
+        return _seconds(self.directives.get("stale-while-revalidate")) or 0
+
+    def can_serve_stale(self) -> bool:
+        return self.age() < self.freshness_lifetime() + self.stale_while_revalidate()
+
+    def to_response(self) -> GurtResponse:
+        """Build a response carrying the cached status, headers and body"""
+        response = GurtResponse(GurtStatusCode(self.status_code))
+        response.status_message = self.status_message
+        response.headers = GurtHeaders(self.headers)
+        response.headers["age"] = str(int(self.age()))
+        response.body = self.body
+        return response
+
+
+class CacheStore:
+    """Interface for response cache storage backends"""
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Return at least ``entries``, ``size`` and ``evictions``"""
+        raise NotImplementedError
+
+
+class MemoryCacheStore(CacheStore):
+    """Thread-safe in-memory store bounded by total size with LRU eviction"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            self.delete(key)
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+
+            self._entries[key] = entry
+            self._size += entry.size
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "size": self._size, "evictions": self.evictions}
+
+
+class ResponseCache:
+    """Client-side cache for GET responses following HTTP caching rules
+
+    Entries are keyed by URL plus the request headers named in the
+    response's ``vary`` header. ``cache-control`` ``no-store``, ``no-cache``,
+    ``max-age``, ``must-revalidate`` and ``stale-while-revalidate`` are
+    honoured; stale entries with an ``etag`` or ``last-modified`` validator
+    are revalidated with a conditional request.
+    """
+
+    def __init__(self, store: Optional[CacheStore] = None, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.store = store if store is not None else MemoryCacheStore(max_bytes)
+        self._vary: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale_hits = 0
+
+    def _key(self, url: str, request: GurtRequest) -> str:
+        base = f"GET {url}"
+        with self._lock:
+            names = self._vary.get(base)
+        if not names:
+            return base
+        return base + "".join(f"\n{name}: {request.headers.get(name, '')}" for name in names)
+
+    def _remember_vary(self, url: str, response: GurtResponse) -> Tuple[str, ...]:
+        vary = response.get_header("vary") or ""
+        names = tuple(sorted({name.strip().lower() for name in vary.split(",") if name.strip()}))
+        base = f"GET {url}"
+
+        with self._lock:
+            if names:
+                self._vary[base] = names
+                self._vary.move_to_end(base)
+                while len(self._vary) > DEFAULT_VARY_ENTRIES:
+                    self._vary.popitem(last=False)
+            else:
+                self._vary.pop(base, None)
+        return names
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def lookup(self, url: str, request: GurtRequest) -> Optional[CacheEntry]:
+        """Return the stored entry matching the request, fresh or not"""
+        directives = parse_cache_control(request.get_header("cache-control"))
+        if "no-store" in directives or "no-cache" in directives:
+            return None
+        return self.store.get(self._key(url, request))
+
+    def hit(self, entry: CacheEntry, stale: bool = False) -> GurtResponse:
+        """Count a response served from the cache and return it"""
+        self._count("stale_hits" if stale else "hits")
+        return entry.to_response()
+
+    def begin_refresh(self, url: str) -> bool:
+        """Claim the background refresh of ``url``; False if one is already running"""
+        with self._lock:
+            if url in self._refreshing:
+                return False
+            self._refreshing.add(url)
+            return True
+
+    def end_refresh(self, url: str) -> None:
+        with self._lock:
+            self._refreshing.discard(url)
+
+    @staticmethod
+    def make_conditional(request: GurtRequest, entry: Optional[CacheEntry]) -> GurtRequest:
+        """A copy of the request carrying the entry's validators
+
+        The caller's request is left alone, as a background revalidation may
+        run while the caller still uses it.
+        """
+        if entry is None or not (entry.etag or entry.last_modified):
+            return request
+        conditional = copy.copy(request)
+        conditional.headers = request.headers.copy()
+        if entry.etag:
+            conditional.with_header("If-None-Match", entry.etag)
+        if entry.last_modified:
+            conditional.with_header("If-Modified-Since", entry.last_modified)
+        return conditional
+
+    def finish(self, url: str, request: GurtRequest, response: GurtResponse,
+               entry: Optional[CacheEntry]) -> GurtResponse:
+        """Apply a network response to the cache and return what the caller should see"""
+        if response.status_code == GurtStatusCode.NOT_MODIFIED and entry is not None:
+            self._count("revalidations")
+            refreshed = CacheEntry(
+                entry.status_code, entry.status_message,
+                dict(entry.headers, **{k: v for k, v in response.headers.items() if k not in _BODY_HEADERS}),
+                entry.body
+            )
+            self.store.put(self._key(url, request), refreshed)
+            return refreshed.to_response()
+
+        self._count("misses")
+        self.store_response(url, request, response)
+        return response
+
+    def store_response(self, url: str, request: GurtRequest, response: GurtResponse) -> None:
+        """Store a complete response if HTTP caching rules allow it"""
+        directives = parse_cache_control(response.get_header("cache-control"))
+        request_directives = parse_cache_control(request.get_header("cache-control"))
+
+        if (response.status_code not in _CACHEABLE_STATUS or response.raw is not None
+                or "no-store" in directives or "no-store" in request_directives
+                or (response.get_header("vary") or "").strip() == "*"):
+            self.store.delete(self._key(url, request))
+            return
+
+        entry = CacheEntry.from_response(response)
+        if (entry.freshness_lifetime() <= 0 and not entry.stale_while_revalidate()
+                and not (entry.etag or entry.last_modified)):
+            # Could never be served without a full request
+            return
+
+        self._remember_vary(url, response)
+        self.store.put(self._key(url, request), entry)
+
+    def invalidate(self, url: str, request: GurtRequest, response: GurtResponse) -> None:
+        """Drop the cached GET response after a successful unsafe request to the URL"""
+        if request.method not in (GurtMethod.GET, GurtMethod.HEAD, GurtMethod.OPTIONS) and response.is_success():
+            self.store.delete(self._key(url, request))
+            self.store.delete(f"GET {url}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters merged with the store's entry, size and eviction counts"""
+        with self._lock:
+            counters = {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+            }
+        counters.update(self.store.stats())
+        return counters
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self.store.clear()
+        with self._lock:
+            self._vary.clear()
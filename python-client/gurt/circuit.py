@@ -0,0 +1,221 @@
+"""
+GURT circuit breaker - fail fast on backends that keep failing
+"""
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Type
+import logging
+
+from .protocol import GurtStatusCode
+from .message import GurtResponse
+from .errors import (
+    GurtError, GurtConnectionError, GurtTimeoutError, GurtHandshakeError, GurtCircuitOpenError
+)
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean the backend itself is unhealthy
+FAILURE_STATUS_CODES = frozenset({
+    GurtStatusCode.BAD_GATEWAY,
+    GurtStatusCode.SERVICE_UNAVAILABLE,
+    GurtStatusCode.GATEWAY_TIMEOUT,
+})
+
+FAILURE_ERRORS: Tuple[Type[GurtError], ...] = (GurtConnectionError, GurtTimeoutError, GurtHandshakeError)
+
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"        # Requests flow normally
+    OPEN = "open"            # Requests fail fast
+    HALF_OPEN = "half_open"  # A few probe requests test whether the backend recovered
+
+
+class _Circuit:
+    """State and rolling outcome counts for one (host, port)"""
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.buckets: Deque[List[int]] = deque()  # [second, requests, failures]
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def counts(self, window: float) -> Tuple[int, int]:
+        """(requests, failures) within the rolling window"""
+        horizon = int(time.monotonic()) - window
+        while self.buckets and self.buckets[0][0] <= horizon:
+            self.buckets.popleft()
+        return sum(b[1] for b in self.buckets), sum(b[2] for b in self.buckets)
+
+    def add(self, failed: bool) -> None:
+        now = int(time.monotonic())
+        if not self.buckets or self.buckets[-1][0] != now:
+            self.buckets.append([now, 0, 0])
+        self.buckets[-1][1] += 1
+        if failed:
+            self.buckets[-1][2] += 1
+
+
+class CircuitBreaker:
+    """Per-(host, port) circuit breaker with closed, open and half-open states
+
+    The circuit opens when at least ``minimum_requests`` were made in the
+    last ``window`` seconds and the share that failed reaches
+    ``failure_rate``. While open, requests raise GurtCircuitOpenError
+    immediately. After ``reset_timeout`` seconds up to ``half_open_probes``
+    requests are let through: if they all succeed the circuit closes, and
+    any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        minimum_requests: int = 10,
+        window: float = 30.0,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        failure_statuses: Iterable[int] = FAILURE_STATUS_CODES,
+        failure_errors: Tuple[Type[GurtError], ...] = FAILURE_ERRORS,
+        on_state_change: Optional[Callable[[str, int, CircuitState, CircuitState], None]] = None
+    ):
+        self.failure_rate = failure_rate
+        self.minimum_requests = minimum_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.failure_statuses = frozenset(int(status) for status in failure_statuses)
+        self.failure_errors = failure_errors
+        self.on_state_change = on_state_change
+        self._circuits: Dict[Tuple[str, int], _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host: str, port: int) -> _Circuit:
+        """Circuit for (host, port) (caller holds the lock)"""
+        circuit = self._circuits.get((host, port))
+        if circuit is None:
+            circuit = self._circuits[(host, port)] = _Circuit()
+        return circuit
+
+    def _transition(self, host: str, port: int, circuit: _Circuit, state: CircuitState) -> Optional[Callable[[], None]]:
+        """Change state (caller holds the lock); returns the notification to run after unlocking"""
+        previous, circuit.state = circuit.state, state
+
+        if state == CircuitState.OPEN:
+            circuit.opened_at = time.monotonic()
+            circuit.times_opened += 1
+        elif state == CircuitState.HALF_OPEN:
+            circuit.probes = 0
+            circuit.probe_successes = 0
+        else:
+            circuit.buckets.clear()
+
+        logger.debug(f"Circuit for {host}:{port} {previous.value} -> {state.value}")
+        if self.on_state_change:
+            callback = self.on_state_change
+            return lambda: callback(host, port, previous, state)
+        return None
+
+    @staticmethod
+    def _notify(notification: Optional[Callable[[], None]]) -> None:
+        if notification:
+            try:
+                notification()
+            except Exception as e:
+                logger.debug(f"Circuit state callback failed: {e}")
+
+    def before_request(self, host: str, port: int) -> None:
+        """Admit a request, or raise GurtCircuitOpenError if the circuit is open"""
+        notification = None
+        rejection = None
+
+        with self._lock:
+            circuit = self._circuit(host, port)
+
+            if circuit.state == CircuitState.OPEN:
+                remaining = circuit.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    rejection = f"Circuit for {host}:{port} is open, retry in {remaining:.1f}s"
+                else:
+                    notification = self._transition(host, port, circuit, CircuitState.HALF_OPEN)
+
+            if rejection is None and circuit.state == CircuitState.HALF_OPEN:
+                if circuit.probes >= self.half_open_probes:
+                    rejection = f"Circuit for {host}:{port} is half-open, waiting for probe requests"
+                else:
+                    circuit.probes += 1
+
+            if rejection is not None:
+                circuit.rejected += 1
+
+        self._notify(notification)
+        if rejection is not None:
+            raise GurtCircuitOpenError(rejection)
+
+    def is_failure(self, response: Optional[GurtResponse] = None, error: Optional[BaseException] = None) -> bool:
+        """Whether an outcome counts against the backend's health"""
+        if error is not None:
+            return isinstance(error, self.failure_errors)
+        return int(response.status_code) in self.failure_statuses
+
+    def record(self, host: str, port: int, response: Optional[GurtResponse] = None,
+               error: Optional[BaseException] = None) -> None:
+        """Record the outcome of an admitted request"""
+        failed = self.is_failure(response, error)
+        notification = None
+
+        with self._lock:
+            circuit = self._circuit(host, port)
+
+            if circuit.state == CircuitState.HALF_OPEN:
+                if failed:
+                    notification = self._transition(host, port, circuit, CircuitState.OPEN)
+                elif error is None:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.half_open_probes:
+                        notification = self._transition(host, port, circuit, CircuitState.CLOSED)
+                else:
+                    # Neither healthy nor unhealthy (e.g. a protocol error); free the probe slot
+                    circuit.probes -= 1
+
+            elif circuit.state == CircuitState.CLOSED:
+                circuit.add(failed)
+                requests, failures = circuit.counts(self.window)
+                if failed and requests >= self.minimum_requests and failures >= self.failure_rate * requests:
+                    notification = self._transition(host, port, circuit, CircuitState.OPEN)
+
+        self._notify(notification)
+
+    def state(self, host: str, port: int) -> CircuitState:
+        """Current state of the circuit for (host, port)"""
+        with self._lock:
+            circuit = self._circuits.get((host, port))
+            return circuit.state if circuit else CircuitState.CLOSED
+
+    def reset(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
+        """Close one circuit, or all of them"""
+        with self._lock:
+            if host is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop((host, port), None)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """State and rolling counts per circuit, keyed 'host:port'"""
+        with self._lock:
+            result = {}
+            for (host, port), circuit in self._circuits.items():
+                requests, failures = circuit.counts(self.window)
+                result[f"{host}:{port}"] = {
+                    "state": circuit.state.value,
+                    "requests": requests,
+                    "failures": failures,
+                    "rejected": circuit.rejected,
+                    "times_opened": circuit.times_opened,
+                }
+            return result
@@ -4,24 +4,47 @@ GURT Client implementation with TLS 1.3 and handshake support
 
 import socket
 import ssl
-import asyncio
+import threading
+import time
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterable, Iterator, List, Union
 import logging
 
 from .protocol import (
     DEFAULT_PORT, GURT_ALPN, TLS_VERSION,
     DEFAULT_HANDSHAKE_TIMEOUT, DEFAULT_REQUEST_TIMEOUT, DEFAULT_CONNECTION_TIMEOUT,
-    MAX_MESSAGE_SIZE
+    MAX_POOL_SIZE, POOL_IDLE_TIMEOUT, DEFAULT_READ_CHUNK_SIZE
+)
+from .message import GurtRequest, GurtResponse, GurtMethod, GurtParser, BodyChunk, BufferLike, BodyStream
+from .pool import ConnectionPool
+from .streaming import GurtBodyStream
+from .tls import TLSSessionCache, DEFAULT_SESSION_TTL, client_context
+from .dns import Resolver
+from .cache import CacheEntry, ResponseCache
+from .retry import IDEMPOTENT_METHODS, RetryPolicy
+from .ratelimit import RateLimiter
+from .circuit import CircuitBreaker, CircuitState
+from .hooks import Hooks, RequestTrace
+from .batch import BatchItem, BatchResult, DEFAULT_BATCH_CONCURRENCY, fetch_many
+from .prepared import PreparedRequest
+from .download import (
+    Downloader, DownloadResult, ProgressCallback,
+    DEFAULT_DOWNLOAD_CONNECTIONS, DEFAULT_SEGMENT_SIZE, DEFAULT_SEGMENT_RETRIES
+)
+from .codec import JSONCodec, get_default_codec
+from .compression import (
+    CompressionStats, DEFAULT_MAX_DECODED_SIZE, accept_encoding, compress, decode_response, is_compressible
 )
-from .message import GurtRequest, GurtResponse, GurtMethod
 from .errors import (
     GurtError, GurtConnectionError, GurtTimeoutError, 
-    GurtTLSError, GurtHandshakeError, GurtProtocolError
+    GurtTLSError, GurtHandshakeError
 )
 
 logger = logging.getLogger(__name__)
 
+RequestBody = Union[str, BufferLike, BodyStream]
+
 
 class GurtClientConfig:
     """Configuration for GURT client"""
@@ -32,96 +55,292 @@ class GurtClientConfig:
         request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
         connection_timeout: float = DEFAULT_CONNECTION_TIMEOUT,
         user_agent: str = "GURT-Python-Client/1.0.0",
-        verify_tls: bool = False  # Set to False for development with self-signed certs
+        verify_tls: bool = False,  # Set to False for development with self-signed certs
+        ca_bundle: Optional[str] = None,  # PEM file of trusted CAs instead of the system store
+        enable_connection_pooling: bool = True,
+        max_connections_per_host: int = MAX_POOL_SIZE,
+        pool_idle_timeout: float = POOL_IDLE_TIMEOUT,
+        enable_tls_session_cache: bool = True,
+        tls_session_ttl: float = DEFAULT_SESSION_TTL,
+        resolver: Optional[Resolver] = None,  # e.g. GurtDNSResolver() for .real/.web names
+        read_chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+        response_cache: Optional[ResponseCache] = None,  # e.g. ResponseCache() to cache GETs
+        retry_policy: Optional[RetryPolicy] = None,  # e.g. RetryPolicy() to retry transient failures
+        rate_limiter: Optional[RateLimiter] = None,  # e.g. RateLimiter(rate=10, burst=20)
+        circuit_breaker: Optional[CircuitBreaker] = None,  # e.g. CircuitBreaker() to fail fast on dead hosts
+        hooks: Optional[Hooks] = None,  # Per-phase request events, see gurt.hooks
+        json_codec: Optional[JSONCodec] = None,  # For post_json() and response.json(); default is the json module
+        enable_compression: bool = True,  # Send accept-encoding and decode compressed responses
+        compress_requests_min_size: Optional[int] = None,  # e.g. 1024 to gzip larger text and JSON bodies
+        request_encoding: str = "gzip",
+        max_decoded_size: int = DEFAULT_MAX_DECODED_SIZE  # Largest decompressed response body accepted
     ):
         self.handshake_timeout = handshake_timeout
         self.request_timeout = request_timeout
         self.connection_timeout = connection_timeout
         self.user_agent = user_agent
         self.verify_tls = verify_tls
+        self.ca_bundle = ca_bundle
+        self.enable_connection_pooling = enable_connection_pooling
+        self.max_connections_per_host = max_connections_per_host
+        self.pool_idle_timeout = pool_idle_timeout
+        self.enable_tls_session_cache = enable_tls_session_cache
+        self.tls_session_ttl = tls_session_ttl
+        self.resolver = resolver
+        self.read_chunk_size = read_chunk_size
+        self.response_cache = response_cache
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.hooks = hooks
+        self.json_codec = json_codec
+        self.enable_compression = enable_compression
+        self.compress_requests_min_size = compress_requests_min_size
+        self.request_encoding = request_encoding
+        self.max_decoded_size = max_decoded_size
 
 
-class GurtClient:
-    """GURT protocol client with TLS 1.3 support"""
+# Bodies up to this size are sent in the same write as the headers
+_COALESCE_BODY_SIZE = 16 * 1024
+
+# Hosts whose serialized HANDSHAKE request is kept
+_HANDSHAKE_CACHE_SIZE = 256
+
+
+class _StaleConnectionError(GurtConnectionError):
+    """Raised when a reused connection turns out to be closed before any response arrived
+    
+    ``sent`` is True once the whole request had been written, so the server
+    may have acted on it before closing.
+    """
+    
+    def __init__(self, message: str, sent: bool = False):
+        super().__init__(message)
+        self.sent = sent
+
+
+def _send_buffers(sock: socket.socket, buffers: List[Any]) -> None:
+    """Send several buffers in order, using scatter/gather I/O where available"""
+    if isinstance(sock, ssl.SSLSocket) or not hasattr(sock, 'sendmsg'):
+        # TLS sockets encrypt record by record and do not implement sendmsg
+        for buffer in buffers:
+            sock.sendall(buffer)
+        return
+    
+    views = [memoryview(buffer).cast('B') for buffer in buffers if len(buffer)]
+    while views:
+        sent = sock.sendmsg(views)
+        while sent:
+            if sent >= views[0].nbytes:
+                sent -= views.pop(0).nbytes
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+
+@lru_cache(maxsize=256)
+def _parse_gurt_url(url: str) -> Tuple[str, int, str]:
+    if not url.startswith('gurt://'):
+        raise GurtError(f"URL must use gurt:// scheme: {url}")
+    
+    parsed = urlparse(url)
+    
+    if not parsed.hostname:
+        raise GurtError(f"URL must have a hostname: {url}")
+    
+    host = parsed.hostname
+    port = parsed.port or DEFAULT_PORT
+    path = parsed.path or "/"
+    
+    if parsed.query:
+        path += f"?{parsed.query}"
+    
+    return host, port, path
+
+
+class _GurtClientBase:
+    """Configuration, URL and request handling shared by the sync and async clients"""
     
     def __init__(self, config: Optional[GurtClientConfig] = None):
         self.config = config or GurtClientConfig()
         self._ssl_context = self._create_ssl_context()
+        self._handshake_bytes: Dict[str, bytes] = {}
+        self._accept_encoding = accept_encoding() if self.config.enable_compression else None
+        self._compression = CompressionStats()
     
     def _create_ssl_context(self) -> ssl.SSLContext:
-        """Create SSL context for TLS 1.3 with GURT ALPN"""
-        try:
-            context = ssl.create_default_context()
-            
-            # Configure for TLS 1.3
-            context.minimum_version = ssl.TLSVersion.TLSv1_3
-            context.maximum_version = ssl.TLSVersion.TLSv1_3
-            
-            # Set ALPN protocols
-            context.set_alpn_protocols([GURT_ALPN.decode('utf-8')])
-            
-            # Configure certificate verification
-            if not self.config.verify_tls:
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                logger.warning("TLS certificate verification disabled - only use for development!")
-            
-            return context
-            
-        except Exception as e:
-            raise GurtTLSError(f"Failed to create SSL context: {e}")
+        """The shared TLS 1.3 context with GURT ALPN for this client's verification settings"""
+        return client_context(self.config.verify_tls, self.config.ca_bundle)
+    
+    @property
+    def json_codec(self) -> JSONCodec:
+        """The codec for JSON request and response bodies"""
+        return self.config.json_codec or get_default_codec()
+    
+    def compression_stats(self) -> Dict[str, float]:
+        """Bodies compressed and decompressed by this client, with byte counts and ratios"""
+        return self._compression.snapshot()
+    
+    @staticmethod
+    def _can_resend(request: GurtRequest, error: _StaleConnectionError) -> bool:
+        """Whether a request that hit a closed pooled connection may be sent again
+        
+        Once the request was fully written the server may have processed it,
+        so only idempotent methods are repeated; the rest are left to the
+        caller or the retry policy.
+        """
+        return not error.sent or request.method in IDEMPOTENT_METHODS
+    
+    def _decode_content(self, response: GurtResponse) -> None:
+        """Undo a response's content-encoding as its body is read"""
+        if self._accept_encoding is None:
+            return
+        encoding = response.get_header("content-encoding")
+        if encoding:
+            decode_response(response, encoding, self.config.max_decoded_size, self._compression)
+    
+    def _compress_request(self, request: GurtRequest) -> None:
+        """Compress an in-memory text or JSON body once it reaches compress_requests_min_size"""
+        size = request.body_size()
+        if (request.body_stream is not None or size < self.config.compress_requests_min_size
+                or request.get_header("content-encoding")):
+            return
+        content_type = request.get_header("content-type")
+        if content_type is not None and not is_compressible(content_type):
+            return
+        compressed = compress(request.body, self.config.request_encoding)
+        if len(compressed) >= size:
+            return
+        request.with_body(compressed)
+        request.headers["content-encoding"] = self.config.request_encoding
+        if "content-length" in request.headers:
+            request.headers["content-length"] = str(len(compressed))
+        self._compression.record_sent(size, len(compressed))
     
     def _parse_gurt_url(self, url: str) -> Tuple[str, int, str]:
         """Parse a GURT URL and return (host, port, path)"""
-        if not url.startswith('gurt://'):
-            raise GurtError(f"URL must use gurt:// scheme: {url}")
+        # Memoized: clients tend to request the same few URLs over and over
+        return _parse_gurt_url(url)
+    
+    def _create_handshake_request(self, host: str) -> GurtRequest:
+        """Build the plaintext HANDSHAKE request sent before the TLS upgrade"""
+        handshake_request = GurtRequest(GurtMethod.HANDSHAKE, "/")
+        handshake_request.with_header("Host", host)
+        handshake_request.with_header("User-Agent", self.config.user_agent)
+        return handshake_request
+    
+    def _handshake_data(self, host: str) -> bytes:
+        """Serialized HANDSHAKE request for ``host``, built once per host"""
+        data = self._handshake_bytes.get(host)
+        if data is None:
+            if len(self._handshake_bytes) >= _HANDSHAKE_CACHE_SIZE:
+                self._handshake_bytes.clear()
+            data = self._handshake_bytes[host] = self._create_handshake_request(host).to_bytes()
+        return data
+    
+    def prepare(self, method: Union[GurtMethod, str], url: str, content_type: Optional[str] = None,
+                headers: Optional[Dict[str, str]] = None) -> PreparedRequest:
+        """Parse ``url`` and serialize the request headers once for repeated sends
         
-        parsed = urlparse(url)
+        ``prepared.send(body=None, headers=None)`` then only adds the body,
+        its content-length and any per-call headers. See gurt.prepared.
+        """
+        if isinstance(method, str):
+            method = GurtMethod(method.upper())
+        return PreparedRequest(self, method, url, content_type, headers)
+    
+    def _build_request(self, method: GurtMethod, host: str, path: str,
+                       body: Optional[RequestBody] = None,
+                       content_type: Optional[str] = None,
+                       content_length: Optional[int] = None) -> GurtRequest:
+        """Build a request with the standard client headers"""
+        request = GurtRequest(method, path)
+        request.with_header("Host", host)
+        request.with_header("User-Agent", self.config.user_agent)
+        if self._accept_encoding is not None:
+            request.with_header("Accept-Encoding", self._accept_encoding)
         
-        if not parsed.hostname:
-            raise GurtError(f"URL must have a hostname: {url}")
+        if content_type is not None:
+            request.with_header("Content-Type", content_type)
+        if body is not None:
+            request.with_body(body, content_length)
         
-        host = parsed.hostname
-        port = parsed.port or DEFAULT_PORT
-        path = parsed.path or "/"
+        return request
+
+
+class GurtClient(_GurtClientBase):
+    """GURT protocol client with TLS 1.3 support"""
+    
+    def __init__(self, config: Optional[GurtClientConfig] = None):
+        super().__init__(config)
+        self._pool: Optional[ConnectionPool] = None
         
-        if parsed.query:
-            path += f"?{parsed.query}"
+        if self.config.enable_connection_pooling:
+            self._pool = ConnectionPool(
+                max_connections_per_host=self.config.max_connections_per_host,
+                idle_timeout=self.config.pool_idle_timeout
+            )
         
-        return host, port, path
+        self._session_cache: Optional[TLSSessionCache] = None
+        if self.config.enable_tls_session_cache:
+            self._session_cache = TLSSessionCache(max_age=self.config.tls_session_ttl)
+    
+    def close(self) -> None:
+        """Close all pooled connections"""
+        if self._pool:
+            self._pool.close()
+    
+    def tls_session_stats(self) -> Dict[str, int]:
+        """Return TLS session resumption counters (offered, resumed, full_handshakes)"""
+        if not self._session_cache:
+            return {"sessions": 0, "offered": 0, "resumed": 0, "full_handshakes": 0}
+        return self._session_cache.stats()
+    
+    def circuit_state(self, url: str) -> CircuitState:
+        """State of the circuit breaker for the URL's host (CLOSED without a breaker)"""
+        host, port, _ = self._parse_gurt_url(url)
+        breaker = self.config.circuit_breaker
+        return breaker.state(host, port) if breaker else CircuitState.CLOSED
+    
+    def __enter__(self) -> 'GurtClient':
+        return self
     
-    def _create_connection(self, host: str, port: int) -> socket.socket:
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def _create_connection(self, host: str, port: int, trace: Optional[RequestTrace] = None) -> socket.socket:
         """Create a TCP connection to the host"""
+        address = self.config.resolver.resolve(host) if self.config.resolver else host
+        if trace:
+            trace.mark("dns")
+        
         try:
             sock = socket.create_connection(
-                (host, port), 
+                (address, port), 
                 timeout=self.config.connection_timeout
             )
+            # Headers and body may go out in separate writes
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if trace:
+                trace.mark("connect")
             return sock
         except socket.timeout:
             raise GurtTimeoutError(f"Connection timeout to {host}:{port}")
         except socket.error as e:
             raise GurtConnectionError(f"Failed to connect to {host}:{port}: {e}")
     
-    def _perform_handshake(self, sock: socket.socket, host: str) -> ssl.SSLSocket:
+    def _perform_handshake(self, sock: socket.socket, host: str, port: int = DEFAULT_PORT,
+                           trace: Optional[RequestTrace] = None) -> ssl.SSLSocket:
         """Perform GURT handshake and upgrade to TLS"""
         try:
-            # Create handshake request
-            handshake_request = GurtRequest(GurtMethod.HANDSHAKE, "/")
-            handshake_request.with_header("Host", host)
-            handshake_request.with_header("User-Agent", self.config.user_agent)
-            
             # Send handshake request
-            handshake_data = handshake_request.to_bytes()
+            handshake_data = self._handshake_data(host)
             logger.debug(f"Sending handshake request to {host}")
             sock.sendall(handshake_data)
             
             # Read handshake response with timeout
             sock.settimeout(self.config.handshake_timeout)
-            response_data = self._read_response_data(sock)
-            
-            # Parse handshake response
-            handshake_response = GurtResponse.parse(response_data)
+            handshake_response = self._read_response(sock)
             
             if handshake_response.status_code != 101:  # Switching Protocols
                 raise GurtHandshakeError(
@@ -129,9 +348,15 @@ class GurtClient:
                 )
             
             logger.debug(f"Handshake successful, upgrading to TLS")
+            if trace:
+                trace.mark("handshake")
             
-            # Upgrade to TLS
-            tls_sock = self._ssl_context.wrap_socket(sock, server_hostname=host)
+            # Upgrade to TLS, offering a cached session for resumption
+            session = self._session_cache.get(host, port) if self._session_cache else None
+            tls_sock = self._ssl_context.wrap_socket(sock, server_hostname=host, session=session)
+            
+            if self._session_cache:
+                self._session_cache.record_handshake(session is not None, tls_sock.session_reused)
             
             # Verify ALPN negotiation
             selected_alpn = tls_sock.selected_alpn_protocol()
@@ -139,6 +364,9 @@ class GurtClient:
                 raise GurtTLSError(f"ALPN negotiation failed. Expected {GURT_ALPN}, got {selected_alpn}")
             
             logger.debug(f"TLS upgrade successful, ALPN: {selected_alpn}")
+            if trace:
+                trace.tls_session_reused = tls_sock.session_reused
+                trace.mark("tls")
             return tls_sock
             
         except socket.timeout:
@@ -150,73 +378,337 @@ class GurtClient:
                 raise
             raise GurtHandshakeError(f"Handshake failed: {e}")
     
-    def _read_response_data(self, sock: socket.socket) -> bytes:
-        """Read complete response data from socket"""
-        data = b""
-        header_end = b"\r\n\r\n"
+    def _read_head(self, sock: socket.socket, expect_body: bool = True,
+                   trace: Optional[RequestTrace] = None) -> Tuple[GurtResponse, GurtParser, List[bytes]]:
+        """Read until the response headers are complete
+        
+        Returns the response without a body, the parser, and any body bytes
+        that arrived together with the headers.
+        """
+        parser = GurtParser(expect_body=expect_body)
+        buffer = bytearray(self.config.read_chunk_size)
+        view = memoryview(buffer)
+        body_parts = []
+        received = 0
         
-        # Read until we have headers
-        while header_end not in data:
-            chunk = sock.recv(4096)
-            if not chunk:
+        while parser.state == GurtParser.HEAD:
+            nbytes = sock.recv_into(buffer)
+            if not nbytes:
+                if not received:
+                    raise _StaleConnectionError("Connection closed before response", sent=True)
                 raise GurtConnectionError("Connection closed while reading headers")
-            data += chunk
+            received += nbytes
+            if trace:
+                trace.first_bytes(nbytes)
             
-            if len(data) > MAX_MESSAGE_SIZE:
-                raise GurtProtocolError("Response too large")
-        
-        # Find end of headers
-        headers_end = data.find(header_end) + len(header_end)
-        headers_data = data[:headers_end]
-        body_data = data[headers_end:]
-        
-        # Parse headers to get content-length
-        headers_str = headers_data.decode('utf-8')
-        content_length = 0
-        
-        for line in headers_str.split('\r\n'):
-            if line.lower().startswith('content-length:'):
-                try:
-                    content_length = int(line.split(':', 1)[1].strip())
-                except ValueError:
-                    pass
-                break
-        
-        # Read remaining body data if needed
-        while len(body_data) < content_length:
-            chunk = sock.recv(min(4096, content_length - len(body_data)))
-            if not chunk:
+            for event in parser.feed(view[:nbytes]):
+                if isinstance(event, BodyChunk):
+                    body_parts.append(event.data)
+        
+        response = GurtResponse.from_head(parser.start_line, parser.headers)
+        return response, parser, body_parts
+    
+    def _read_body(self, sock: socket.socket, parser: GurtParser, body_parts: List[bytes],
+                   trace: Optional[RequestTrace] = None) -> bytes:
+        """Read the rest of the body straight into a buffer sized from content-length"""
+        if parser.is_complete:
+            return b"".join(body_parts)
+        
+        chunk_size = self.config.read_chunk_size
+        body = bytearray(parser.content_length)
+        body_view = memoryview(body)
+        position = 0
+        
+        # Body bytes that arrived with the headers go first
+        for part in body_parts:
+            body_view[position:position + len(part)] = part
+            position += len(part)
+        
+        while not parser.is_complete:
+            nbytes = sock.recv_into(body_view[position:], min(chunk_size, parser.body_remaining))
+            if not nbytes:
                 raise GurtConnectionError("Connection closed while reading body")
-            body_data += chunk
+            position += nbytes
+            parser.advance_body(nbytes)
+            if trace:
+                trace.bytes_received += nbytes
+        
+        return body
+    
+    def _read_response(self, sock: socket.socket, expect_body: bool = True,
+                       trace: Optional[RequestTrace] = None) -> GurtResponse:
+        """Read and parse one complete response from the socket
         
-        return headers_data + body_data
+        Headers are read in ``read_chunk_size`` pieces; once content-length is
+        known the body is received with ``recv_into`` straight into a buffer of
+        that size, which becomes ``response.body`` without further copies.
+        """
+        response, parser, body_parts = self._read_head(sock, expect_body, trace)
+        response.body = self._read_body(sock, parser, body_parts, trace)
+        return response
     
-    def _send_request_internal(self, host: str, port: int, request: GurtRequest) -> GurtResponse:
-        """Send a request and return the response"""
-        sock = None
-        tls_sock = None
+    def _open_connection(self, host: str, port: int, trace: Optional[RequestTrace] = None) -> ssl.SSLSocket:
+        """Connect, perform the GURT handshake and return the upgraded socket"""
+        sock = self._create_connection(host, port, trace)
         
         try:
-            # Create connection
-            sock = self._create_connection(host, port)
-            
-            # Perform handshake and upgrade to TLS
-            tls_sock = self._perform_handshake(sock, host)
-            
+            return self._perform_handshake(sock, host, port, trace)
+        except Exception:
+            try:
+                sock.close()
+            except Exception:
+                pass
+            raise
+    
+    def _acquire_connection(self, host: str, port: int,
+                            trace: Optional[RequestTrace] = None) -> Tuple[ssl.SSLSocket, bool]:
+        """Return (connection, reused), preferring an idle pooled connection"""
+        if self._pool:
+            tls_sock = self._pool.acquire(host, port)
+            if tls_sock:
+                if trace:
+                    trace.connection_reused = True
+                return tls_sock, True
+        
+        return self._open_connection(host, port, trace), False
+    
+    def _release_connection(self, host: str, port: int, tls_sock: ssl.SSLSocket, response: GurtResponse) -> None:
+        """Return a connection to the pool after a complete response, or close it"""
+        keep_alive = (response.get_header("connection") or "").lower() != "close"
+        
+        # TLS 1.3 tickets arrive after the handshake, so the session is only
+        # resumable once the response has been read
+        if self._session_cache:
+            self._session_cache.put(host, port, tls_sock.session)
+        
+        if self._pool and keep_alive:
+            self._pool.release(host, port, tls_sock)
+        else:
+            try:
+                tls_sock.close()
+            except Exception:
+                pass
+    
+    def _send_request(self, sock: socket.socket, request: GurtRequest) -> int:
+        """Send the request headers and body without joining them into one buffer
+        
+        Returns the number of bytes sent.
+        """
+        head = request.head_bytes()
+        size = request.body_size()
+        
+        if request.body_stream is None:
+            if size <= _COALESCE_BODY_SIZE:
+                sock.sendall(head + request.body)
+            else:
+                _send_buffers(sock, [head, request.body])
+            return len(head) + size
+        
+        sock.sendall(head)
+        for chunk in request.iter_body(self.config.read_chunk_size):
+            sock.sendall(chunk)
+        return len(head) + size
+    
+    def _finish_stream(self, host: str, port: int, tls_sock: ssl.SSLSocket,
+                       response: GurtResponse, reusable: bool) -> None:
+        """Release or close the connection behind a streamed response"""
+        if reusable:
+            self._release_connection(host, port, tls_sock, response)
+        else:
+            try:
+                tls_sock.close()
+            except Exception:
+                pass
+    
+    def _exchange(self, tls_sock: ssl.SSLSocket, host: str, port: int, request: GurtRequest,
+                  stream: bool = False, trace: Optional[RequestTrace] = None) -> GurtResponse:
+        """Send a request on an upgraded connection and read the response
+        
+        With ``stream`` only the headers are read; the body is left on the
+        connection behind ``response.raw`` and the connection is released
+        once the body has been consumed.
+        """
+        try:
             # Send the actual request
-            request_data = request.to_bytes()
             logger.debug(f"Sending {request.method.value} request to {host}:{port}{request.path}")
-            tls_sock.sendall(request_data)
+            
+            if trace:
+                trace.connection_ready = time.monotonic()
+            try:
+                sent = self._send_request(tls_sock, request)
+            except (ssl.SSLError, ConnectionError) as e:
+                raise _StaleConnectionError(f"Failed to send request: {e}")
+            if trace:
+                trace.bytes_sent += sent
+                trace.mark("request_sent")
             
             # Read response with timeout
             tls_sock.settimeout(self.config.request_timeout)
-            response_data = self._read_response_data(tls_sock)
+            expect_body = request.method != GurtMethod.HEAD
+            
+            if stream:
+                response, parser, body_parts = self._read_head(tls_sock, expect_body, trace)
+                logger.debug(f"Received response headers: {response.status_code} {response.status_message}")
+                response.raw = GurtBodyStream(
+                    tls_sock, parser, b"".join(body_parts),
+                    lambda reusable: self._finish_stream(host, port, tls_sock, response, reusable)
+                )
+                self._decode_content(response)
+                return response
             
-            # Parse and return response
-            response = GurtResponse.parse(response_data)
+            response = self._read_response(tls_sock, expect_body, trace)
             logger.debug(f"Received response: {response.status_code} {response.status_message}")
+            self._decode_content(response)
             
+        except BaseException:
+            try:
+                tls_sock.close()
+            except Exception:
+                pass
+            raise
+        
+        self._release_connection(host, port, tls_sock, response)
+        return response
+    
+    def _send_request_internal(self, host: str, port: int, request: GurtRequest,
+                               stream: bool = False) -> GurtResponse:
+        """Send a request through every client layer"""
+        if self.config.compress_requests_min_size is not None:
+            self._compress_request(request)
+        response = self._send_cached(host, port, request, stream)
+        if self.config.json_codec is not None:
+            response.codec = self.config.json_codec
+        return response
+    
+    def _send_cached(self, host: str, port: int, request: GurtRequest,
+                     stream: bool = False) -> GurtResponse:
+        """Send a request, answering GETs from the response cache when one is configured"""
+        cache = self.config.response_cache
+        if cache is None or stream:
+            return self._send_uncached(host, port, request, stream)
+        
+        url = f"gurt://{host}:{port}{request.path}"
+        if request.method != GurtMethod.GET:
+            response = self._send_uncached(host, port, request)
+            cache.invalidate(url, request, response)
             return response
+        
+        entry = cache.lookup(url, request)
+        if entry is not None:
+            if entry.is_fresh():
+                return cache.hit(entry)
+            if entry.can_serve_stale():
+                if cache.begin_refresh(url):
+                    threading.Thread(
+                        target=self._refresh_cached, args=(cache, url, host, port, request, entry),
+                        name="gurt-cache-refresh", daemon=True
+                    ).start()
+                return cache.hit(entry, stale=True)
+        
+        response = self._send_uncached(host, port, cache.make_conditional(request, entry))
+        return cache.finish(url, request, response, entry)
+    
+    def _refresh_cached(self, cache: ResponseCache, url: str, host: str, port: int,
+                        request: GurtRequest, entry: CacheEntry) -> None:
+        """Revalidate a stale entry in the background (stale-while-revalidate)"""
+        try:
+            response = self._send_uncached(host, port, cache.make_conditional(request, entry))
+            cache.finish(url, request, response, entry)
+        except GurtError as e:
+            logger.debug(f"Background revalidation of {url} failed: {e}")
+        finally:
+            cache.end_refresh(url)
+    
+    def _send_uncached(self, host: str, port: int, request: GurtRequest,
+                       stream: bool = False) -> GurtResponse:
+        """Send a request, retrying transient failures as the retry policy allows"""
+        policy = self.config.retry_policy
+        if policy is None:
+            return self._attempt(host, port, request, stream)
+        
+        policy.start(request)
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.monotonic()
+            try:
+                response = self._attempt(host, port, request, stream)
+            except GurtError as e:
+                delay = policy.evaluate(request, host, port, attempt, started, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = policy.evaluate(request, host, port, attempt, started, response=response)
+                if delay is None:
+                    return response
+                response.close()
+            
+            time.sleep(delay)
+    
+    def _attempt(self, host: str, port: int, request: GurtRequest,
+                 stream: bool = False) -> GurtResponse:
+        """Make one attempt at a request through the circuit breaker and rate limiter"""
+        breaker = self.config.circuit_breaker
+        if breaker is None:
+            return self._limited_send(host, port, request, stream)
+        
+        breaker.before_request(host, port)
+        try:
+            response = self._limited_send(host, port, request, stream)
+        except BaseException as e:
+            breaker.record(host, port, error=e)
+            raise
+        breaker.record(host, port, response=response)
+        return response
+    
+    def _limited_send(self, host: str, port: int, request: GurtRequest,
+                      stream: bool = False) -> GurtResponse:
+        """Send once, waiting for the rate limiter first"""
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return self._send_once(host, port, request, stream)
+        
+        delay = limiter.acquire(host, port, request.path)
+        if delay > 0:
+            time.sleep(delay)
+        
+        response = self._send_once(host, port, request, stream)
+        limiter.observe(host, port, request.path, response)
+        return response
+    
+    def _send_once(self, host: str, port: int, request: GurtRequest,
+                   stream: bool = False) -> GurtResponse:
+        """Send a request over a pooled or new connection and return the response"""
+        hooks = self.config.hooks
+        trace = hooks.start(host, port, request) if hooks is not None else None
+        if trace is None:
+            return self._transmit(host, port, request, stream)
+        
+        try:
+            response = self._transmit(host, port, request, stream, trace)
+        except BaseException as e:
+            trace.finish(error=e)
+            raise
+        trace.finish(response)
+        return response
+    
+    def _transmit(self, host: str, port: int, request: GurtRequest, stream: bool = False,
+                  trace: Optional[RequestTrace] = None) -> GurtResponse:
+        """Acquire a connection and exchange the request on it"""
+        try:
+            tls_sock, reused = self._acquire_connection(host, port, trace)
+            
+            try:
+                return self._exchange(tls_sock, host, port, request, stream, trace)
+            except _StaleConnectionError as e:
+                if not reused or not self._can_resend(request, e) or not request.rewind_body():
+                    raise
+                # The server dropped an idle connection, so retry once on a new one
+                logger.debug(f"Pooled connection to {host}:{port} was closed, reconnecting")
+                if trace:
+                    trace.connection_reused = False
+                tls_sock = self._open_connection(host, port, trace)
+                return self._exchange(tls_sock, host, port, request, stream, trace)
             
         except socket.timeout:
             raise GurtTimeoutError("Request timeout")
@@ -224,79 +716,81 @@ class GurtClient:
             if isinstance(e, GurtError):
                 raise
             raise GurtConnectionError(f"Request failed: {e}")
-        finally:
-            # Clean up connections
-            if tls_sock:
-                try:
-                    tls_sock.close()
-                except:
-                    pass
-            elif sock:
-                try:
-                    sock.close()
-                except:
-                    pass
-    
-    def get(self, url: str) -> GurtResponse:
+    
+    def get(self, url: str, stream: bool = False) -> GurtResponse:
         """Send a GET request"""
         host, port, path = self._parse_gurt_url(url)
-        request = GurtRequest(GurtMethod.GET, path)
-        request.with_header("Host", host)
-        request.with_header("User-Agent", self.config.user_agent)
+        request = self._build_request(GurtMethod.GET, host, path)
         
-        return self._send_request_internal(host, port, request)
+        return self._send_request_internal(host, port, request, stream)
     
-    def post(self, url: str, body: str = "", content_type: str = "text/plain") -> GurtResponse:
-        """Send a POST request"""
+    def post(self, url: str, body: RequestBody = "", content_type: str = "text/plain",
+             stream: bool = False, content_length: Optional[int] = None) -> GurtResponse:
+        """Send a POST request
+        
+        ``body`` may be a file object or an iterator of bytes to upload it in
+        chunks; iterators need an explicit ``content_length``.
+        """
         host, port, path = self._parse_gurt_url(url)
-        request = GurtRequest(GurtMethod.POST, path)
-        request.with_header("Host", host)
-        request.with_header("User-Agent", self.config.user_agent)
-        request.with_header("Content-Type", content_type)
-        request.with_body(body)
+        request = self._build_request(GurtMethod.POST, host, path, body, content_type, content_length)
         
-        return self._send_request_internal(host, port, request)
+        return self._send_request_internal(host, port, request, stream)
     
     def post_json(self, url: str, data: Any) -> GurtResponse:
         """Send a POST request with JSON data"""
-        import json
-        json_body = json.dumps(data)
-        return self.post(url, json_body, "application/json")
+        return self.post(url, self.json_codec.dumps(data), "application/json")
     
-    def put(self, url: str, body: str = "", content_type: str = "text/plain") -> GurtResponse:
-        """Send a PUT request"""
+    def put(self, url: str, body: RequestBody = "", content_type: str = "text/plain",
+            stream: bool = False, content_length: Optional[int] = None) -> GurtResponse:
+        """Send a PUT request
+        
+        ``body`` may be a file object or an iterator of bytes to upload it in
+        chunks; iterators need an explicit ``content_length``.
+        """
         host, port, path = self._parse_gurt_url(url)
-        request = GurtRequest(GurtMethod.PUT, path)
-        request.with_header("Host", host)
-        request.with_header("User-Agent", self.config.user_agent)
-        request.with_header("Content-Type", content_type)
-        request.with_body(body)
+        request = self._build_request(GurtMethod.PUT, host, path, body, content_type, content_length)
         
-        return self._send_request_internal(host, port, request)
+        return self._send_request_internal(host, port, request, stream)
     
-    def delete(self, url: str) -> GurtResponse:
+    def delete(self, url: str, stream: bool = False) -> GurtResponse:
         """Send a DELETE request"""
         host, port, path = self._parse_gurt_url(url)
-        request = GurtRequest(GurtMethod.DELETE, path)
-        request.with_header("Host", host)
-        request.with_header("User-Agent", self.config.user_agent)
+        request = self._build_request(GurtMethod.DELETE, host, path)
         
-        return self._send_request_internal(host, port, request)
+        return self._send_request_internal(host, port, request, stream)
     
     def head(self, url: str) -> GurtResponse:
         """Send a HEAD request"""
         host, port, path = self._parse_gurt_url(url)
-        request = GurtRequest(GurtMethod.HEAD, path)
-        request.with_header("Host", host)
-        request.with_header("User-Agent", self.config.user_agent)
+        request = self._build_request(GurtMethod.HEAD, host, path)
         
         return self._send_request_internal(host, port, request)
     
-    def options(self, url: str) -> GurtResponse:
+    def options(self, url: str, stream: bool = False) -> GurtResponse:
         """Send an OPTIONS request"""
         host, port, path = self._parse_gurt_url(url)
-        request = GurtRequest(GurtMethod.OPTIONS, path)
-        request.with_header("Host", host)
-        request.with_header("User-Agent", self.config.user_agent)
+        request = self._build_request(GurtMethod.OPTIONS, host, path)
+        
+        return self._send_request_internal(host, port, request, stream)
+    
+    def fetch_many(self, requests: Iterable[BatchItem], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                   per_host_limit: Optional[int] = None, ordered: bool = False) -> Iterator[BatchResult]:
+        """Send many requests concurrently, yielding a BatchResult for each
+        
+        ``requests`` holds URLs (sent as GET) or BatchRequest objects. Results
+        arrive in completion order unless ``ordered`` is set; failures are
+        returned per item in ``result.error``.
+        """
+        return fetch_many(self, requests, max_concurrency, per_host_limit, ordered)
+    
+    def download(self, url: str, path: str, connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE, resume: bool = True,
+                 retries: int = DEFAULT_SEGMENT_RETRIES,
+                 progress: Optional[ProgressCallback] = None) -> DownloadResult:
+        """Download ``url`` into the file ``path`` using parallel byte-range requests
         
-        return self._send_request_internal(host, port, request)
\ No newline at end of file
+        Interrupted downloads resume from ``<path>.part`` when ``resume`` is
+        set. ``progress(received, size)`` is called from the download
+        threads as data arrives. See gurt.download.
+        """
+        return Downloader(self, url, path, connections, segment_size, resume, retries, progress).run()
@@ -0,0 +1,220 @@
+"""
+GURT JSON codecs - pluggable JSON encoding and incremental decoding of large arrays
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+_WHITESPACE = " \t\n\r"
+_NOT_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+
+class JSONCodec:
+    """Turns values into JSON bytes and back
+
+    Subclass this to plug in another JSON library. ``loads`` must accept
+    bytes, bytearray and memoryview as well as str.
+    """
+
+    name = "base"
+
+    def dumps(self, data: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: Union[str, BufferLike]) -> Any:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """The json module, with compact separators"""
+
+    name = "json"
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+        self._decoder = json.JSONDecoder()
+
+    def dumps(self, data: Any) -> bytes:
+        # ensure_ascii output, so encoding is a plain copy
+        return self._encoder.encode(data).encode('utf-8')
+
+    def loads(self, data: Union[str, BufferLike]) -> Any:
+        if not isinstance(data, str):
+            data = str(data, 'utf-8')  # Decodes a memoryview without copying it to bytes first
+        return self._decoder.decode(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson, which encodes to bytes and decodes buffers directly
+
+    Raises ImportError if orjson is not installed.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data)
+
+    def loads(self, data: Union[str, BufferLike]) -> Any:
+        return self._orjson.loads(data)
+
+
+_default_codec: Optional[JSONCodec] = None
+
+
+def get_default_codec() -> JSONCodec:
+    """The process-wide codec: the json module unless replaced with set_default_codec()
+
+    orjson is opt-in, as it rejects NaN and Infinity, limits integers to
+    64 bits and raises different errors.
+    """
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = StdlibJSONCodec()
+    return _default_codec
+
+
+def set_default_codec(codec: Optional[JSONCodec]) -> None:
+    """Replace the process-wide codec; None goes back to the json module"""
+    global _default_codec
+    _default_codec = codec
+
+
+class _ArrayReader:
+    """Pulls text from byte chunks and decodes the items of one JSON array"""
+
+    def __init__(self, chunks: Iterable[BufferLike]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self, at_least: int = 1) -> bool:
+        """Append at least ``at_least`` more characters; False once the input is exhausted"""
+        if self.eof:
+            return False
+        pieces = [self.text[self.pos:]]  # Drop what has been consumed
+        added = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            pieces.append(text)
+            added += len(text)
+            if added >= at_least:
+                break
+        else:
+            pieces.append(self._utf8.decode(b"", final=True))
+            self.eof = True
+        self.text = "".join(pieces)
+        self.pos = 0
+        return added > 0 or not self.eof
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.text, self.pos)
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the input"""
+        while True:
+            match = _NOT_WHITESPACE.search(self.text, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.text[self.pos]
+            self.pos = len(self.text)
+            if not self._more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting {char!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value
+
+        A value that ends the buffer could continue in the next chunk
+        (``12`` of ``123``), so it only counts once something follows it.
+        An incomplete value waits until the buffer has doubled before it
+        is decoded again, which keeps large items linear.
+        """
+        if self.text[self.pos:self.pos + 1] in _WHITESPACE:  # Also true at the end of the buffer
+            self.peek()
+        scan = self._decoder.scan_once
+        while True:
+            try:
+                value, end = scan(self.text, self.pos)
+            except StopIteration as e:
+                # scan_once is what raw_decode calls; it reports a missing value this way
+                if self._more(len(self.text) - self.pos):
+                    continue
+                raise json.JSONDecodeError("Expecting value", self.text, e.value) from None
+            except json.JSONDecodeError:
+                if self._more(len(self.text) - self.pos):
+                    continue
+                raise
+            if end < len(self.text) or not self._more():
+                self.pos = end
+                return value
+
+    def key(self) -> str:
+        if self.peek() != '"':
+            raise self._error("Expecting property name enclosed in double quotes")
+        key = self.value()
+        self.expect(":")
+        return key
+
+    def seek(self, path: Sequence[str]) -> None:
+        """Descend through nested objects along ``path`` to the array to stream"""
+        for name in path:
+            self.expect("{")
+            while True:
+                if self.peek() == "}":
+                    raise self._error(f"No {name!r} member")
+                if self.key() == name:
+                    break
+                self.value()  # A sibling member; decoded and discarded
+                if self.peek() == ",":
+                    self.pos += 1
+
+    def items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.text[self.pos:self.pos + 1] == ",":  # Compact JSON has no whitespace to skip
+                self.pos += 1
+                continue
+            separator = self.peek()
+            if separator == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def iter_json_items(chunks: Iterable[BufferLike], path: Union[str, Sequence[str]] = ()) -> Iterator[Any]:
+    """Decode the items of a JSON array as its bytes arrive
+
+    ``chunks`` is any iterable of byte chunks, such as
+    ``response.iter_content()``. With ``path`` the array is looked up
+    through nested objects, e.g. ``"domains"`` for ``{"domains": [...]}``;
+    members before it are decoded and skipped, and the rest of the
+    document after the array is not read. Each item is decoded once it
+    is complete, so memory use is bounded by the largest item rather
+    than the whole document. Malformed input raises json.JSONDecodeError.
+    """
+    reader = _ArrayReader(chunks)
+    reader.seek([path] if isinstance(path, str) else path)
+    yield from reader.items()
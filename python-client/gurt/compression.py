@@ -0,0 +1,327 @@
+"""
+GURT content encoding - negotiated, streaming compression of message bodies
+"""
+
+import io
+import threading
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from .protocol import DEFAULT_READ_CHUNK_SIZE, MAX_MESSAGE_SIZE
+from .errors import GurtProtocolError
+
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Largest decoded body accepted by default; a small compressed body must not inflate without bound
+DEFAULT_MAX_DECODED_SIZE = MAX_MESSAGE_SIZE
+
+# Media types worth compressing; anything already compressed (images, archives) is left alone
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/xml",
+    "application/x-lua", "application/wasm", "image/svg+xml",
+)
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+
+class _ZlibDecoder:
+    """gzip or zlib-wrapped deflate, with an output limit per call"""
+
+    def __init__(self, wbits: int):
+        self._decoder = zlib.decompressobj(wbits)
+        # "deflate" may be zlib-wrapped or, from some servers, raw; the 2-byte zlib header tells them apart
+        self._header: Optional[bytes] = b"" if wbits == zlib.MAX_WBITS else None
+
+    def decompress(self, data, limit: int) -> bytes:
+        if self._header is not None:
+            data = self._header + bytes(data)
+            if len(data) < 2:
+                self._header = data  # Wait for the whole header
+                return b""
+            self._header = None
+            if data[0] & 0x0F != 8 or (data[0] << 8 | data[1]) % 31:
+                self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        try:
+            output = self._decoder.decompress(data, limit + 1)
+        except zlib.error as e:
+            raise GurtProtocolError(f"Invalid compressed body: {e}")
+        if self._decoder.unconsumed_tail:
+            raise GurtProtocolError("Decompressed body too large")
+        return output
+
+    def finish(self) -> bytes:
+        if not self._decoder.eof:
+            raise GurtProtocolError("Compressed body ended early")
+        return b""
+
+
+class _BrotliDecoder:
+    def __init__(self, brotli):
+        self._decoder = brotli.Decompressor()
+        self._error = brotli.error
+
+    def decompress(self, data, limit: int) -> bytes:
+        try:
+            return self._decoder.process(bytes(data))
+        except self._error as e:
+            raise GurtProtocolError(f"Invalid compressed body: {e}")
+
+    def finish(self) -> bytes:
+        if not getattr(self._decoder, 'is_finished', lambda: True)():
+            raise GurtProtocolError("Compressed body ended early")
+        return b""
+
+
+class _ZstdDecoder:
+    def __init__(self, zstandard):
+        self._decoder = zstandard.ZstdDecompressor().decompressobj()
+        self._error = zstandard.ZstdError
+
+    def decompress(self, data, limit: int) -> bytes:
+        try:
+            return self._decoder.decompress(bytes(data))
+        except self._error as e:
+            raise GurtProtocolError(f"Invalid compressed body: {e}")
+
+    def finish(self) -> bytes:
+        if not getattr(self._decoder, 'eof', True):
+            raise GurtProtocolError("Compressed body ended early")
+        return b""
+
+
+def _gzip_compress(data, level: int) -> bytes:
+    encoder = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return encoder.compress(data) + encoder.flush()
+
+
+class _Codec:
+    __slots__ = ('compress', 'decoder')
+
+    def __init__(self, compress: Callable[..., bytes], decoder: Callable[[], object]):
+        self.compress = compress
+        self.decoder = decoder
+
+
+_codecs: Optional[Dict[str, _Codec]] = None
+
+
+def _load_codecs() -> Dict[str, _Codec]:
+    """Available encodings, best first; brotli and zstandard are used when installed"""
+    global _codecs
+    if _codecs is None:
+        codecs = {}
+        try:
+            import zstandard
+            codecs["zstd"] = _Codec(
+                lambda data, level: zstandard.ZstdCompressor(level=min(level, 19)).compress(bytes(data)),
+                lambda: _ZstdDecoder(zstandard)
+            )
+        except ImportError:
+            pass
+        try:
+            import brotli
+            codecs["br"] = _Codec(
+                lambda data, level: brotli.compress(bytes(data), quality=min(level, 11)),
+                lambda: _BrotliDecoder(brotli)
+            )
+        except ImportError:
+            pass
+        codecs["gzip"] = _Codec(_gzip_compress, lambda: _ZlibDecoder(zlib.MAX_WBITS | 16))
+        codecs["deflate"] = _Codec(zlib.compress, lambda: _ZlibDecoder(zlib.MAX_WBITS))
+        _codecs = codecs
+    return _codecs
+
+
+def supported_encodings() -> List[str]:
+    """Content codings this process can compress and decompress, in order of preference"""
+    return list(_load_codecs())
+
+
+def accept_encoding() -> str:
+    """The accept-encoding value for every supported coding"""
+    return ", ".join(_load_codecs())
+
+
+def choose_encoding(accept: Optional[str]) -> Optional[str]:
+    """The preferred supported coding allowed by an accept-encoding value, if any"""
+    if not accept:
+        return None
+    allowed = {}
+    for item in accept.lower().split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        allowed[name.strip()] = quality
+    wildcard = allowed.get("*", 0.0)
+    for name in _load_codecs():
+        if allowed.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").partition(";")[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+def compress(data, encoding: str, level: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    """Compress a whole body with ``encoding``"""
+    codec = _load_codecs().get(encoding)
+    if codec is None:
+        raise GurtProtocolError(f"Unsupported content-encoding: {encoding}")
+    return codec.compress(data, level)
+
+
+class ContentDecoder:
+    """Incrementally decodes a body sent with one or more content codings
+
+    ``max_size`` bounds the decoded size so a small compressed body cannot
+    expand without limit.
+    """
+
+    def __init__(self, content_encoding: str, max_size: int):
+        codecs = _load_codecs()
+        names = [name.strip().lower() for name in content_encoding.split(",")]
+        names = [name for name in names if name and name != "identity"]
+        unsupported = [name for name in names if name not in codecs]
+        if unsupported:
+            raise GurtProtocolError(f"Unsupported content-encoding: {', '.join(unsupported)}")
+        # Codings are listed in the order they were applied, so they are undone in reverse
+        self._decoders = [codecs[name].decoder() for name in reversed(names)]
+        self.max_size = max_size
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def decode(self, data) -> bytes:
+        self.bytes_in += len(data)
+        for decoder in self._decoders:
+            data = decoder.decompress(data, self.max_size - self.bytes_out)
+        self.bytes_out += len(data)
+        if self.bytes_out > self.max_size:
+            raise GurtProtocolError("Decompressed body too large")
+        return data
+
+    def finish(self) -> bytes:
+        """Check that every coding reached its end"""
+        for decoder in self._decoders:
+            decoder.finish()
+        return b""
+
+
+class DecodingStream(io.RawIOBase):
+    """File-like reader that decompresses a streamed body as it is read"""
+
+    def __init__(self, raw: io.RawIOBase, decoder: ContentDecoder,
+                 on_done: Optional[Callable[[ContentDecoder], None]] = None,
+                 chunk_size: int = DEFAULT_READ_CHUNK_SIZE):
+        super().__init__()
+        self._raw = raw
+        self._decoder = decoder
+        self._on_done = on_done
+        self._chunk = bytearray(chunk_size)
+        self._pending = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._eof:
+            nbytes = self._raw.readinto(self._chunk)
+            if nbytes:
+                self._pending = memoryview(self._decoder.decode(memoryview(self._chunk)[:nbytes]))
+            else:
+                self._decoder.finish()
+                self._eof = True
+                if self._on_done:
+                    self._on_done(self._decoder)
+        nbytes = min(len(buffer), len(self._pending))
+        buffer[:nbytes] = self._pending[:nbytes]
+        self._pending = self._pending[nbytes:]
+        return nbytes
+
+    def close(self) -> None:
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+
+def decode_response(response, content_encoding: str, max_size: int,
+                    stats: Optional['CompressionStats'] = None) -> None:
+    """Arrange for a compressed response body to be decoded as it is read
+
+    A streamed body is wrapped in a DecodingStream; a complete one is
+    decoded the first time ``body`` is used. Headers are left as received.
+    Codings that are not supported leave the body as it is.
+    """
+    if response.raw is None and not len(response.body):
+        return  # HEAD, NOT_MODIFIED and other empty bodies
+    try:
+        decoder = ContentDecoder(content_encoding, max_size)
+    except GurtProtocolError:
+        return
+
+    def done(decoder: ContentDecoder) -> None:
+        if stats is not None:
+            stats.record_received(decoder.bytes_in, decoder.bytes_out)
+
+    if response.raw is not None:
+        response.raw = DecodingStream(response.raw, decoder, done)
+        response.decoded_encoding = content_encoding
+        return
+
+    def decode(body) -> bytes:
+        data = decoder.decode(body)
+        decoder.finish()
+        done(decoder)
+        return data
+
+    response._decoder = decode
+    response.decoded_encoding = content_encoding
+
+
+class CompressionStats:
+    """Bytes before and after compression, for bodies sent and received
+
+    Ratios are uncompressed size over compressed size, so 5.0 means the
+    wire carried a fifth of the data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sent = [0, 0, 0]  # messages, uncompressed bytes, compressed bytes
+        self._received = [0, 0, 0]
+
+    def record_sent(self, uncompressed: int, compressed: int) -> None:
+        with self._lock:
+            self._sent[0] += 1
+            self._sent[1] += uncompressed
+            self._sent[2] += compressed
+
+    def record_received(self, compressed: int, uncompressed: int) -> None:
+        with self._lock:
+            self._received[0] += 1
+            self._received[1] += uncompressed
+            self._received[2] += compressed
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            sent, received = list(self._sent), list(self._received)
+
+        def ratio(counts: List[int]) -> float:
+            return counts[1] / counts[2] if counts[2] else 0.0
+
+        return {
+            "sent_compressed": sent[0],
+            "sent_bytes_uncompressed": sent[1],
+            "sent_bytes_compressed": sent[2],
+            "sent_ratio": ratio(sent),
+            "received_compressed": received[0],
+            "received_bytes_uncompressed": received[1],
+            "received_bytes_compressed": received[2],
+            "received_ratio": ratio(received),
+        }
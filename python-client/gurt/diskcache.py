@@ -0,0 +1,255 @@
+"""
+GURT on-disk response cache store - content-addressed blobs with an index file
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+from .cache import CacheEntry, CacheStore
+from .message import BufferLike
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Total size of bodies kept on disk
+DEFAULT_DISK_CACHE_SIZE = 256 * 1024 * 1024  # 256MB
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "lock"
+BLOB_DIR = "blobs"
+INDEX_VERSION = 1
+
+# Index record layout: [status, message, headers, blob digest, size, stored_at, last_access]
+_STATUS, _MESSAGE, _HEADERS, _DIGEST, _SIZE, _STORED_AT, _ACCESSED = range(7)
+
+
+def _map_file(path: str) -> BufferLike:
+    """Return the file's contents as a read-only memoryview over an mmap"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        # The mapping stays valid after the file is closed, or even unlinked
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class DiskCacheStore(CacheStore):
+    """Response cache store kept in a directory shared between processes
+
+    Bodies are written once to ``blobs/`` under their SHA-256 digest and read
+    back as memory-mapped views, so a warm cache costs page cache rather than
+    Python heap. ``index.json`` maps cache keys to status, headers and digest.
+    Every file is written to a temporary name and renamed into place, and
+    index updates are serialised with an advisory lock on ``lock``, so
+    several processes can use the same directory.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_DISK_CACHE_SIZE):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(self.path, INDEX_FILE)
+        self._blob_root = os.path.join(self.path, BLOB_DIR)
+        os.makedirs(self._blob_root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, list] = {}
+        self._index_stamp: Optional[Tuple[int, int, int]] = None
+        self._accessed: Dict[str, float] = {}  # Access times not yet written to the index
+        self.evictions = 0
+
+    # Index handling
+
+    def _stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self._index_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _refresh_index(self) -> None:
+        """Reload the index if another process replaced it (caller holds the lock)"""
+        stamp = self._stamp()
+        if stamp == self._index_stamp:
+            return
+
+        index: Dict[str, list] = {}
+        if stamp is not None:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    index = data.get("entries", {})
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable cache index {self._index_path}: {e}")
+
+        self._index = index
+        self._index_stamp = stamp
+
+    def _write_index(self) -> None:
+        """Atomically replace the index file (caller holds both locks)"""
+        for key, accessed in self._accessed.items():
+            record = self._index.get(key)
+            if record is not None:
+                record[_ACCESSED] = max(record[_ACCESSED], accessed)
+        self._accessed.clear()
+
+        data = json.dumps({"version": INDEX_VERSION, "entries": self._index}, separators=(",", ":"))
+        self._write_atomic(self._index_path, data.encode("utf-8"))
+        self._index_stamp = self._stamp()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the thread lock and the inter-process lock with a fresh index"""
+        with self._lock:
+            with open(os.path.join(self.path, LOCK_FILE), "a+b") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._refresh_index()
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    # Files
+
+    def _write_atomic(self, path: str, data: BufferLike) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blob_root, digest[:2], digest)
+
+    def _remove_blob(self, digest: str) -> None:
+        """Delete a blob unless another entry still refers to it (caller holds the lock)"""
+        if any(record[_DIGEST] == digest for record in self._index.values()):
+            return
+        try:
+            os.unlink(self._blob_path(digest))
+        except OSError:
+            # Already gone, or still mapped on a platform that forbids unlinking it
+            pass
+
+    # CacheStore interface
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            self._refresh_index()
+            record = self._index.get(key)
+            if record is None:
+                return None
+            self._accessed[key] = time.time()
+
+        try:
+            body = _map_file(self._blob_path(record[_DIGEST]))
+        except OSError:
+            # Evicted by another process since the index was read
+            return None
+
+        return CacheEntry(record[_STATUS], record[_MESSAGE], dict(record[_HEADERS]), body, record[_STORED_AT])
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+
+        digest = hashlib.sha256(entry.body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            self._write_atomic(blob_path, entry.body)
+
+        with self._exclusive():
+            if not os.path.exists(blob_path):
+                # Another process evicted the blob between our write and taking the lock
+                self._write_atomic(blob_path, entry.body)
+
+            old = self._index.get(key)
+            self._index[key] = [
+                int(entry.status_code), entry.status_message, entry.headers,
+                digest, size, entry.stored_at, time.time()
+            ]
+            if old is not None and old[_DIGEST] != digest:
+                self._remove_blob(old[_DIGEST])
+
+            self._evict()
+            self._write_index()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits (caller holds the lock)"""
+        total = sum(record[_SIZE] for record in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        def last_access(item) -> float:
+            key, record = item
+            return max(record[_ACCESSED], self._accessed.get(key, 0))
+
+        for key, record in sorted(self._index.items(), key=last_access):
+            if total <= self.max_bytes:
+                break
+            del self._index[key]
+            self._accessed.pop(key, None)
+            self._remove_blob(record[_DIGEST])
+            total -= record[_SIZE]
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._exclusive():
+            record = self._index.pop(key, None)
+            if record is None:
+                return
+            self._remove_blob(record[_DIGEST])
+            self._write_index()
+
+    def clear(self) -> None:
+        """Remove every entry, blob and leftover temporary file"""
+        with self._exclusive():
+            self._index = {}
+            self._accessed.clear()
+            for root, _, files in os.walk(self._blob_root):
+                for name in files:
+                    try:
+                        os.unlink(os.path.join(root, name))
+                    except OSError:
+                        pass
+            self._write_index()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._refresh_index()
+            blobs = {record[_DIGEST]: record[_SIZE] for record in self._index.values()}
+            return {
+                "entries": len(self._index),
+                "size": sum(record[_SIZE] for record in self._index.values()),
+                "blobs": len(blobs),
+                "disk_size": sum(blobs.values()),
+                "evictions": self.evictions,
+            }
+
+    def keys(self) -> List[str]:
+        """Cache keys currently in the index"""
+        with self._lock:
+            self._refresh_index()
+            return list(self._index)
@@ -0,0 +1,245 @@
+"""
+GURT domain resolution through the Gurted DNS server
+"""
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import logging
+
+from .protocol import DEFAULT_PORT
+from .codec import get_default_codec
+from .errors import GurtError, GurtDNSError
+
+logger = logging.getLogger(__name__)
+
+# Public Gurted DNS server used by the reference clients
+DEFAULT_DNS_SERVER = "135.125.163.131"
+
+# Cache defaults (seconds / entries)
+DEFAULT_DNS_CACHE_SIZE = 1024
+DEFAULT_DNS_TTL = 300
+DEFAULT_NEGATIVE_TTL = 30
+
+
+class Resolver:
+    """Interface for pluggable host name resolvers"""
+
+    def resolve(self, host: str) -> str:
+        """Return the address to connect to for ``host``"""
+        raise NotImplementedError
+
+    def cached(self, host: str) -> Optional[str]:
+        """Return the address for ``host`` without blocking, or None if unknown"""
+        return None
+
+
+class _CacheEntry:
+    """Cached resolution result, positive (address) or negative (error)"""
+
+    def __init__(self, address: Optional[str], error: Optional[str], ttl: float):
+        self.address = address
+        self.error = error
+        self.expires_at = time.monotonic() + ttl
+
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class _Lookup:
+    """An in-flight lookup that concurrent callers for the same name wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[_CacheEntry] = None
+        self.exception: Optional[BaseException] = None
+
+
+class GurtDNSResolver(Resolver):
+    """Resolves Gurted domains via the DNS server's /resolve-full endpoint
+
+    Results are kept in a bounded LRU cache honouring record TTLs, failed
+    lookups are cached for ``negative_ttl`` seconds, and concurrent misses
+    for the same name share a single request to the DNS server.
+    """
+
+    def __init__(
+        self,
+        dns_server: str = DEFAULT_DNS_SERVER,
+        dns_port: int = DEFAULT_PORT,
+        client=None,
+        max_entries: int = DEFAULT_DNS_CACHE_SIZE,
+        default_ttl: float = DEFAULT_DNS_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL
+    ):
+        self.dns_server = dns_server
+        self.dns_port = dns_port
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._client = client
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, _Lookup] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.coalesced = 0
+
+    def _get_client(self):
+        if self._client is None:
+            from .client import GurtClient
+            self._client = GurtClient()
+        return self._client
+
+    @staticmethod
+    def _static_address(host: str) -> Optional[str]:
+        """Addresses that never need a DNS round trip"""
+        if host == "localhost":
+            return "127.0.0.1"
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            return None
+
+    def _cache_get(self, name: str) -> Optional[_CacheEntry]:
+        """Return a fresh cache entry and count the hit (caller holds the lock)"""
+        entry = self._cache.get(name)
+        if entry is None:
+            return None
+
+        if entry.is_expired():
+            del self._cache[name]
+            return None
+
+        self._cache.move_to_end(name)
+        if entry.error is not None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _cache_put(self, name: str, entry: _CacheEntry) -> None:
+        """Store an entry, evicting the least recently used (caller holds the lock)"""
+        self._cache[name] = entry
+        self._cache.move_to_end(name)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _result(entry: _CacheEntry) -> str:
+        if entry.error is not None:
+            raise GurtDNSError(entry.error)
+        return entry.address
+
+    def cached(self, host: str) -> Optional[str]:
+        """Return a cached or static address without a network lookup"""
+        static = self._static_address(host)
+        if static:
+            return static
+
+        name = host.lower().rstrip(".")
+        with self._lock:
+            entry = self._cache_get(name)
+        return self._result(entry) if entry else None
+
+    def resolve(self, host: str) -> str:
+        """Resolve a domain to an address, consulting the cache first"""
+        static = self._static_address(host)
+        if static:
+            return static
+
+        name = host.lower().rstrip(".")
+
+        with self._lock:
+            entry = self._cache_get(name)
+            if entry:
+                return self._result(entry)
+
+            lookup = self._inflight.get(name)
+            owner = lookup is None
+            if owner:
+                self.misses += 1
+                lookup = _Lookup()
+                self._inflight[name] = lookup
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            lookup.done.wait()
+            if lookup.exception is not None:
+                raise lookup.exception
+            return self._result(lookup.entry)
+
+        try:
+            lookup.entry = self._query(name)
+            with self._lock:
+                self._cache_put(name, lookup.entry)
+        except BaseException as e:
+            lookup.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[name]
+            lookup.done.set()
+
+        return self._result(lookup.entry)
+
+    def _query(self, name: str) -> _CacheEntry:
+        """Ask the DNS server for the records of ``name``"""
+        logger.debug(f"Resolving domain {name} via DNS API")
+
+        url = f"gurt://{self.dns_server}:{self.dns_port}/resolve-full"
+        try:
+            response = self._get_client().post(url, get_default_codec().dumps({"domain": name}), "application/json")
+        except GurtError as e:
+            raise GurtDNSError(f"DNS resolution failed for {name}: {e}")
+
+        if response.status_code == 404:
+            return _CacheEntry(None, f"Domain not found: {name}", self.negative_ttl)
+
+        if response.status_code != 200:
+            # Server-side trouble is not an answer about the name, so it is not cached
+            raise GurtDNSError(
+                f"DNS resolution failed for {name}: {response.status_code} {response.status_message}"
+            )
+
+        try:
+            records = response.json().get("records", [])
+        except (ValueError, AttributeError) as e:
+            raise GurtDNSError(f"Invalid DNS response JSON: {e}")
+
+        address, ttl = self._select_address(records)
+        if address is None:
+            return _CacheEntry(None, f"No A record found for domain {name}", self.negative_ttl)
+
+        logger.debug(f"Resolved {name} to {address} (ttl {ttl}s)")
+        return _CacheEntry(address, None, ttl)
+
+    def _select_address(self, records) -> Tuple[Optional[str], float]:
+        """Pick the first A record, falling back to AAAA"""
+        for record_type in ("A", "AAAA"):
+            for record in records:
+                if record.get("type") == record_type and record.get("value"):
+                    ttl = record.get("ttl")
+                    return record["value"], ttl if ttl is not None else self.default_ttl
+        return None, 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "coalesced": self.coalesced,
+            }
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        with self._lock:
+            self._cache.clear()
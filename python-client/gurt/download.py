@@ -0,0 +1,518 @@
+"""
+GURT downloads - parallel byte-range segments written into a preallocated file, resumable
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .protocol import (
+    MAX_MESSAGE_SIZE, MAX_HEADER_SIZE, GurtStatusCode,
+    DEFAULT_SEGMENT_SIZE, DEFAULT_DOWNLOAD_CONNECTIONS, DEFAULT_SEGMENT_RETRIES
+)
+from .message import GurtMethod, GurtResponse
+from .errors import GurtConnectionError, GurtTimeoutError, GurtProtocolError, GurtDownloadError
+
+logger = logging.getLogger(__name__)
+
+# Each segment is one response, so it has to fit within the message size limit
+MAX_SEGMENT_SIZE = MAX_MESSAGE_SIZE - MAX_HEADER_SIZE
+
+# Progress is saved after at most this many new bytes, so a killed process loses little work
+CHECKPOINT_SIZE = 16 * 1024 * 1024
+
+PART_SUFFIX = ".part"  # Data is written here and renamed once verified
+STATE_SUFFIX = ".part.json"  # Progress of each segment, for resuming
+STATE_VERSION = 1
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """``(start, end, size)`` from a content-range header; ``end`` is inclusive
+
+    ``bytes */1000`` (sent with RANGE_NOT_SATISFIABLE) gives no start and
+    end, and an unknown size (``bytes 0-99/*``) gives None for ``size``.
+    """
+    unit, _, spec = (value or "").strip().partition(" ")
+    span, slash, size = spec.partition("/")
+    try:
+        if unit.lower() != "bytes" or not slash:
+            raise ValueError
+        total = None if size.strip() == "*" else int(size)
+        if span.strip() == "*":
+            return None, None, total
+        first, dash, last = span.partition("-")
+        start, end = int(first), int(last)
+        if not dash or start < 0 or end < start or (total is not None and end >= total):
+            raise ValueError
+        return start, end, total
+    except ValueError:
+        raise GurtProtocolError(f"Invalid content-range: {value!r}")
+
+
+class DownloadResult:
+    """Outcome of a download
+
+    ``bytes_received`` counts body bytes fetched by this run;
+    ``resumed_bytes`` were already on disk from an earlier, interrupted one.
+    ``ranged`` is False when the server ignored ranges and the resource
+    came as a single stream.
+    """
+
+    def __init__(self, url: str, path: str):
+        self.url = url
+        self.path = path
+        self.size = 0
+        self.ranged = False
+        self.connections = 0
+        self.segments = 0
+        self.bytes_received = 0
+        self.resumed_bytes = 0
+        self.retries = 0
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes received per second"""
+        return self.bytes_received / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "path": self.path,
+            "size": self.size,
+            "ranged": self.ranged,
+            "connections": self.connections,
+            "segments": self.segments,
+            "bytes_received": self.bytes_received,
+            "resumed_bytes": self.resumed_bytes,
+            "retries": self.retries,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+        }
+
+    def __repr__(self) -> str:
+        return f"DownloadResult({self.url} -> {self.path}, {self.size} bytes)"
+
+
+class _Segment:
+    """A byte range of the file and how much of it has been written"""
+
+    __slots__ = ('start', 'end', 'done')
+
+    def __init__(self, start: int, end: int, done: int = 0):
+        self.start = start
+        self.end = end  # Exclusive
+        self.done = done
+
+    @property
+    def position(self) -> int:
+        return self.start + self.done
+
+    @property
+    def remaining(self) -> int:
+        return self.end - self.start - self.done
+
+
+class _FileWriter:
+    """Positional writes into a file of a fixed size, safe to share between threads"""
+
+    def __init__(self, path: str):
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        self._lock = None if hasattr(os, 'pwrite') else threading.Lock()
+
+    def size(self) -> int:
+        return os.fstat(self.fd).st_size
+
+    def allocate(self, size: int) -> None:
+        """Set the file size, reserving the disk space up front where supported"""
+        if self.size() != size:
+            os.ftruncate(self.fd, size)
+        if size and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(self.fd, 0, size)
+            except OSError:
+                pass  # Not supported by every filesystem; the file is sparse instead
+
+    def write_at(self, data: memoryview, offset: int) -> None:
+        if self._lock is not None:
+            with self._lock:
+                os.lseek(self.fd, offset, os.SEEK_SET)
+                while data:
+                    data = data[os.write(self.fd, data):]
+            return
+        while data:
+            written = os.pwrite(self.fd, data, offset)
+            data = data[written:]
+            offset += written
+
+    def sync(self) -> None:
+        """Make written data durable"""
+        getattr(os, 'fdatasync', os.fsync)(self.fd)
+
+    def close(self, sync: bool = False) -> None:
+        try:
+            if sync:
+                os.fsync(self.fd)
+        finally:
+            os.close(self.fd)
+
+
+class _Stopped(Exception):
+    """Another segment failed, so this one gives up early"""
+
+
+class Downloader:
+    """Downloads one resource into a file, fetching byte ranges over several connections
+
+    The first request asks for the first segment's range. If the server
+    answers PARTIAL_CONTENT, the rest of the file is split into
+    ``segment_size`` ranges fetched by ``connections`` threads. Each
+    segment is received with ``readinto`` and written with ``os.pwrite``
+    at its offset in ``<path>.part``, which is allocated at full size
+    first. Segments that fail part-way are requested again from where
+    they stopped, up to ``retries`` times each.
+
+    Progress is saved to ``<path>.part.json`` every ``checkpoint_size``
+    bytes, after the data it counts has been synced. With ``resume`` an
+    interrupted download continues from there, provided the server still
+    reports the same size and validator (etag or last-modified). Once
+    every segment is complete and the file has the announced size, the
+    part file is renamed to ``path``.
+
+    If the server ignores the range (answers OK), the body is written as
+    a single stream instead; it cannot be resumed and is limited to the
+    message size.
+    """
+
+    def __init__(
+        self,
+        client,
+        url: str,
+        path: str,
+        connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        resume: bool = True,
+        retries: int = DEFAULT_SEGMENT_RETRIES,
+        progress: Optional[ProgressCallback] = None
+    ):
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+            raise ValueError(f"segment_size must be between 1 and {MAX_SEGMENT_SIZE}")
+
+        self.client = client
+        self.url = url
+        self.path = path
+        self.part_path = path + PART_SUFFIX
+        self.state_path = path + STATE_SUFFIX
+        self.connections = connections
+        self.segment_size = segment_size
+        self.resume = resume
+        self.retries = retries
+        self.progress = progress
+        self.host, self.port, self.request_path = client._parse_gurt_url(url)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checkpoint_lock = threading.Lock()
+        self._unsaved = 0
+        self.checkpoint_size = CHECKPOINT_SIZE
+        self._segments: List[_Segment] = []
+        self._size = 0
+        self._validator: Optional[str] = None
+        self._writer: Optional[_FileWriter] = None
+        self._result = DownloadResult(url, path)
+
+    def _request(self, segment: Optional[_Segment] = None) -> GurtResponse:
+        """Start a GET for the rest of ``segment``, or for the whole resource"""
+        request = self.client._build_request(GurtMethod.GET, self.host, self.request_path)
+        request.with_header("accept-encoding", "identity")  # Byte ranges must count the stored bytes
+        if segment is not None:
+            request.with_header("range", f"bytes={segment.position}-{segment.end - 1}")
+            if self._validator:
+                # A changed resource comes back whole instead of as a mismatched range
+                request.with_header("if-range", self._validator)
+        return self.client._send_request_internal(self.host, self.port, request, stream=True)
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get("version") != STATE_VERSION or state.get("url") != self.url:
+                return None
+            if not 0 < state["segment_size"] <= MAX_SEGMENT_SIZE:
+                return None
+            if os.path.getsize(self.part_path) != state["size"]:
+                return None
+            return state
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_state(self, sync: bool = False) -> None:
+        """Record how far each segment got; written to a temporary file and renamed into place
+
+        With ``sync`` the part file is synced first, so the state never
+        counts bytes that a crash could still lose.
+        """
+        with self._lock:
+            self._unsaved = 0
+            state = {
+                "version": STATE_VERSION,
+                "url": self.url,
+                "size": self._size,
+                "validator": self._validator,
+                "segment_size": self.segment_size,
+                "done": [segment.done for segment in self._segments],
+            }
+        if sync:
+            self._writer.sync()
+        temporary = self.state_path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(temporary, self.state_path)
+
+    def _remove_state(self) -> None:
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+
+    def _layout(self, state: Optional[Dict[str, Any]]) -> None:
+        """Split the file into segments, keeping the progress recorded in ``state``"""
+        if state is not None:
+            self.segment_size = state["segment_size"]
+        self._segments = [
+            _Segment(start, min(start + self.segment_size, self._size))
+            for start in range(0, self._size, self.segment_size)
+        ]
+        if state is not None and len(state["done"]) == len(self._segments):
+            for segment, done in zip(self._segments, state["done"]):
+                segment.done = min(max(int(done), 0), segment.end - segment.start)
+            self._result.resumed_bytes = sum(segment.done for segment in self._segments)
+
+    def _advance(self, nbytes: int) -> None:
+        with self._lock:
+            self._result.bytes_received += nbytes
+            received = self._result.resumed_bytes + self._result.bytes_received
+            self._unsaved += nbytes
+            checkpoint = self._result.ranged and self._unsaved >= self.checkpoint_size
+        if checkpoint and self._checkpoint_lock.acquire(blocking=False):
+            # One thread saves while the others keep downloading
+            try:
+                self._save_state(sync=True)
+            finally:
+                self._checkpoint_lock.release()
+        if self.progress:
+            self.progress(received, self._size)
+
+    def _check_partial(self, response: GurtResponse, segment: _Segment) -> int:
+        """Validate a PARTIAL_CONTENT response for ``segment``; returns the bytes it carries"""
+        start, end, size = parse_content_range(response.get_header("content-range"))
+        if start != segment.position or size != self._size:
+            raise GurtDownloadError(
+                f"Server sent range {response.get_header('content-range')!r} "
+                f"for bytes {segment.position}-{segment.end - 1} of {self._size}"
+            )
+        # A server may send less than asked for; the rest is requested again
+        return min(end + 1, segment.end) - segment.position
+
+    def _receive(self, response: GurtResponse, segment: _Segment, length: int, buffer: bytearray) -> None:
+        """Write ``length`` body bytes of ``response`` at the segment's position"""
+        view = memoryview(buffer)
+        raw = response.raw
+        while length:
+            if self._stop.is_set():
+                raise _Stopped()
+            nbytes = raw.readinto(view[:min(len(buffer), length)])
+            if not nbytes:
+                raise GurtConnectionError("Connection closed before the range was complete")
+            self._writer.write_at(view[:nbytes], segment.position)
+            length -= nbytes
+            with self._lock:
+                segment.done += nbytes
+            self._advance(nbytes)
+
+    def _fetch(self, segment: _Segment, response: Optional[GurtResponse] = None) -> None:
+        """Complete one segment, retrying from where it stopped after a failure"""
+        buffer = bytearray(self.client.config.read_chunk_size)
+        failures = 0
+        while segment.remaining:
+            try:
+                if response is None:
+                    response = self._request(segment)
+                if response.status_code == GurtStatusCode.PARTIAL_CONTENT:
+                    self._receive(response, segment, self._check_partial(response, segment), buffer)
+                elif response.status_code == GurtStatusCode.OK:
+                    raise GurtDownloadError(f"{self.url} changed during the download")
+                elif response.is_server_error():
+                    raise GurtConnectionError(f"Server error {response.status_code} for a range")
+                else:
+                    raise GurtDownloadError(
+                        f"Range request failed: {response.status_code} {response.status_message}"
+                    )
+            except (GurtConnectionError, GurtTimeoutError) as e:
+                failures += 1
+                if failures > self.retries:
+                    raise
+                with self._lock:
+                    self._result.retries += 1
+                logger.debug(f"Retrying bytes {segment.position}-{segment.end - 1} of {self.url}: {e}")
+            finally:
+                if response is not None:
+                    response.close()
+                    response = None
+            if self._stop.is_set():
+                raise _Stopped()
+
+    def _run_segments(self, first: Optional[GurtResponse], first_start: Optional[int]) -> None:
+        """Fetch every unfinished segment; ``first`` is the probe response, starting at ``first_start``"""
+        pending = [segment for segment in self._segments if segment.remaining]
+        self._result.connections = min(self.connections, len(pending))
+
+        executor = ThreadPoolExecutor(max_workers=self._result.connections or 1, thread_name_prefix="gurt-download")
+        futures = []
+        try:
+            for segment in pending:
+                if first is not None and segment.position == first_start:
+                    futures.append(executor.submit(self._fetch, segment, first))
+                    first = None
+                else:
+                    futures.append(executor.submit(self._fetch, segment))
+            if first is not None:
+                first.close()  # Not needed after all, e.g. every segment was already written
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()  # Raises the first failure
+        except BaseException:
+            self._stop.set()
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+    def _run_single(self, response: GurtResponse) -> None:
+        """Write a complete (non-range) response body, starting over on failure"""
+        self._remove_state()
+        buffer = bytearray(self.client.config.read_chunk_size)
+        failures = 0
+        while True:
+            try:
+                if response is None:
+                    response = self._request()
+                    if response.status_code != GurtStatusCode.OK:
+                        raise GurtDownloadError(f"Download failed: {response.status_code} {response.status_message}")
+                size = response.headers.content_length or 0
+                self._size = size
+                self._segments = [_Segment(0, size)]
+                self._writer.allocate(size)
+                with self._lock:
+                    self._result.bytes_received = 0
+                self._receive(response, self._segments[0], size, buffer)
+                return
+            except (GurtConnectionError, GurtTimeoutError) as e:
+                failures += 1
+                if failures > self.retries:
+                    raise
+                self._result.retries += 1
+                logger.debug(f"Restarting single-stream download of {self.url}: {e}")
+            finally:
+                if response is not None:
+                    response.close()
+                    response = None
+
+    def _probe(self, state: Optional[Dict[str, Any]]) -> GurtResponse:
+        """Request the first range still needed, which also tells whether ranges work"""
+        if state is None:
+            return self._request(_Segment(0, self.segment_size))
+        self._size = state["size"]
+        self._validator = state["validator"]
+        self._layout(state)
+        pending = [segment for segment in self._segments if segment.remaining]
+        # With everything written the request only confirms the resource is unchanged
+        return self._request(pending[0] if pending else _Segment(0, 1))
+
+    def run(self) -> DownloadResult:
+        """Download to ``path`` and return what was transferred"""
+        result = self._result
+        start = time.perf_counter()
+        state = self._load_state() if self.resume else None
+        response = self._probe(state)
+        first_start = None
+
+        if response.status_code == GurtStatusCode.PARTIAL_CONTENT:
+            first_start, _, size = parse_content_range(response.get_header("content-range"))
+            if size is None:
+                response.close()
+                raise GurtDownloadError(f"Server did not report the size of {self.url}")
+            validator = response.get_header("etag") or response.get_header("last-modified")
+            if state is not None and (size != state["size"] or validator != state["validator"]):
+                logger.info(f"{self.url} changed since the interrupted download; starting over")
+                state = None
+            if state is None:
+                self._size = size
+                self._validator = validator
+                self._layout(None)
+                result.resumed_bytes = 0
+        elif response.status_code == GurtStatusCode.RANGE_NOT_SATISFIABLE:
+            response.close()
+            _, _, size = parse_content_range(response.get_header("content-range"))
+            if state is not None and size != state["size"]:
+                # The resource changed since the interrupted download; start over
+                self._remove_state()
+                return Downloader(
+                    self.client, self.url, self.path, self.connections, self.segment_size,
+                    False, self.retries, self.progress
+                ).run()
+            if size != 0:
+                raise GurtDownloadError(
+                    f"Range request failed for {self.url}: {response.get_header('content-range')!r}"
+                )
+            response = None  # An empty resource
+            self._size = 0
+            self._segments = []
+        elif response.status_code != GurtStatusCode.OK:
+            response.close()
+            raise GurtDownloadError(f"Download failed: {response.status_code} {response.status_message}")
+
+        self._writer = _FileWriter(self.part_path)
+        completed = False
+        try:
+            if response is not None and response.status_code == GurtStatusCode.OK:
+                self._run_single(response)
+            else:
+                result.ranged = True
+                self._writer.allocate(self._size)
+                self._save_state()
+                self._run_segments(response, first_start)
+            self._verify()
+            completed = True
+        finally:
+            # Synced on failure too, so the state saved below only counts durable bytes
+            self._writer.close(sync=completed or result.ranged)
+            if result.ranged and not completed:
+                with self._checkpoint_lock:
+                    self._save_state()  # Whatever was written can be resumed
+
+        os.replace(self.part_path, self.path)
+        self._remove_state()
+        result.size = self._size
+        result.segments = len(self._segments)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _verify(self) -> None:
+        incomplete = [segment for segment in self._segments if segment.remaining]
+        if incomplete:
+            raise GurtDownloadError(f"{len(incomplete)} segments of {self.url} are incomplete")
+        written = sum(segment.end - segment.start for segment in self._segments)
+        if written != self._size or self._writer.size() != self._size:
+            raise GurtDownloadError(
+                f"Downloaded file is {self._writer.size()} bytes, expected {self._size}"
+            )
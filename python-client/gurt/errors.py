@@ -24,4 +24,20 @@ class GurtTLSError(GurtError):
 
 class GurtHandshakeError(GurtError):
     """Raised when the GURT handshake fails"""
+    pass
+
+class GurtDNSError(GurtError):
+    """Raised when a domain cannot be resolved through the Gurted DNS"""
+    pass
+
+class GurtRateLimitError(GurtError):
+    """Raised when the client-side rate limiter rejects a request instead of waiting"""
+    pass
+
+class GurtCircuitOpenError(GurtError):
+    """Raised without contacting the server while its circuit breaker is open"""
+    pass
+
+class GurtDownloadError(GurtError):
+    """Raised when a download cannot be completed or its result fails verification"""
     pass
\ No newline at end of file
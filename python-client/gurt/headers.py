@@ -0,0 +1,290 @@
+"""
+GURT header collection - case-insensitive, ordered and multi-valued
+"""
+
+import re
+from collections.abc import MutableMapping
+from functools import lru_cache
+from sys import intern
+from typing import Iterable, Iterator, List, Mapping, Optional, Pattern, Tuple, Union
+
+from .protocol import HEADER_SEPARATOR
+
+HeadersLike = Union['GurtHeaders', Mapping[str, str], Iterable[Tuple[str, str]]]
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=64)
+def _line_pattern(key: str) -> Pattern[str]:
+    """Match the header lines of ``key`` in a raw block; group 1 is the unstripped value"""
+    return re.compile(r"^[ \t]*" + re.escape(key) + r"[ \t]*:(.*)$", re.IGNORECASE | re.MULTILINE)
+
+
+def _scan(block: str, key: str, first: bool) -> List[str]:
+    """Values of the lowercase ``key`` in an unparsed header block"""
+    if not block.isascii():
+        # Lowercasing may change the length of non-ASCII text, so offsets would not line up
+        pattern = _line_pattern(key)
+        if first:
+            match = pattern.search(block)
+            return [match.group(1).strip()] if match else []
+        return [value.strip() for value in pattern.findall(block)]
+
+    # One lowercase copy, prefixed so that every line starts after a newline
+    lowered = "\n" + block.lower()
+    values = []
+    index = lowered.find(key)
+    while index != -1:
+        # A name may be indented, as the parsed path strips it
+        start = index
+        while lowered[start - 1] in " \t":
+            start -= 1
+        colon = index + len(key)
+        while lowered[colon:colon + 1] in (" ", "\t"):
+            colon += 1
+        if lowered[start - 1] == "\n" and lowered[colon:colon + 1] == ":":
+            # lowered[i] is block[i - 1]
+            end = block.find(HEADER_SEPARATOR, colon)
+            values.append(block[colon:end if end != -1 else len(block)].strip())
+            if first:
+                break
+        index = lowered.find(key, index + 1)
+    return values
+
+
+class GurtHeaders(MutableMapping):
+    """Message headers kept as parallel lists of names and values
+
+    Lookups ignore case. Names are lowercased only when first needed, and
+    not at all when they already are, which is the norm on the wire.
+    Parsed names are interned, so retained messages share one copy of
+    each common name.
+    Insertion order and repeated headers are kept: ``headers[name]`` and
+    ``get()`` return the first value, ``get_all()`` every value. Setting
+    a header replaces all of its values; ``add()`` appends another one.
+    Iterating and ``items()`` yield lowercase names, repeats included.
+
+    Headers received from the network start as the raw header block.
+    ``get()``, ``get_all()`` and ``in`` search that block directly; any
+    other use splits it into lines first.
+    """
+
+    __slots__ = ('_names', '_values', '_lowered', '_version', '_raw')
+
+    def __init__(self, headers: Optional[HeadersLike] = None):
+        self._names: List[str] = []
+        self._values: List[str] = []
+        self._lowered = True
+        self._version = 0  # Bumped on every change; see GurtRequest.head_bytes
+        self._raw: Union[str, bytes, memoryview, None] = None  # Unparsed header block
+        if headers:
+            self.extend(headers)
+
+    @classmethod
+    def _empty(cls) -> 'GurtHeaders':
+        headers = cls.__new__(cls)
+        headers._names = []
+        headers._values = []
+        headers._lowered = False
+        headers._version = 0
+        headers._raw = None
+        return headers
+
+    @classmethod
+    def parse_lines(cls, lines: Iterable[str]) -> 'GurtHeaders':
+        """Parse ``name: value`` lines, skipping lines without a colon"""
+        headers = cls._empty()
+        headers._add_lines(lines)
+        return headers
+
+    @classmethod
+    def from_raw(cls, block: Union[str, bytes, memoryview]) -> 'GurtHeaders':
+        """Headers from a block of separator-delimited lines, parsed when first used
+
+        A bytes-like ``block`` is decoded as UTF-8 at that point, so a
+        memoryview into the receive buffer avoids copying it up front.
+        """
+        headers = cls._empty()
+        headers._raw = block
+        return headers
+
+    def _add_lines(self, lines: Iterable[str]) -> None:
+        add_name = self._names.append
+        add_value = self._values.append
+        for line in lines:
+            name, colon, value = line.partition(':')
+            if colon:
+                add_name(intern(name.strip()))
+                add_value(value.strip())
+
+    def _raw_text(self) -> str:
+        raw = self._raw
+        if not isinstance(raw, str):
+            raw = self._raw = str(raw, 'utf-8')
+        return raw
+
+    def _lower_names(self) -> List[str]:
+        names = self._names
+        if not self._lowered:
+            if self._raw is not None:
+                self._add_lines(self._raw_text().split(HEADER_SEPARATOR))
+                self._raw = None
+            # One check for the whole block instead of lowering each name
+            joined = "".join(names)
+            if joined.lower() != joined:
+                names[:] = [intern(name.lower()) for name in names]
+            self._lowered = True
+        return names
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        """First value of ``key``, or ``default``"""
+        if self._raw is not None:
+            values = _scan(self._raw_text(), key.lower(), True)
+            return values[0] if values else default
+        names = self._names if self._lowered else self._lower_names()
+        key = key.lower()
+        return self._values[names.index(key)] if key in names else default
+
+    def get_all(self, key: str) -> List[str]:
+        """Every value of ``key`` in the order received"""
+        key = key.lower()
+        if self._raw is not None:
+            return _scan(self._raw_text(), key, False)
+        names = self._lower_names()
+        if names.count(key) < 2:
+            return [self._values[names.index(key)]] if key in names else []
+        values = self._values
+        return [values[i] for i, name in enumerate(names) if name == key]
+
+    def __contains__(self, key) -> bool:
+        if not isinstance(key, str):
+            return False
+        if self._raw is not None:
+            return bool(_scan(self._raw_text(), key.lower(), True))
+        names = self._names if self._lowered else self._lower_names()
+        return key.lower() in names
+
+    def __setitem__(self, key: str, value: str) -> None:
+        names = self._names if self._lowered else self._lower_names()
+        key = key.lower()
+        if key in names:
+            index = names.index(key)
+            self._values[index] = value
+            if key in names[index + 1:]:
+                self._remove(key, index + 1)
+        else:
+            names.append(key)
+            self._values.append(value)
+        self._version += 1
+
+    def add(self, key: str, value: str) -> None:
+        """Append a value, keeping any existing ones"""
+        self._lower_names().append(key.lower())
+        self._values.append(value)
+        self._version += 1
+
+    def __delitem__(self, key: str) -> None:
+        key = key.lower()
+        if key not in self._lower_names():
+            raise KeyError(key)
+        self._remove(key, 0)
+        self._version += 1
+
+    def _remove(self, key: str, start: int) -> None:
+        keep = [i for i, name in enumerate(self._names) if i < start or name != key]
+        self._names[:] = [self._names[i] for i in keep]
+        self._values[:] = [self._values[i] for i in keep]
+
+    def setdefault(self, key: str, default: str) -> str:
+        """Return the value of ``key``, first setting it to ``default`` if missing"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            if default is None:
+                raise ValueError(f"Header {key!r} cannot be set to None")
+            self[key] = value = default
+        return value
+
+    def extend(self, headers: HeadersLike) -> None:
+        """Append every header from a mapping or ``(name, value)`` pairs"""
+        pairs = headers.items() if isinstance(headers, Mapping) else headers
+        names = self._lower_names()
+        values = self._values
+        for key, value in pairs:
+            names.append(key.lower())
+            values.append(value)
+        self._version += 1
+
+    def clear(self) -> None:
+        self._names.clear()
+        self._values.clear()
+        self._raw = None
+        self._lowered = True
+        self._version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._lower_names()))
+
+    def __len__(self) -> int:
+        return len(self._lower_names())
+
+    def keys(self) -> List[str]:
+        return list(self._lower_names())
+
+    def values(self) -> List[str]:
+        self._lower_names()
+        return list(self._values)
+
+    def items(self) -> List[Tuple[str, str]]:
+        return list(zip(self._lower_names(), self._values))
+
+    def copy(self) -> 'GurtHeaders':
+        headers = self.__class__.__new__(self.__class__)
+        headers._names = self._names[:]
+        headers._values = self._values[:]
+        headers._lowered = self._lowered
+        headers._version = 0
+        headers._raw = self._raw
+        return headers
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, GurtHeaders):
+            return self.items() == other.items()
+        if isinstance(other, Mapping):
+            return dict(self.items()) == {key.lower(): value for key, value in other.items()}
+        return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """The content-length header as an int, or None if absent or invalid"""
+        value = self.get('content-length')
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.get('content-type')
+
+    def to_str(self) -> str:
+        """``name: value`` lines, each ending with the header separator"""
+        names = self._lower_names()
+        if not names:
+            return ""
+        return HEADER_SEPARATOR.join(map(": ".join, zip(names, self._values))) + HEADER_SEPARATOR
+
+    def to_bytes(self) -> bytes:
+        """Serialize the header lines for the wire"""
+        return self.to_str().encode('utf-8')
+
+    def __repr__(self) -> str:
+        return f"GurtHeaders({self.items()!r})"
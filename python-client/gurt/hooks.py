@@ -0,0 +1,289 @@
+"""
+GURT request instrumentation - per-phase timing events and latency histograms
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+from .message import GurtRequest, GurtResponse
+
+logger = logging.getLogger(__name__)
+
+# Events in the order they fire for a request on a new connection. A reused
+# connection skips dns, connect, handshake and tls.
+EVENTS = (
+    "request_start",  # Attempt started
+    "dns",            # Host name resolved
+    "connect",        # TCP connection established
+    "handshake",      # Plaintext GURT HANDSHAKE answered with 101
+    "tls",            # TLS upgrade finished
+    "request_sent",   # Request head and body written
+    "first_byte",     # First response bytes received
+    "request_end",    # Response complete (headers only for stream=True) or attempt failed
+)
+
+HookCallback = Callable[['RequestTrace'], None]
+
+
+class RequestTrace:
+    """Timing and transfer details of one request attempt
+
+    Phase timestamps are ``time.monotonic()`` values, None for phases that
+    did not happen (e.g. ``connect`` on a reused connection).
+    """
+
+    def __init__(self, hooks: 'Hooks', host: str, port: int, request: GurtRequest):
+        self._hooks = hooks
+        self.host = host
+        self.port = port
+        self.method = request.method
+        self.path = request.path
+        self.request_start = time.monotonic()
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.handshake: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.connection_ready: Optional[float] = None
+        self.request_sent: Optional[float] = None
+        self.first_byte: Optional[float] = None
+        self.request_end: Optional[float] = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connection_reused = False
+        self.tls_session_reused = False
+        self.status_code: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    def mark(self, event: str) -> None:
+        """Record the current time for ``event`` and notify its callbacks"""
+        setattr(self, event, time.monotonic())
+        self._hooks.emit(event, self)
+
+    def first_bytes(self, nbytes: int) -> None:
+        """Count received bytes, marking first_byte on the first call"""
+        if self.first_byte is None:
+            self.mark("first_byte")
+        self.bytes_received += nbytes
+
+    def finish(self, response: Optional[GurtResponse] = None, error: Optional[BaseException] = None) -> None:
+        if response is not None:
+            self.status_code = int(response.status_code)
+        self.error = error
+        self.mark("request_end")
+
+    def durations(self) -> Dict[str, float]:
+        """Seconds spent in each phase that happened"""
+        phases = {}
+
+        def span(name: str, start: Optional[float], end: Optional[float]) -> None:
+            if start is not None and end is not None:
+                phases[name] = end - start
+
+        span("dns", self.request_start, self.dns)
+        span("connect", self.dns, self.connect)
+        span("handshake", self.connect, self.handshake)
+        span("tls", self.handshake, self.tls)
+        span("send", self.connection_ready, self.request_sent)
+        span("ttfb", self.request_sent, self.first_byte)
+        span("transfer", self.first_byte, self.request_end)
+        span("total", self.request_start, self.request_end)
+        return phases
+
+    def __repr__(self) -> str:
+        timings = " ".join(f"{name}={value * 1000:.2f}ms" for name, value in self.durations().items())
+        return f"RequestTrace({self.method.value} {self.host}:{self.port}{self.path} {timings})"
+
+
+class Hooks:
+    """Registry of callbacks for request events
+
+    Callbacks receive the RequestTrace. When nothing is registered the
+    client does not create traces at all.
+    """
+
+    def __init__(self):
+        self._callbacks: Dict[str, List[HookCallback]] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self._callbacks)
+
+    def add(self, event: str, callback: HookCallback) -> HookCallback:
+        """Register ``callback`` for ``event``; returns it so it can be used as a decorator"""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event {event!r}, expected one of {', '.join(EVENTS)}")
+        self._callbacks.setdefault(event, []).append(callback)
+        return callback
+
+    def remove(self, event: str, callback: HookCallback) -> None:
+        callbacks = self._callbacks.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._callbacks.pop(event, None)
+
+    def copy(self) -> 'Hooks':
+        """A registry with the same callbacks, which can be changed independently"""
+        hooks = Hooks()
+        hooks._callbacks = {event: list(callbacks) for event, callbacks in self._callbacks.items()}
+        return hooks
+
+    def start(self, host: str, port: int, request: GurtRequest) -> Optional[RequestTrace]:
+        """Begin a trace for an attempt, or return None if no callbacks are registered"""
+        if not self._callbacks:
+            return None
+        trace = RequestTrace(self, host, port, request)
+        self.emit("request_start", trace)
+        return trace
+
+    def emit(self, event: str, trace: RequestTrace) -> None:
+        for callback in self._callbacks.get(event, ()):
+            try:
+                callback(trace)
+            except Exception as e:
+                logger.debug(f"Hook for {event} failed: {e}")
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations
+
+    Buckets grow by ``growth``, so percentiles are accurate to that relative
+    error (5% by default).
+    """
+
+    MIN_VALUE = 1e-6  # 1µs
+    GROWTH = 1.05
+
+    def __init__(self, growth: float = GROWTH):
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.MIN_VALUE:
+            return 0
+        return int(math.log(value / self.MIN_VALUE) / self._log_growth) + 1
+
+    def _upper_bound(self, bucket: int) -> float:
+        return self.MIN_VALUE * self.growth ** bucket
+
+    def record(self, value: float, count: int = 1) -> None:
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+        self.total += value * count
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add the samples of a histogram with the same growth"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def corrected(self, expected_interval: float) -> 'LatencyHistogram':
+        """Copy corrected for coordinated omission, as HdrHistogram does
+
+        A closed-loop load generator sends nothing while it waits on a
+        slow response, so the requests that would have been sent during
+        the stall are missing. For each sample longer than
+        ``expected_interval`` the copy adds the samples those requests
+        would have seen: value - interval, value - 2 * interval, and so on.
+        """
+        result = LatencyHistogram(self.growth)
+        result.merge(self)
+        if expected_interval <= 0:
+            return result
+
+        for bucket, count in self.counts.items():
+            value = min(self._upper_bound(bucket), self.max)
+            missing = value - expected_interval
+            while missing >= expected_interval:
+                result.record(missing, count)
+                missing -= expected_interval
+        return result
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the ``p``-th percentile, capped at the max"""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.max, self._upper_bound(bucket))
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class LatencyCollector:
+    """Keeps per-host latency histograms for every request phase
+
+    ``collector.install(hooks)`` subscribes it to ``request_end``;
+    ``snapshot()`` returns ``{"host:port": {phase: {count, mean, p50, p90,
+    p99, max}}}`` in seconds, plus connection and TLS reuse counts.
+    """
+
+    def __init__(self):
+        self._hosts: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def install(self, hooks: Hooks) -> 'LatencyCollector':
+        hooks.add("request_end", self.record)
+        return self
+
+    def record(self, trace: RequestTrace) -> None:
+        key = f"{trace.host}:{trace.port}"
+        durations = trace.durations()
+
+        with self._lock:
+            histograms = self._hosts.setdefault(key, {})
+            for phase, value in durations.items():
+                histogram = histograms.get(phase)
+                if histogram is None:
+                    histogram = histograms[phase] = LatencyHistogram()
+                histogram.record(value)
+
+            counters = self._counters.setdefault(key, {
+                "requests": 0, "errors": 0, "connections_reused": 0, "tls_sessions_reused": 0,
+                "bytes_sent": 0, "bytes_received": 0,
+            })
+            counters["requests"] += 1
+            counters["errors"] += trace.error is not None
+            counters["connections_reused"] += trace.connection_reused
+            counters["tls_sessions_reused"] += trace.tls_session_reused
+            counters["bytes_sent"] += trace.bytes_sent
+            counters["bytes_received"] += trace.bytes_received
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            return {
+                key: dict(
+                    {phase: histogram.snapshot() for phase, histogram in histograms.items()},
+                    counters=dict(self._counters[key])
+                )
+                for key, histograms in self._hosts.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+            self._counters.clear()
@@ -0,0 +1,277 @@
+"""
+GURT load generator - closed- and open-loop request load with latency histograms
+"""
+
+import copy
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+
+from .client import GurtClient, GurtClientConfig
+from .hooks import Hooks, LatencyHistogram, RequestTrace
+from .message import GurtMethod
+from .prepared import PreparedRequest
+
+# 1% bucket precision, like an HdrHistogram with two significant digits
+HISTOGRAM_GROWTH = 1.01
+REPORT_PERCENTILES = (50, 75, 90, 99, 99.9, 99.99, 100)
+
+
+class LoadResult:
+    """Outcome of a load run
+
+    ``latency`` is measured from when each request should have been sent:
+    the scheduled time in open-loop mode, or the send time corrected for
+    coordinated omission in closed-loop mode. ``service_time`` is the
+    uncorrected time from sending to the complete response.
+    """
+
+    def __init__(self, url: str, method: str, concurrency: int, rate: Optional[float]):
+        self.url = url
+        self.method = method
+        self.concurrency = concurrency
+        self.rate = rate
+        self.elapsed = 0.0
+        self.requests = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram(HISTOGRAM_GROWTH)
+        self.service_time = LatencyHistogram(HISTOGRAM_GROWTH)
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.connections = 0
+        self.handshakes = 0
+        self.tls_resumed = 0
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second"""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        def histogram(h: LatencyHistogram) -> Dict[str, float]:
+            data = {f"p{p:g}": h.percentile(p) for p in REPORT_PERCENTILES}
+            data["mean"] = h.total / h.count if h.count else 0.0
+            return data
+
+        return {
+            "url": self.url,
+            "method": self.method,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "elapsed": self.elapsed,
+            "requests": self.requests,
+            "throughput": self.throughput,
+            "bytes_received": self.bytes_received,
+            "latency": histogram(self.latency),
+            "service_time": histogram(self.service_time),
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "connections": self.connections,
+            "handshakes": self.handshakes,
+            "tls_resumed": self.tls_resumed,
+        }
+
+
+class _Worker:
+    """Per-thread tallies, merged once the run is over"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram(HISTOGRAM_GROWTH)
+        self.service_time = LatencyHistogram(HISTOGRAM_GROWTH)
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.bytes_received = 0
+
+
+class LoadGenerator:
+    """Sends requests to one URL from ``concurrency`` threads sharing a connection pool
+
+    Without ``rate`` the load is closed-loop: each thread sends its next
+    request as soon as the previous one completes. With ``rate`` requests
+    are scheduled at fixed intervals (open loop) and latency counts from
+    the scheduled time, so a stalled server is charged for the requests
+    that queued up behind it. The run stops after ``duration`` seconds or
+    ``requests`` requests, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        method: Union[GurtMethod, str] = GurtMethod.GET,
+        body: Union[str, bytes] = b"",
+        content_type: str = "text/plain",
+        concurrency: int = 10,
+        duration: Optional[float] = None,
+        requests: Optional[int] = None,
+        rate: Optional[float] = None,
+        config: Optional[GurtClientConfig] = None
+    ):
+        if duration is None and requests is None:
+            raise ValueError("Either duration or requests must be given")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.url = url
+        self.method = GurtMethod(method) if isinstance(method, str) else method
+        self.body = body
+        self.content_type = content_type
+        self.concurrency = concurrency
+        self.duration = duration
+        self.requests = requests
+        self.rate = rate
+        self.config = config or GurtClientConfig()
+
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._connections = 0
+        self._handshakes = 0
+        self._tls_resumed = 0
+
+    def _on_connect(self, trace: RequestTrace) -> None:
+        with self._lock:
+            self._connections += 1
+
+    def _on_tls(self, trace: RequestTrace) -> None:
+        with self._lock:
+            self._handshakes += 1
+            self._tls_resumed += trace.tls_session_reused
+
+    def _next(self) -> Optional[int]:
+        """Claim the index of the next request, or None once the request budget is spent"""
+        with self._lock:
+            if self.requests is not None and self._issued >= self.requests:
+                return None
+            self._issued += 1
+            return self._issued - 1
+
+    def _has_body(self) -> bool:
+        return self.method in (GurtMethod.POST, GurtMethod.PUT, GurtMethod.PATCH)
+
+    def _send(self, prepared: PreparedRequest):
+        return prepared.send(self.body if self._has_body() else None)
+
+    def _run_worker(self, client: GurtClient, worker: _Worker, start: float, deadline: float) -> None:
+        # The URL is parsed and the header block serialized once per worker
+        prepared = client.prepare(self.method, self.url, content_type=self.content_type if self._has_body() else None)
+        clock = time.perf_counter
+        interval = 1 / self.rate if self.rate else 0.0
+
+        while True:
+            index = self._next()
+            if index is None:
+                return
+
+            if interval:
+                scheduled = start + index * interval
+                if scheduled >= deadline:
+                    return
+                delay = scheduled - clock()
+                if delay > 0:
+                    time.sleep(delay)
+            elif clock() >= deadline:
+                return
+
+            sent = clock()
+            try:
+                response = self._send(prepared)
+                worker.statuses[int(response.status_code)] += 1
+                worker.bytes_received += len(response.body)
+            except Exception as e:
+                worker.errors[type(e).__name__] += 1
+            done = clock()
+
+            worker.service_time.record(done - sent)
+            if interval:
+                worker.latency.record(done - scheduled)
+
+    def run(self) -> LoadResult:
+        """Run the load and return the merged results"""
+        # The caller's config and hooks are left as they were
+        config = copy.copy(self.config)
+        hooks = config.hooks.copy() if config.hooks else Hooks()
+        hooks.add("connect", self._on_connect)
+        hooks.add("tls", self._on_tls)
+        config.hooks = hooks
+        config.max_connections_per_host = max(config.max_connections_per_host, self.concurrency)
+
+        client = GurtClient(config)
+        workers = [_Worker() for _ in range(self.concurrency)]
+        start = time.perf_counter()
+        deadline = start + self.duration if self.duration is not None else float("inf")
+
+        threads = [
+            threading.Thread(target=self._run_worker, args=(client, worker, start, deadline), daemon=True)
+            for worker in workers
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            elapsed = time.perf_counter() - start
+            client.close()
+
+        result = LoadResult(self.url, self.method.value, self.concurrency, self.rate)
+        result.elapsed = elapsed
+        for worker in workers:
+            result.service_time.merge(worker.service_time)
+            result.latency.merge(worker.latency)
+            result.statuses.update(worker.statuses)
+            result.errors.update(worker.errors)
+            result.bytes_received += worker.bytes_received
+        result.requests = result.service_time.count
+        result.connections = self._connections
+        result.handshakes = self._handshakes
+        result.tls_resumed = self._tls_resumed
+
+        if not self.rate:
+            # Each connection is expected to send a request every median service time
+            result.latency = result.service_time.corrected(result.service_time.percentile(50))
+
+        return result
+
+
+def format_report(result: LoadResult) -> List[str]:
+    """Human-readable summary lines in the style of wrk"""
+    def ms(seconds: float) -> str:
+        if seconds < 1:
+            return f"{seconds * 1000:.2f}ms"
+        return f"{seconds:.2f}s"
+
+    mode = f"open loop at {result.rate:g} req/s" if result.rate else "closed loop"
+    lines = [
+        f"{result.method} {result.url}",
+        f"  {result.concurrency} concurrent requests, {mode}, {result.elapsed:.2f}s",
+        "",
+        f"Requests:     {result.requests} ({result.throughput:.1f} req/s), {result.error_count} errors",
+        f"Received:     {result.bytes_received / 1e6:.2f} MB body ({result.bytes_received / 1e6 / result.elapsed if result.elapsed else 0:.2f} MB/s)",
+        f"Connections:  {result.connections} opened, {result.handshakes} TLS handshakes "
+        f"({result.tls_resumed} resumed), {max(result.requests - result.connections, 0)} requests on reused connections",
+        "",
+        "Latency (corrected for coordinated omission):",
+        f"  {'mean':>8}  {ms(result.latency.total / result.latency.count) if result.latency.count else '-'}",
+    ]
+    for p in REPORT_PERCENTILES:
+        lines.append(f"  {p:>7g}%  {ms(result.latency.percentile(p))}")
+
+    service = result.service_time
+    lines += [
+        "",
+        "Service time (uncorrected):",
+        f"  p50 {ms(service.percentile(50))}  p90 {ms(service.percentile(90))}  "
+        f"p99 {ms(service.percentile(99))}  max {ms(service.max)}",
+        "",
+        "Status codes: " + (", ".join(f"{code}: {count}" for code, count in sorted(result.statuses.items())) or "none"),
+    ]
+    if result.errors:
+        lines.append("Errors:")
+        for name, count in result.errors.most_common():
+            lines.append(f"  {name}: {count}")
+
+    return lines
@@ -3,15 +3,55 @@ GURT Message types - Request and Response parsing and building
 """
 
 from enum import Enum
-from typing import Dict, Optional, Union
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timezone
-import json
+import io
+import os
 
 from .protocol import (
     GURT_VERSION, PROTOCOL_PREFIX, HEADER_SEPARATOR, BODY_SEPARATOR,
+    MAX_MESSAGE_SIZE, MAX_HEADER_SIZE, MAX_HEADER_COUNT, DEFAULT_READ_CHUNK_SIZE,
     GurtStatusCode, STATUS_MESSAGES
 )
 from .errors import GurtProtocolError
+from .headers import GurtHeaders, HeadersLike
+from .codec import JSONCodec, get_default_codec, iter_json_items
+
+BODY_SEPARATOR_BYTES = BODY_SEPARATOR.encode('utf-8')
+HEADER_SEPARATOR_BYTES = HEADER_SEPARATOR.encode('utf-8')
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+_NOT_DECODED = object()
+BodyStream = Union[BinaryIO, Iterable[bytes]]
+
+
+def _stream_length(stream) -> Optional[int]:
+    """Remaining size of a regular file object, or None if it cannot be known"""
+    try:
+        size = os.fstat(stream.fileno()).st_size
+        return size - stream.tell()
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
+def _split_message(data: Union[bytes, bytearray]) -> Tuple[str, Optional[GurtHeaders], int]:
+    """Find the start line, header block and body offset of a complete message
+    
+    The header block is handed over undecoded as a memoryview into ``data``.
+    """
+    head_end = data.find(BODY_SEPARATOR_BYTES)
+    if head_end == -1:
+        head_end = body_start = len(data)
+    else:
+        body_start = head_end + len(BODY_SEPARATOR_BYTES)
+    
+    line_end = data.find(HEADER_SEPARATOR_BYTES, 0, head_end)
+    if line_end == -1:
+        return str(data[:head_end], 'utf-8'), None, body_start
+    
+    block = memoryview(data)[line_end + len(HEADER_SEPARATOR_BYTES):head_end]
+    return str(data[:line_end], 'utf-8'), GurtHeaders.from_raw(block), body_start
 
 
 class GurtMethod(Enum):
@@ -33,77 +73,170 @@ class GurtRequest:
         self.method = method
         self.path = path
         self.version = version
-        self.headers: Dict[str, str] = {}
-        self.body: bytes = b""
+        self.headers = GurtHeaders()
+        self.body: BufferLike = b""
+        self.body_stream: Optional[BodyStream] = None  # File or iterator sent in chunks
+        self.body_length = 0
+        self._body_start: Optional[int] = None
+        # Pre-serialized request line and headers, valid while _head_headers is unchanged
+        self._head_prefix: Optional[bytes] = None
+        self._head_headers: Optional[GurtHeaders] = None
+        self._head_version = 0
     
     def with_header(self, key: str, value: str) -> 'GurtRequest':
-        """Add a header to the request"""
-        self.headers[key.lower()] = value
+        """Set a header on the request, replacing any earlier value"""
+        self.headers[key] = value
         return self
     
-    def with_body(self, body: Union[str, bytes]) -> 'GurtRequest':
-        """Set the request body"""
+    def with_body(self, body: Union[str, BufferLike, BodyStream],
+                  content_length: Optional[int] = None) -> 'GurtRequest':
+        """Set the request body
+        
+        ``str``, ``bytes``, ``bytearray`` and ``memoryview`` bodies are kept
+        as-is. Binary file objects and iterators of bytes are streamed when the
+        request is sent; their length must be known up front, either through
+        ``content_length`` or, for regular files, from the file size.
+        """
+        self.body_stream = None
+        self._body_start = None
+        
         if isinstance(body, str):
             self.body = body.encode('utf-8')
-        else:
+        elif isinstance(body, (bytes, bytearray, memoryview)):
             self.body = body
+        else:
+            if content_length is None:
+                content_length = _stream_length(body)
+            if content_length is None:
+                raise GurtProtocolError("Streamed request bodies need a known content_length")
+            
+            self.body = b""
+            self.body_stream = body
+            self.body_length = content_length
+            if hasattr(body, 'seekable') and body.seekable():
+                self._body_start = body.tell()
+        
         return self
     
+    def body_size(self) -> int:
+        """Number of body bytes that will be sent"""
+        if self.body_stream is not None:
+            return self.body_length
+        return memoryview(self.body).nbytes
+    
+    def rewind_body(self) -> bool:
+        """Prepare the body to be sent again; False if it cannot be replayed"""
+        if self.body_stream is None:
+            return True
+        if self._body_start is None:
+            return False
+        self.body_stream.seek(self._body_start)
+        return True
+    
+    def iter_body(self, chunk_size: int = DEFAULT_READ_CHUNK_SIZE) -> Iterator[BufferLike]:
+        """Yield the body for sending without building one large buffer
+        
+        File bodies are read into a single reusable buffer, so each chunk must
+        be sent before the next one is requested.
+        """
+        if self.body_stream is None:
+            if self.body_size():
+                yield self.body
+            return
+        
+        remaining = self.body_length
+        stream = self.body_stream
+        
+        if hasattr(stream, 'readinto'):
+            buffer = bytearray(min(chunk_size, remaining) or 1)
+            view = memoryview(buffer)
+            while remaining:
+                nbytes = stream.readinto(view[:min(len(buffer), remaining)])
+                if not nbytes:
+                    break
+                remaining -= nbytes
+                yield view[:nbytes]
+        elif hasattr(stream, 'read'):
+            while remaining:
+                chunk = stream.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            for chunk in stream:
+                size = memoryview(chunk).nbytes
+                if size > remaining:
+                    raise GurtProtocolError("Request body longer than content-length")
+                remaining -= size
+                yield chunk
+        
+        if remaining:
+            raise GurtProtocolError("Request body shorter than content-length")
+    
     def get_header(self, key: str) -> Optional[str]:
         """Get a header value (case-insensitive)"""
-        return self.headers.get(key.lower())
+        return self.headers.get(key)
     
     def text(self) -> str:
         """Get the body as text"""
-        return self.body.decode('utf-8')
+        return str(self.body, 'utf-8')
     
-    def to_bytes(self) -> bytes:
-        """Convert request to bytes for transmission"""
-        # Status line
-        message = f"{self.method.value} {self.path} {PROTOCOL_PREFIX}{self.version}{HEADER_SEPARATOR}"
+    def with_json_body(self, data, codec: Optional[JSONCodec] = None) -> 'GurtRequest':
+        """Set the request body as JSON"""
+        self.with_body((codec or get_default_codec()).dumps(data))
+        self.headers['content-type'] = 'application/json'
+        return self
+    
+    def head_bytes(self) -> bytes:
+        """Serialize the request line and headers, without the body"""
+        headers = self.headers
         
-        # Add default headers
-        headers = self.headers.copy()
-        if 'content-length' not in headers:
-            headers['content-length'] = str(len(self.body))
-        if 'user-agent' not in headers:
-            headers['user-agent'] = f"GURT-Python-Client/{GURT_VERSION}"
+        # Prepared requests only append the content-length
+        if (self._head_prefix is not None and headers is self._head_headers
+                and headers._version == self._head_version):
+            return self._head_prefix + b"content-length: %d\r\n\r\n" % self.body_size()
         
-        # Add headers
-        for key, value in headers.items():
-            message += f"{key}: {value}{HEADER_SEPARATOR}"
+        # Request line and headers
+        parts = [f"{self.method.value} {self.path} {PROTOCOL_PREFIX}{self.version}{HEADER_SEPARATOR}", headers.to_str()]
+        
+        # Add default headers
+        names = headers._lower_names()
+        if 'content-length' not in names:
+            parts.append(f"content-length: {self.body_size()}{HEADER_SEPARATOR}")
+        if 'user-agent' not in names:
+            parts.append(f"user-agent: GURT-Python-Client/{GURT_VERSION}{HEADER_SEPARATOR}")
         
         # End headers
-        message += HEADER_SEPARATOR
+        parts.append(HEADER_SEPARATOR)
         
-        # Convert to bytes and add body
-        message_bytes = message.encode('utf-8')
-        message_bytes += self.body
+        return "".join(parts).encode('utf-8')
+    
+    def to_bytes(self) -> bytes:
+        """Convert request to bytes for transmission"""
+        if self.body_stream is not None:
+            raise GurtProtocolError("Streamed bodies are sent with head_bytes() and iter_body()")
         
-        return message_bytes
+        return self.head_bytes() + self.body
     
     @classmethod
     def parse(cls, data: Union[str, bytes]) -> 'GurtRequest':
-        """Parse a GURT request from raw data"""
+        """Parse a GURT request from raw data; headers are parsed when first used"""
         if isinstance(data, str):
             data = data.encode('utf-8')
         
-        # Find body separator
-        body_sep = BODY_SEPARATOR.encode('utf-8')
-        if body_sep in data:
-            headers_part, body_part = data.split(body_sep, 1)
-        else:
-            headers_part, body_part = data, b""
-        
-        # Parse headers section
-        headers_str = headers_part.decode('utf-8')
-        lines = headers_str.split(HEADER_SEPARATOR)
+        request_line, headers, body_start = _split_message(data)
+        request = cls.from_head(request_line, headers)
+        request.body = data[body_start:]
         
-        if not lines:
-            raise GurtProtocolError("Empty request")
+        return request
+    
+    @classmethod
+    def from_head(cls, request_line: str, headers: Optional[HeadersLike] = None) -> 'GurtRequest':
+        """Create a request from its request line and already-parsed headers
         
-        # Parse request line
-        request_line = lines[0]
+        A GurtHeaders instance is used as-is rather than copied.
+        """
         parts = request_line.split()
         
         if len(parts) != 3:
@@ -123,18 +256,11 @@ class GurtRequest:
         
         version = parts[2][len(PROTOCOL_PREFIX):]
         
-        # Create request
         request = cls(method, path, version)
-        request.body = body_part
-        
-        # Parse headers
-        for line in lines[1:]:
-            if not line.strip():
-                break
-            
-            if ':' in line:
-                key, value = line.split(':', 1)
-                request.headers[key.strip().lower()] = value.strip()
+        if isinstance(headers, GurtHeaders):
+            request.headers = headers
+        elif headers:
+            request.headers.extend(headers)
         
         return request
 
@@ -142,12 +268,60 @@ class GurtRequest:
 class GurtResponse:
     """GURT protocol response"""
     
+    __slots__ = (
+        'version', 'status_code', 'status_message', 'headers', 'raw',
+        'codec', 'decoded_encoding', '_body', '_buffer', '_body_start', '_decoder',
+        '_content', '_text', '_json'
+    )
+    
     def __init__(self, status_code: GurtStatusCode, version: str = GURT_VERSION):
         self.version = version
         self.status_code = status_code
         self.status_message = status_code.message()
-        self.headers: Dict[str, str] = {}
-        self.body: bytes = b""
+        self.headers = GurtHeaders()
+        self.raw: Optional[io.RawIOBase] = None  # Unread body of a streamed response
+        self.codec: Optional[JSONCodec] = None  # For json(); None uses the default codec
+        self._body: BufferLike = b""
+        self._buffer: Optional[BufferLike] = None  # Parsed message the body is sliced from on first use
+        self._body_start = 0
+        self._decoder: Optional[Callable[[BufferLike], bytes]] = None  # Undoes content-encoding on first use
+        # The content-encoding the body is (or will be) decoded from; headers still describe the encoded body
+        self.decoded_encoding: Optional[str] = None
+        self._content: Optional[bytes] = None
+        self._text: Optional[str] = None
+        self._json = _NOT_DECODED
+    
+    @property
+    def body(self) -> BufferLike:
+        """The body: bytes, a bytearray filled from the network, or a memoryview into parsed data
+        
+        A body received with a content-encoding is decompressed here, once.
+        """
+        if self._buffer is not None:
+            self._body = memoryview(self._buffer)[self._body_start:]
+            self._buffer = None
+        if self._decoder is not None:
+            decode, self._decoder = self._decoder, None
+            self._body = decode(self._body)
+        return self._body
+    
+    @body.setter
+    def body(self, body: BufferLike) -> None:
+        self._body = body
+        self._buffer = None
+        self._decoder = None
+        self.decoded_encoding = None
+        self._content = None
+        self._text = None
+        self._json = _NOT_DECODED
+    
+    @property
+    def content(self) -> bytes:
+        """The body as bytes, copied once if it is held in a buffer or memoryview"""
+        if self._content is None:
+            body = self.read()
+            self._content = body if type(body) is bytes else bytes(body)
+        return self._content
     
     @classmethod
     def ok(cls) -> 'GurtResponse':
@@ -170,8 +344,8 @@ class GurtResponse:
         return cls(GurtStatusCode.INTERNAL_SERVER_ERROR)
     
     def with_header(self, key: str, value: str) -> 'GurtResponse':
-        """Add a header to the response"""
-        self.headers[key.lower()] = value
+        """Set a header on the response, replacing any earlier value"""
+        self.headers[key] = value
         return self
     
     def with_body(self, body: Union[str, bytes]) -> 'GurtResponse':
@@ -182,24 +356,80 @@ class GurtResponse:
             self.body = body
         return self
     
-    def with_json_body(self, data) -> 'GurtResponse':
+    def with_json_body(self, data, codec: Optional[JSONCodec] = None) -> 'GurtResponse':
         """Set the response body as JSON"""
-        json_str = json.dumps(data)
-        self.body = json_str.encode('utf-8')
+        self.body = (codec or get_default_codec()).dumps(data)
         self.headers['content-type'] = 'application/json'
         return self
     
     def get_header(self, key: str) -> Optional[str]:
         """Get a header value (case-insensitive)"""
-        return self.headers.get(key.lower())
+        return self.headers.get(key)
+    
+    def read(self) -> bytes:
+        """Read the rest of a streamed body into ``body`` and return it"""
+        if self.raw is not None:
+            self.body = self.raw.read()
+            self.raw.close()
+            self.raw = None
+        return self.body
+    
+    def iter_content(self, chunk_size: int = DEFAULT_READ_CHUNK_SIZE) -> Iterator[bytes]:
+        """Iterate over the body in chunks, reading a streamed body as it arrives"""
+        if self.raw is None:
+            body = memoryview(self.body)
+            for offset in range(0, len(body), chunk_size):
+                yield bytes(body[offset:offset + chunk_size])
+            return
+        
+        try:
+            while True:
+                chunk = self.raw.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        """Release the connection of a streamed response, discarding any unread body"""
+        if self.raw is not None:
+            self.raw.close()
+            self.raw = None
+    
+    def __enter__(self) -> 'GurtResponse':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
     
     def text(self) -> str:
-        """Get the body as text"""
-        return self.body.decode('utf-8')
+        """Get the body as text (decoded once)"""
+        if self._text is None:
+            # str() also decodes memoryview bodies without copying them first
+            self._text = str(self.read(), 'utf-8')
+        return self._text
     
     def json(self):
-        """Parse the body as JSON"""
-        return json.loads(self.body.decode('utf-8'))
+        """Parse the body as JSON (decoded once; the same object is returned each time)"""
+        if self._json is _NOT_DECODED:
+            # Codecs decode the body buffer directly, without an intermediate str
+            self._json = (self.codec or get_default_codec()).loads(self.read())
+        return self._json
+    
+    def iter_json(self, path: Union[str, Tuple[str, ...]] = (),
+                  chunk_size: int = DEFAULT_READ_CHUNK_SIZE) -> Iterator:
+        """Decode the items of a JSON array body one at a time
+        
+        For a streamed response items are yielded as the body arrives, so
+        the whole document is never held in memory, and the response is
+        closed once the array ends. See iter_json_items for ``path``.
+        """
+        chunks = self.iter_content(chunk_size) if self.raw is not None else (self.body,)
+        try:
+            yield from iter_json_items(chunks, path)
+        finally:
+            self.close()
     
     def is_success(self) -> bool:
         """Check if this is a success response"""
@@ -213,55 +443,58 @@ class GurtResponse:
         """Check if this is a server error response"""
         return self.status_code.is_server_error()
     
-    def to_bytes(self) -> bytes:
-        """Convert response to bytes for transmission"""
-        # Status line
-        message = f"{PROTOCOL_PREFIX}{self.version} {self.status_code.value} {self.status_message}{HEADER_SEPARATOR}"
+    def head_bytes(self) -> bytes:
+        """Serialize the status line and headers, without the body"""
+        # Status line and headers
+        headers = self.headers
+        parts = [
+            f"{PROTOCOL_PREFIX}{self.version} {self.status_code.value} {self.status_message}{HEADER_SEPARATOR}",
+            headers.to_str()
+        ]
         
         # Add default headers
-        headers = self.headers.copy()
-        if 'content-length' not in headers:
-            headers['content-length'] = str(len(self.body))
-        if 'server' not in headers:
-            headers['server'] = f"GURT/{GURT_VERSION}"
-        if 'date' not in headers:
-            headers['date'] = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT')
-        
-        # Add headers
-        for key, value in headers.items():
-            message += f"{key}: {value}{HEADER_SEPARATOR}"
+        names = headers._lower_names()
+        if 'content-length' not in names:
+            parts.append(f"content-length: {len(self.body)}{HEADER_SEPARATOR}")
+        if 'server' not in names:
+            parts.append(f"server: GURT/{GURT_VERSION}{HEADER_SEPARATOR}")
+        if 'date' not in names:
+            parts.append(f"date: {datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT')}{HEADER_SEPARATOR}")
         
         # End headers
-        message += HEADER_SEPARATOR
+        parts.append(HEADER_SEPARATOR)
         
-        # Convert to bytes and add body
-        message_bytes = message.encode('utf-8')
-        message_bytes += self.body
-        
-        return message_bytes
+        return "".join(parts).encode('utf-8')
+    
+    def to_bytes(self) -> bytes:
+        """Convert response to bytes for transmission"""
+        return self.head_bytes() + self.body
     
     @classmethod
-    def parse(cls, data: Union[str, bytes]) -> 'GurtResponse':
-        """Parse a GURT response from raw data"""
+    def parse(cls, data: Union[str, bytes, bytearray]) -> 'GurtResponse':
+        """Parse a GURT response from raw data without copying it
+        
+        Only the status line is decoded up front. The headers are parsed
+        on first use and ``body`` is a memoryview into ``data``, so a
+        bytearray passed in must not be modified afterwards.
+        """
         if isinstance(data, str):
             data = data.encode('utf-8')
         
-        # Find body separator
-        body_sep = BODY_SEPARATOR.encode('utf-8')
-        if body_sep in data:
-            headers_part, body_part = data.split(body_sep, 1)
-        else:
-            headers_part, body_part = data, b""
-        
-        # Parse headers section
-        headers_str = headers_part.decode('utf-8')
-        lines = headers_str.split(HEADER_SEPARATOR)
+        status_line, headers, body_start = _split_message(data)
+        response = cls.from_head(status_line, headers)
+        if body_start < len(data):
+            response._buffer = data
+            response._body_start = body_start
         
-        if not lines:
-            raise GurtProtocolError("Empty response")
+        return response
+    
+    @classmethod
+    def from_head(cls, status_line: str, headers: Optional[HeadersLike] = None) -> 'GurtResponse':
+        """Create a response from its status line and already-parsed headers
         
-        # Parse status line
-        status_line = lines[0]
+        A GurtHeaders instance is used as-is rather than copied.
+        """
         parts = status_line.split(' ', 2)
         
         if len(parts) < 2:
@@ -279,21 +512,191 @@ class GurtResponse:
         except (ValueError, KeyError):
             raise GurtProtocolError(f"Invalid status code: {parts[1]}")
         
-        # Create response
         response = cls(status_code, version)
-        response.body = body_part
         
         # Override status message if provided
         if len(parts) > 2:
             response.status_message = parts[2]
         
-        # Parse headers
-        for line in lines[1:]:
-            if not line.strip():
-                break
+        if isinstance(headers, GurtHeaders):
+            response.headers = headers
+        elif headers:
+            response.headers.extend(headers)
+        
+        return response
+
+
+class ParserEvent:
+    """Base class for events produced by GurtParser"""
+    pass
+
+
+class StartLine(ParserEvent):
+    """The request or status line of a message"""
+    
+    def __init__(self, line: str):
+        self.line = line
+
+
+class Headers(ParserEvent):
+    """The complete header block of a message"""
+    
+    def __init__(self, headers: GurtHeaders):
+        self.headers = headers
+
+
+class BodyChunk(ParserEvent):
+    """A piece of the message body as it arrived"""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class MessageComplete(ParserEvent):
+    """The message has been fully received"""
+    pass
+
+
+class GurtParser:
+    """Incremental (sans-IO) parser for a single GURT message
+    
+    Bytes are passed to ``feed()`` as they arrive and parsed into events.
+    The header terminator is searched for only in newly received bytes and
+    body bytes are passed through without buffering, so parsing is linear
+    in the message size. Size limits are enforced as data arrives.
+    """
+    
+    HEAD = "head"
+    BODY = "body"
+    DONE = "done"
+    
+    def __init__(
+        self,
+        expect_body: bool = True,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        max_header_size: int = MAX_HEADER_SIZE,
+        max_header_count: int = MAX_HEADER_COUNT
+    ):
+        self.expect_body = expect_body
+        self.max_message_size = max_message_size
+        self.max_header_size = max_header_size
+        self.max_header_count = max_header_count
+        
+        self.state = self.HEAD
+        self.start_line: Optional[str] = None
+        self.headers = GurtHeaders()
+        self.content_length = 0
+        self.trailing = b""  # Bytes received after the end of the message
+        
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self._remaining = 0
+    
+    @property
+    def is_complete(self) -> bool:
+        return self.state == self.DONE
+    
+    @property
+    def body_remaining(self) -> int:
+        """Body bytes still expected"""
+        return self._remaining
+    
+    def advance_body(self, nbytes: int) -> List[ParserEvent]:
+        """Account for body bytes the caller read directly instead of feeding them
+        
+        This lets a receiver place the body straight into its own buffer
+        (e.g. with ``recv_into``) while the parser keeps track of framing.
+        """
+        if self.state != self.BODY or nbytes > self._remaining:
+            raise GurtProtocolError("Body bytes received beyond content-length")
+        
+        self._remaining -= nbytes
+        if self._remaining:
+            return []
+        
+        self.state = self.DONE
+        return [MessageComplete()]
+    
+    def feed(self, data: bytes) -> List[ParserEvent]:
+        """Consume received bytes and return the events they complete"""
+        if self.state == self.DONE:
+            self.trailing += data
+            return []
+        
+        if self.state == self.HEAD:
+            return self._feed_head(data)
+        
+        return self._feed_body(data)
+    
+    def _feed_head(self, data: bytes) -> List[ParserEvent]:
+        buffer = self._buffer
+        buffer += data
+        
+        # Only look at new bytes, plus a separator-length overlap
+        separator = BODY_SEPARATOR_BYTES
+        header_end = buffer.find(separator, max(self._scan_from - len(separator) + 1, 0))
+        
+        if header_end == -1:
+            self._scan_from = len(buffer)
+            if len(buffer) > self.max_header_size:
+                raise GurtProtocolError("Message headers too large")
+            return []
+        
+        if header_end > self.max_header_size:
+            raise GurtProtocolError("Message headers too large")
+        
+        head = buffer[:header_end].decode('utf-8')
+        body_start = header_end + len(separator)
+        rest = bytes(buffer[body_start:])
+        self._buffer = bytearray()
+        
+        events = self._parse_head(head, body_start)
+        
+        if self.content_length:
+            self.state = self.BODY
+            self._remaining = self.content_length
+            if rest:
+                events.extend(self._feed_body(rest))
+        else:
+            self.state = self.DONE
+            self.trailing = rest
+            events.append(MessageComplete())
+        
+        return events
+    
+    def _parse_head(self, head: str, head_size: int) -> List[ParserEvent]:
+        if head.count(HEADER_SEPARATOR) > self.max_header_count:
+            raise GurtProtocolError("Too many headers")
+        
+        # Headers are parsed when first used; content-length is found without that
+        self.start_line, _, block = head.partition(HEADER_SEPARATOR)
+        headers = self.headers = GurtHeaders.from_raw(block)
+        
+        lengths = headers.get_all('content-length') if self.expect_body else None
+        if lengths:
+            if len(set(lengths)) > 1:
+                raise GurtProtocolError(f"Conflicting content-length headers: {', '.join(lengths)}")
+            try:
+                self.content_length = int(lengths[0])
+            except ValueError:
+                raise GurtProtocolError(f"Invalid content-length: {lengths[0]}")
+            
+            if self.content_length < 0:
+                raise GurtProtocolError(f"Invalid content-length: {self.content_length}")
             
-            if ':' in line:
-                key, value = line.split(':', 1)
-                response.headers[key.strip().lower()] = value.strip()
+            if head_size + self.content_length > self.max_message_size:
+                raise GurtProtocolError("Message too large")
+        
+        return [StartLine(self.start_line), Headers(headers)]
+    
+    def _feed_body(self, data: bytes) -> List[ParserEvent]:
+        if len(data) < self._remaining:
+            self._remaining -= len(data)
+            return [BodyChunk(data)]
+        
+        chunk = data if len(data) == self._remaining else data[:self._remaining]
+        self.trailing = bytes(data[self._remaining:])  # data may be a view of a reused read buffer
+        self._remaining = 0
+        self.state = self.DONE
         
-        return response
\ No newline at end of file
+        return [BodyChunk(chunk), MessageComplete()]
@@ -0,0 +1,223 @@
+"""
+GURT connection pool - reuses upgraded TLS connections across requests
+"""
+
+import select
+import socket
+import ssl
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import logging
+
+from .protocol import MAX_POOL_SIZE, POOL_IDLE_TIMEOUT
+
+if TYPE_CHECKING:
+    import asyncio  # Only the async client needs it; importing it costs sync users ~25ms
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection:
+    """An idle TLS connection held by the pool"""
+
+    def __init__(self, sock: ssl.SSLSocket):
+        self.sock = sock
+        self.last_used = time.monotonic()
+
+    def idle_time(self) -> float:
+        """Seconds since the connection was returned to the pool"""
+        return time.monotonic() - self.last_used
+
+
+class ConnectionPool:
+    """Thread-safe pool of upgraded TLS connections keyed by (host, port)"""
+
+    def __init__(
+        self,
+        max_connections_per_host: int = MAX_POOL_SIZE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self._connections: Dict[Tuple[str, int], List[PooledConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str, port: int) -> Optional[ssl.SSLSocket]:
+        """Take a live idle connection for (host, port), or None if there is none"""
+        key = (host, port)
+
+        while True:
+            with self._lock:
+                connections = self._connections.get(key)
+                if not connections:
+                    return None
+                # Most recently used first, it is the least likely to have been dropped
+                pooled = connections.pop()
+
+            if pooled.idle_time() < self.idle_timeout and self._is_alive(pooled.sock):
+                logger.debug(f"Reusing pooled connection for {host}:{port}")
+                return pooled.sock
+
+            logger.debug(f"Discarding stale pooled connection for {host}:{port}")
+            self._close_socket(pooled.sock)
+
+    def release(self, host: str, port: int, sock: ssl.SSLSocket) -> None:
+        """Return a connection to the pool, closing it if the pool is full"""
+        key = (host, port)
+
+        with self._lock:
+            connections = self._connections.setdefault(key, [])
+            self._evict_expired(connections)
+
+            if len(connections) < self.max_connections_per_host:
+                connections.append(PooledConnection(sock))
+                return
+
+        self._close_socket(sock)
+
+    def idle_count(self, host: str, port: int) -> int:
+        """Number of idle connections currently pooled for (host, port)"""
+        with self._lock:
+            return len(self._connections.get((host, port), []))
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        with self._lock:
+            connections = [pooled for conns in self._connections.values() for pooled in conns]
+            self._connections.clear()
+
+        for pooled in connections:
+            self._close_socket(pooled.sock)
+
+    def _evict_expired(self, connections: List[PooledConnection]) -> None:
+        """Drop connections past the idle timeout (caller holds the lock)"""
+        expired = [pooled for pooled in connections if pooled.idle_time() >= self.idle_timeout]
+        if expired:
+            connections[:] = [pooled for pooled in connections if pooled.idle_time() < self.idle_timeout]
+            for pooled in expired:
+                self._close_socket(pooled.sock)
+
+    @staticmethod
+    def _is_alive(sock: socket.socket) -> bool:
+        """Check that an idle connection has not been closed by the peer"""
+        if sock.fileno() == -1:
+            return False
+
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            # Application data arrived while idle - the stream is out of sync
+            return False
+
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+
+        if not readable:
+            return True
+
+        # Readable while idle means EOF, unsolicited data, or TLS-only records
+        # such as session tickets. Only the last one leaves the connection usable.
+        timeout = sock.gettimeout()
+        try:
+            sock.setblocking(False)
+            sock.recv(1)
+            return False
+        except (ssl.SSLWantReadError, ssl.SSLWantWriteError, BlockingIOError):
+            return True
+        except (OSError, ssl.SSLError):
+            return False
+        finally:
+            try:
+                sock.settimeout(timeout)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _close_socket(sock: socket.socket) -> None:
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+
+class AsyncPooledConnection:
+    """An idle asyncio stream pair held by the async pool"""
+
+    def __init__(self, reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter'):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def idle_time(self) -> float:
+        """Seconds since the connection was returned to the pool"""
+        return time.monotonic() - self.last_used
+
+    def is_alive(self) -> bool:
+        """Check that the peer has not closed the connection while it was idle"""
+        return not (self.reader.at_eof() or self.writer.is_closing())
+
+
+class AsyncConnectionPool:
+    """Pool of upgraded asyncio TLS streams keyed by (host, port)
+
+    All access happens on the event loop thread and no method awaits while
+    touching the pool, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = MAX_POOL_SIZE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self._connections: Dict[Tuple[str, int], List[AsyncPooledConnection]] = {}
+
+    def acquire(self, host: str, port: int) -> Optional[Tuple['asyncio.StreamReader', 'asyncio.StreamWriter']]:
+        """Take a live idle connection for (host, port), or None if there is none"""
+        connections = self._connections.get((host, port))
+
+        while connections:
+            pooled = connections.pop()
+            if pooled.idle_time() < self.idle_timeout and pooled.is_alive():
+                logger.debug(f"Reusing pooled connection for {host}:{port}")
+                return pooled.reader, pooled.writer
+
+            logger.debug(f"Discarding stale pooled connection for {host}:{port}")
+            pooled.writer.close()
+
+        return None
+
+    def release(self, host: str, port: int, reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter') -> None:
+        """Return a connection to the pool, closing it if the pool is full"""
+        connections = self._connections.setdefault((host, port), [])
+        connections[:] = [pooled for pooled in connections if self._keep(pooled)]
+
+        if len(connections) < self.max_connections_per_host:
+            connections.append(AsyncPooledConnection(reader, writer))
+        else:
+            writer.close()
+
+    def idle_count(self, host: str, port: int) -> int:
+        """Number of idle connections currently pooled for (host, port)"""
+        return len(self._connections.get((host, port), []))
+
+    async def close(self) -> None:
+        """Close every pooled connection"""
+        connections = [pooled for conns in self._connections.values() for pooled in conns]
+        self._connections.clear()
+
+        for pooled in connections:
+            pooled.writer.close()
+        for pooled in connections:
+            try:
+                await pooled.writer.wait_closed()
+            except Exception:
+                pass
+
+    def _keep(self, pooled: AsyncPooledConnection) -> bool:
+        if pooled.idle_time() < self.idle_timeout and pooled.is_alive():
+            return True
+        pooled.writer.close()
+        return False
@@ -0,0 +1,86 @@
+"""
+GURT prepared requests - parse and serialize a fixed endpoint once, send it many times
+"""
+
+from typing import Optional, Union
+
+from .protocol import PROTOCOL_PREFIX, GURT_VERSION, HEADER_SEPARATOR
+from .headers import GurtHeaders, HeadersLike
+from .message import GurtRequest, GurtMethod, BufferLike, BodyStream
+
+RequestBody = Union[str, BufferLike, BodyStream]
+
+
+class PreparedRequest:
+    """A request template bound to a client
+
+    The URL is parsed once. The request line and the constant headers
+    (host, user-agent, content-type and any given ``headers``) are
+    serialized to bytes once. Each ``send()`` only adds the body, its
+    content-length, and per-call headers. Requests still go through the
+    client's cache, retry, rate-limit, circuit-breaker and hooks layers.
+
+    Create with ``client.prepare(method, url)``. With AsyncGurtClient,
+    ``send()`` returns a coroutine.
+    """
+
+    def __init__(self, client, method: GurtMethod, url: str,
+                 content_type: Optional[str] = None, headers: Optional[HeadersLike] = None):
+        self.client = client
+        self.method = method
+        self.url = url
+        self.host, self.port, self.path = client._parse_gurt_url(url)
+
+        template = client._build_request(method, self.host, self.path, content_type=content_type)
+        if headers:
+            template.headers.update(headers)
+        # Never modified after this point; each request gets a copy
+        self._headers = template.headers
+
+        # content-length differs per call, so it is never part of the prefix
+        self._prefix: Optional[bytes] = None
+        if 'content-length' not in self._headers:
+            start = f"{method.value} {self.path} {PROTOCOL_PREFIX}{GURT_VERSION}{HEADER_SEPARATOR}"
+            self._prefix = (start + self._headers.to_str()).encode('utf-8')
+
+    @property
+    def headers(self) -> GurtHeaders:
+        """The constant headers (a copy)"""
+        return self._headers.copy()
+
+    def build(self, body: Optional[RequestBody] = None, headers: Optional[HeadersLike] = None,
+              content_length: Optional[int] = None) -> GurtRequest:
+        """Create the GurtRequest for one call, reusing the serialized header block"""
+        template = self._headers
+        request = GurtRequest(self.method, self.path)
+        request.headers = template.copy()
+        request._head_prefix = self._prefix
+
+        if headers:
+            extra = GurtHeaders(headers)
+            if 'content-length' in extra or any(key in template for key in extra):
+                request.headers.update(extra)
+                request._head_prefix = None  # Overrides a template header; serialize normally
+            else:
+                request.headers.extend(extra)
+                if self._prefix is not None:
+                    request._head_prefix = self._prefix + extra.to_bytes()
+
+        # The prefix stays valid until the request's headers are changed
+        request._head_headers = request.headers
+        request._head_version = request.headers._version
+
+        if body is not None:
+            request.with_body(body, content_length)
+        return request
+
+    def send(self, body: Optional[RequestBody] = None, headers: Optional[HeadersLike] = None,
+             content_length: Optional[int] = None, stream: bool = False):
+        """Send the request with an optional body and extra headers"""
+        request = self.build(body, headers, content_length)
+        if stream:
+            return self.client._send_request_internal(self.host, self.port, request, stream=True)
+        return self.client._send_request_internal(self.host, self.port, request)
+
+    def __repr__(self) -> str:
+        return f"PreparedRequest({self.method.value} {self.url})"
@@ -21,6 +21,20 @@ DEFAULT_CONNECTION_TIMEOUT = 10
 
 # Message size limits
 MAX_MESSAGE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_HEADER_SIZE = 64 * 1024  # 64KB
+MAX_HEADER_COUNT = 100
+
+# Socket read size
+DEFAULT_READ_CHUNK_SIZE = 64 * 1024  # 64KB
+
+# Segmented downloads; each segment is one response, so it has to fit within MAX_MESSAGE_SIZE
+DEFAULT_SEGMENT_SIZE = 4 * 1024 * 1024
+DEFAULT_DOWNLOAD_CONNECTIONS = 4
+DEFAULT_SEGMENT_RETRIES = 3
+
+# Connection pool limits
+MAX_POOL_SIZE = 10
+POOL_IDLE_TIMEOUT = 300  # seconds
 
 # TLS Configuration
 GURT_ALPN = b"GURT/1.0"
@@ -34,6 +48,10 @@ class GurtStatusCode(IntEnum):
     CREATED = 201
     ACCEPTED = 202
     NO_CONTENT = 204
+    PARTIAL_CONTENT = 206
+    
+    # Redirection
+    NOT_MODIFIED = 304
     
     # Handshake
     SWITCHING_PROTOCOLS = 101
@@ -47,6 +65,7 @@ class GurtStatusCode(IntEnum):
     TIMEOUT = 408
     TOO_LARGE = 413
     UNSUPPORTED_MEDIA_TYPE = 415
+    RANGE_NOT_SATISFIABLE = 416
     TOO_MANY_REQUESTS = 429
     
     # Server errors
@@ -62,7 +81,7 @@ class GurtStatusCode(IntEnum):
     
     def is_success(self) -> bool:
         """Check if this is a success status code"""
-        return self in (self.OK, self.CREATED, self.ACCEPTED, self.NO_CONTENT)
+        return self in (self.OK, self.CREATED, self.ACCEPTED, self.NO_CONTENT, self.PARTIAL_CONTENT)
     
     def is_client_error(self) -> bool:
         """Check if this is a client error status code"""
@@ -78,6 +97,8 @@ STATUS_MESSAGES: Dict[GurtStatusCode, str] = {
     GurtStatusCode.CREATED: "CREATED", 
     GurtStatusCode.ACCEPTED: "ACCEPTED",
     GurtStatusCode.NO_CONTENT: "NO_CONTENT",
+    GurtStatusCode.PARTIAL_CONTENT: "PARTIAL_CONTENT",
+    GurtStatusCode.NOT_MODIFIED: "NOT_MODIFIED",
     GurtStatusCode.SWITCHING_PROTOCOLS: "SWITCHING_PROTOCOLS",
     GurtStatusCode.BAD_REQUEST: "BAD_REQUEST",
     GurtStatusCode.UNAUTHORIZED: "UNAUTHORIZED",
@@ -87,6 +108,7 @@ STATUS_MESSAGES: Dict[GurtStatusCode, str] = {
     GurtStatusCode.TIMEOUT: "TIMEOUT",
     GurtStatusCode.TOO_LARGE: "TOO_LARGE",
     GurtStatusCode.UNSUPPORTED_MEDIA_TYPE: "UNSUPPORTED_MEDIA_TYPE",
+    GurtStatusCode.RANGE_NOT_SATISFIABLE: "RANGE_NOT_SATISFIABLE",
     GurtStatusCode.TOO_MANY_REQUESTS: "TOO_MANY_REQUESTS",
     GurtStatusCode.INTERNAL_SERVER_ERROR: "INTERNAL_SERVER_ERROR",
     GurtStatusCode.NOT_IMPLEMENTED: "NOT_IMPLEMENTED",
@@ -0,0 +1,157 @@
+"""
+GURT client-side rate limiting - per-host token buckets with 429 back-off
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import logging
+
+from .protocol import GurtStatusCode
+from .message import GurtResponse
+from .retry import parse_retry_after
+from .errors import GurtRateLimitError
+
+logger = logging.getLogger(__name__)
+
+# Multiplicative decrease applied to a bucket's rate on a 429 response
+DEFAULT_DECREASE_FACTOR = 0.5
+
+# Lowest rate a bucket is throttled down to, as a share of its configured rate
+DEFAULT_MIN_RATE_RATIO = 0.05
+
+
+class TokenBucket:
+    """Thread-safe token bucket with additive-increase / multiplicative-decrease
+
+    Callers reserve a token and then wait the returned delay, which paces
+    requests evenly instead of letting them burst and be rejected. A 429
+    cuts the rate by ``decrease_factor``; it then climbs back to the
+    configured rate over ``recovery_time`` seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float, decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+                 min_rate: Optional[float] = None, recovery_time: float = 10.0):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.decrease_factor = decrease_factor
+        self.min_rate = min_rate if min_rate is not None else rate * DEFAULT_MIN_RATE_RATIO
+        self.recovery_time = recovery_time
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def _advance(self, now: float) -> None:
+        """Refill tokens and recover the rate for the time elapsed (caller holds the lock)"""
+        elapsed = now - self._updated
+        if elapsed <= 0:
+            return
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * elapsed / self.recovery_time)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token, returning how long to wait before using it
+
+        Returns None without taking a token if the wait would exceed ``max_wait``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+
+            wait = max(0.0, self.blocked_until - now)
+            shortfall = 1 - self.tokens
+            if shortfall > 0:
+                wait = max(wait, shortfall / self.rate)
+
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self.tokens -= 1
+            return wait
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after the server rejected a request with 429"""
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            self.throttled += 1
+
+            # One burst of rejections is one signal, so decrease at most once per token interval
+            if now - self._last_decrease >= 1 / self.rate:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._last_decrease = now
+                self.tokens = min(self.tokens, 0.0)
+
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            self._advance(time.monotonic())
+            return {"rate": self.rate, "tokens": self.tokens, "throttled": self.throttled}
+
+
+class RateLimiter:
+    """Per-(host, port) request rate limits, optionally split by path prefix
+
+    ``path_limits`` maps a path prefix to its own ``(rate, burst)``; requests
+    under that prefix use a separate bucket, e.g. ``{"/domain": (1, 5)}``.
+    With ``max_wait`` set, a request that would wait longer fails fast with
+    GurtRateLimitError instead of blocking.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, path_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 max_wait: Optional[float] = None, decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+                 recovery_time: float = 10.0):
+        self.rate = rate
+        self.burst = burst
+        # Longest prefix first so the most specific rule wins
+        self.path_limits = dict(sorted((path_limits or {}).items(), key=lambda item: -len(item[0])))
+        self.max_wait = max_wait
+        self.decrease_factor = decrease_factor
+        self.recovery_time = recovery_time
+        self._buckets: Dict[Tuple[str, int, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str, port: int, path: str) -> TokenBucket:
+        prefix = next((p for p in self.path_limits if path.startswith(p)), "")
+        key = (host, port, prefix)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, burst = self.path_limits[prefix] if prefix else (self.rate, self.burst)
+                bucket = TokenBucket(rate, burst, self.decrease_factor, recovery_time=self.recovery_time)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, host: str, port: int, path: str) -> float:
+        """Reserve a request slot and return the delay to wait before sending
+
+        Raises GurtRateLimitError when the delay would exceed ``max_wait``.
+        """
+        delay = self._bucket(host, port, path).reserve(self.max_wait)
+        if delay is None:
+            raise GurtRateLimitError(f"Rate limit for {host}:{port}{path} exceeded")
+        return delay
+
+    def observe(self, host: str, port: int, path: str, response: GurtResponse) -> None:
+        """Adapt to the server: a 429 lowers the rate of the request's bucket"""
+        if response.status_code == GurtStatusCode.TOO_MANY_REQUESTS:
+            retry_after = parse_retry_after(response.get_header("retry-after"))
+            logger.debug(f"Throttled by {host}:{port}{path}, slowing down")
+            self._bucket(host, port, path).throttle(retry_after)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Current rate, tokens and 429 count per bucket, keyed 'host:port/prefix'"""
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {f"{host}:{port}{prefix}": bucket.stats() for (host, port, prefix), bucket in buckets}
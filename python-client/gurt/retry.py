@@ -0,0 +1,225 @@
+"""
+GURT retry policy - backoff with full jitter, retry-after and a retry budget
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type
+import logging
+
+from .protocol import GurtStatusCode
+from .message import GurtMethod, GurtRequest, GurtResponse
+from .errors import GurtError, GurtConnectionError, GurtTimeoutError, GurtHandshakeError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.1  # seconds
+DEFAULT_BACKOFF_MAX = 10.0  # seconds
+DEFAULT_MAX_RETRY_AFTER = 60.0  # seconds
+
+# Methods that may be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({
+    GurtMethod.GET, GurtMethod.HEAD, GurtMethod.OPTIONS, GurtMethod.PUT, GurtMethod.DELETE
+})
+
+RETRYABLE_STATUS_CODES = frozenset({
+    GurtStatusCode.TOO_MANY_REQUESTS,
+    GurtStatusCode.BAD_GATEWAY,
+    GurtStatusCode.SERVICE_UNAVAILABLE,
+    GurtStatusCode.GATEWAY_TIMEOUT,
+})
+
+RETRYABLE_ERRORS: Tuple[Type[GurtError], ...] = (GurtConnectionError, GurtTimeoutError, GurtHandshakeError)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a retry-after header (delay seconds or an HTTP date)"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    from email.utils import parsedate_to_datetime  # Slow to import and rarely needed
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryBudget:
+    """Caps retries at a share of recent requests across the whole client
+
+    Over a rolling ``window`` of seconds, retries are allowed while they stay
+    below ``min_retries_per_second * window + ratio * requests``. The floor
+    keeps low-traffic clients able to retry; the ratio stops a client from
+    multiplying its load on a backend that is already failing.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 1.0, window: float = 10.0):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window = window
+        self._buckets: Deque[List[int]] = deque()  # [second, requests, retries]
+        self._lock = threading.Lock()
+
+    def _bucket(self) -> List[int]:
+        """Current one-second bucket, dropping those outside the window (caller holds the lock)"""
+        now = int(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._bucket()[1] += 1
+
+    def try_acquire(self) -> bool:
+        """Reserve a retry if the budget allows it"""
+        with self._lock:
+            bucket = self._bucket()
+            requests = sum(b[1] for b in self._buckets)
+            retries = sum(b[2] for b in self._buckets)
+            if retries >= self.min_retries_per_second * self.window + self.ratio * requests:
+                return False
+            bucket[2] += 1
+            return True
+
+
+class RetryAttempt:
+    """Metrics for one attempt, passed to the ``on_attempt`` callback"""
+
+    def __init__(self, method: GurtMethod, host: str, port: int, path: str, attempt: int,
+                 duration: float, status_code: Optional[int] = None, error: Optional[GurtError] = None):
+        self.method = method
+        self.host = host
+        self.port = port
+        self.path = path
+        self.attempt = attempt
+        self.duration = duration
+        self.status_code = status_code
+        self.error = error
+        self.will_retry = False
+        self.delay = 0.0
+        self.budget_exhausted = False
+
+    @property
+    def outcome(self) -> str:
+        """Status code or exception name, for use as a metric label"""
+        return str(self.status_code) if self.error is None else type(self.error).__name__
+
+    def __repr__(self) -> str:
+        return (f"RetryAttempt({self.method.value} {self.host}:{self.port}{self.path} #{self.attempt} "
+                f"{self.outcome} retry={self.will_retry} delay={self.delay:.3f})")
+
+
+class RetryPolicy:
+    """Decides whether and when a failed attempt is retried
+
+    Only ``methods`` (idempotent ones by default) are retried, after an error
+    in ``retry_errors`` or a response in ``retry_statuses``. Waits use
+    exponential backoff with full jitter, or the server's ``retry-after``
+    when present; a ``retry-after`` above ``max_retry_after`` is not waited
+    for. Each retry must also fit in the shared ``budget``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        methods: Iterable[GurtMethod] = IDEMPOTENT_METHODS,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUS_CODES,
+        retry_errors: Tuple[Type[GurtError], ...] = RETRYABLE_ERRORS,
+        respect_retry_after: bool = True,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        budget: Optional[RetryBudget] = None,
+        on_attempt: Optional[Callable[[RetryAttempt], None]] = None
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.methods: FrozenSet[GurtMethod] = frozenset(methods)
+        self.retry_statuses = frozenset(int(status) for status in retry_statuses)
+        self.retry_errors = retry_errors
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+        self.on_attempt = on_attempt
+        self._lock = threading.Lock()
+        self._counters = {"attempts": 0, "retries": 0, "exhausted": 0, "budget_exhausted": 0}
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (1 for the first retry)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def start(self, request: GurtRequest) -> None:
+        """Count a new logical request towards the retry budget"""
+        self.budget.record_request()
+
+    def evaluate(self, request: GurtRequest, host: str, port: int, attempt: int, started: float,
+                 response: Optional[GurtResponse] = None, error: Optional[GurtError] = None) -> Optional[float]:
+        """Record an attempt and return the delay before retrying, or None to stop"""
+        record = RetryAttempt(
+            request.method, host, port, request.path, attempt, time.monotonic() - started,
+            status_code=int(response.status_code) if response is not None else None, error=error
+        )
+
+        if error is not None:
+            retryable = isinstance(error, self.retry_errors)
+        else:
+            retryable = int(response.status_code) in self.retry_statuses
+
+        delay = None
+        if retryable and request.method in self.methods:
+            if attempt >= self.max_attempts:
+                self._count("exhausted")
+            else:
+                delay = self._delay(response, attempt)
+
+        if delay is not None and not request.rewind_body():
+            # A streamed body has been consumed and cannot be sent again
+            delay = None
+
+        if delay is not None and not self.budget.try_acquire():
+            record.budget_exhausted = True
+            self._count("budget_exhausted")
+            delay = None
+
+        if delay is not None:
+            record.will_retry = True
+            record.delay = delay
+            self._count("retries")
+            logger.debug(f"Retrying {request.method.value} {host}:{port}{request.path} "
+                         f"after {record.outcome} in {delay:.3f}s (attempt {attempt})")
+
+        self._count("attempts")
+        if self.on_attempt:
+            try:
+                self.on_attempt(record)
+            except Exception as e:
+                logger.debug(f"Retry metrics callback failed: {e}")
+
+        return delay
+
+    def _delay(self, response: Optional[GurtResponse], attempt: int) -> Optional[float]:
+        if response is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(response.get_header("retry-after"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return attempt, retry and give-up counters"""
+        with self._lock:
+            return dict(self._counters)
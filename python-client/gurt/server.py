@@ -0,0 +1,739 @@
+"""
+GURT asyncio server - handshake, TLS 1.3 upgrade and request routing
+"""
+
+import asyncio
+import inspect
+import ssl
+import time
+from collections import deque
+from email.utils import formatdate
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+import logging
+
+from .protocol import (
+    GURT_ALPN, GURT_VERSION, TLS_VERSION, DEFAULT_PORT,
+    DEFAULT_HANDSHAKE_TIMEOUT, DEFAULT_REQUEST_TIMEOUT, MAX_MESSAGE_SIZE,
+    GurtStatusCode
+)
+from .message import GurtRequest, GurtResponse, GurtMethod, GurtParser, BodyChunk
+from .headers import GurtHeaders
+from .codec import get_default_codec
+from .compression import (
+    CompressionStats, ContentDecoder, choose_encoding, compress, is_compressible
+)
+from .errors import GurtError, GurtProtocolError, GurtTLSError
+
+logger = logging.getLogger(__name__)
+
+# Server defaults
+DEFAULT_MAX_CONNECTIONS = 1024
+DEFAULT_IDLE_TIMEOUT = 60  # seconds a keep-alive connection may sit idle
+DEFAULT_MAX_PIPELINED = 16  # parsed requests queued per connection before reading pauses
+
+# Bodies up to this size are written together with the headers
+_COALESCE_BODY_SIZE = 16 * 1024
+
+_ALPN = GURT_ALPN.decode('utf-8')
+_ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+HandlerResult = Union[GurtResponse, Awaitable[GurtResponse]]
+Handler = Callable[['ServerContext'], HandlerResult]
+
+
+class ServerContext:
+    """A request being handled, with the address of the client that sent it"""
+
+    __slots__ = ('request', 'remote_addr')
+
+    def __init__(self, request: GurtRequest, remote_addr: Tuple[str, int]):
+        self.request = request
+        self.remote_addr = remote_addr
+
+    @property
+    def client_ip(self) -> str:
+        return self.remote_addr[0]
+
+    @property
+    def client_port(self) -> int:
+        return self.remote_addr[1]
+
+    @property
+    def method(self) -> GurtMethod:
+        return self.request.method
+
+    @property
+    def path(self) -> str:
+        return self.request.path
+
+    @property
+    def headers(self) -> GurtHeaders:
+        return self.request.headers
+
+    @property
+    def body(self) -> bytes:
+        return self.request.body
+
+    def header(self, key: str) -> Optional[str]:
+        return self.request.get_header(key)
+
+    def text(self) -> str:
+        return self.request.text()
+
+    def json(self) -> Any:
+        return get_default_codec().loads(self.request.body)
+
+
+class Route:
+    """A method (None for any) and a path pattern; a trailing ``*`` matches any suffix"""
+
+    def __init__(self, method: Optional[GurtMethod], pattern: str):
+        self.method = method
+        self.pattern = pattern
+
+    @property
+    def is_prefix(self) -> bool:
+        return self.pattern.endswith('*')
+
+    def matches_path(self, path: str) -> bool:
+        path = path.split('?', 1)[0]
+        if self.is_prefix:
+            return path.startswith(self.pattern[:-1])
+        return path == self.pattern
+
+    def matches(self, method: GurtMethod, path: str) -> bool:
+        return (self.method is None or self.method == method) and self.matches_path(path)
+
+
+class Router:
+    """Maps (method, path) to handlers
+
+    Exact paths are found with one dict lookup. Wildcard routes are tried
+    longest prefix first. Within a path a handler registered for the
+    method wins over one registered for any method.
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Dict[Optional[GurtMethod], Handler]] = {}
+        self._prefixes: List[Tuple[str, Dict[Optional[GurtMethod], Handler]]] = []
+
+    def add(self, route: Route, handler: Handler) -> None:
+        if route.is_prefix:
+            prefix = route.pattern[:-1]
+            for existing, handlers in self._prefixes:
+                if existing == prefix:
+                    handlers[route.method] = handler
+                    return
+            self._prefixes.append((prefix, {route.method: handler}))
+            self._prefixes.sort(key=lambda entry: len(entry[0]), reverse=True)
+        else:
+            self._exact.setdefault(route.pattern, {})[route.method] = handler
+
+    def _candidates(self, path: str):
+        query = path.find('?')
+        if query != -1:
+            path = path[:query]
+
+        handlers = self._exact.get(path)
+        if handlers is not None:
+            yield handlers
+        for prefix, handlers in self._prefixes:
+            if path.startswith(prefix):
+                yield handlers
+
+    def find(self, method: GurtMethod, path: str) -> Optional[Handler]:
+        """Handler for the request, or None"""
+        for handlers in self._candidates(path):
+            handler = handlers.get(method) or handlers.get(None)
+            if handler is not None:
+                return handler
+        return None
+
+    def allowed_methods(self, path: str) -> List[str]:
+        """Methods with a handler for ``path``, plus OPTIONS"""
+        allowed = {"OPTIONS"}
+        for handlers in self._candidates(path):
+            for method in handlers:
+                if method is None:
+                    allowed.update(_ALL_METHODS)
+                else:
+                    allowed.add(method.value)
+        return sorted(allowed)
+
+
+class _DateCache:
+    """The ``date`` header value, formatted at most once per second"""
+
+    def __init__(self):
+        self._second = 0
+        self._value = ""
+
+    def get(self) -> str:
+        now = int(time.time())
+        if now != self._second:
+            self._second = now
+            self._value = formatdate(now, usegmt=True)
+        return self._value
+
+
+class _GurtServerProtocol(asyncio.Protocol):
+    """One client connection: plaintext handshake, TLS upgrade, then requests in order"""
+
+    HANDSHAKE = "handshake"
+    UPGRADING = "upgrading"
+    READY = "ready"
+    CLOSED = "closed"
+
+    def __init__(self, server: 'GurtServer'):
+        self.server = server
+        self.loop = asyncio.get_running_loop()
+        self.transport: Optional[asyncio.Transport] = None
+        self.remote_addr: Tuple[str, int] = ("", 0)
+        self.state = self.HANDSHAKE
+        self.parser = self._new_parser()
+        self.body_parts: List[bytes] = []
+        self.queue: Deque[GurtRequest] = deque()
+        self.task: Optional[asyncio.Task] = None  # Running async handler
+        self.write_paused = False
+        self.reading_paused = False
+        self.last_activity = self.loop.time()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def _new_parser(self) -> GurtParser:
+        return GurtParser(max_message_size=self.server.max_message_size)
+
+    # Connection lifecycle
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        if self.state == self.UPGRADING:
+            return  # The TLS transport replacing the plaintext one
+
+        server = self.server
+        self.transport = transport
+        peer = transport.get_extra_info('peername')
+        self.remote_addr = (peer[0], peer[1]) if peer else ("", 0)
+
+        if len(server._connections) >= server.max_connections:
+            server._stats["connections_rejected"] += 1
+            transport.abort()
+            self.state = self.CLOSED
+            return
+
+        server._connections.add(self)
+        server._stats["connections"] += 1
+        self._schedule_timeout(server.handshake_timeout)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.state = self.CLOSED
+        self.server._connections.discard(self)
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        self.queue.clear()
+
+    def close(self) -> None:
+        if self.state != self.CLOSED and self.transport:
+            self.transport.close()
+
+    def _schedule_timeout(self, timeout: Optional[float]) -> None:
+        if timeout:
+            self.timer = self.loop.call_later(timeout, self._check_timeout)
+
+    def _check_timeout(self) -> None:
+        """Close the connection if it has been idle too long
+
+        Activity only records a timestamp; the timer re-arms itself for the
+        remaining time instead of being rescheduled on every request.
+        """
+        self.timer = None
+        if self.state == self.CLOSED:
+            return
+
+        if self.state != self.READY:
+            logger.debug(f"Handshake timeout from {self.remote_addr[0]}")
+            self.transport.abort()
+            return
+
+        if self.task or self.queue:
+            timeout = self.server.request_timeout
+        else:
+            timeout = self.server.idle_timeout
+        remaining = self.last_activity + timeout - self.loop.time()
+        if remaining <= 0:
+            self.close()
+        else:
+            self.timer = self.loop.call_later(remaining, self._check_timeout)
+
+    # Flow control
+
+    def pause_writing(self) -> None:
+        self.write_paused = True
+        self._update_reading()
+
+    def resume_writing(self) -> None:
+        self.write_paused = False
+        self._process_queue()
+        self._update_reading()
+
+    def _update_reading(self) -> None:
+        """Stop reading while the client is not consuming responses or too many requests are queued"""
+        if self.state != self.READY:
+            return
+        pause = self.write_paused or len(self.queue) >= self.server.max_pipelined
+        if pause != self.reading_paused:
+            self.reading_paused = pause
+            if pause:
+                self.transport.pause_reading()
+            else:
+                self.transport.resume_reading()
+
+    # Receiving
+
+    def data_received(self, data: bytes) -> None:
+        self.last_activity = self.loop.time()
+
+        try:
+            while data:
+                for event in self.parser.feed(data):
+                    if isinstance(event, BodyChunk):
+                        self.body_parts.append(event.data)
+                if not self.parser.is_complete:
+                    return
+
+                parser = self.parser
+                request = GurtRequest.from_head(parser.start_line, parser.headers)
+                request.body = b"".join(self.body_parts) if self.body_parts else b""
+                data = parser.trailing
+                self.parser = self._new_parser()
+                self.body_parts = []
+
+                if self.state == self.HANDSHAKE:
+                    self._handshake(request)
+                    return  # Nothing may follow the handshake before the TLS upgrade
+                self.queue.append(request)
+
+        except GurtProtocolError as e:
+            self._fail(e)
+            return
+
+        self._process_queue()
+        self._update_reading()
+
+    def eof_received(self) -> bool:
+        # Finish responses already queued, then close
+        return False
+
+    def _fail(self, error: GurtProtocolError) -> None:
+        logger.debug(f"Protocol error from {self.remote_addr[0]}: {error}")
+        if self.state == self.HANDSHAKE:
+            self.transport.abort()
+            return
+        status = GurtStatusCode.TOO_LARGE if "too large" in str(error).lower() else GurtStatusCode.BAD_REQUEST
+        self._write(GurtResponse(status).with_header("connection", "close").with_body(str(error)), close=True)
+
+    # Handshake and TLS upgrade
+
+    def _handshake(self, request: GurtRequest) -> None:
+        if request.method != GurtMethod.HANDSHAKE:
+            logger.debug(f"Expected HANDSHAKE from {self.remote_addr[0]}, got {request.method.value}")
+            self.transport.write(GurtResponse.bad_request().with_header("connection", "close").to_bytes())
+            self.transport.close()
+            return
+
+        self.transport.write(self.server._handshake_reply())
+        # The ClientHello must reach the TLS layer, not this parser
+        self.transport.pause_reading()
+        self.state = self.UPGRADING
+        self.task = self.loop.create_task(self._upgrade())
+
+    async def _upgrade(self) -> None:
+        server = self.server
+        try:
+            transport = await self.loop.start_tls(
+                self.transport, self, server.ssl_context, server_side=True,
+                ssl_handshake_timeout=server.handshake_timeout
+            )
+        except (OSError, ssl.SSLError, asyncio.TimeoutError, ConnectionError) as e:
+            logger.debug(f"TLS upgrade with {self.remote_addr[0]} failed: {e}")
+            if self.state != self.CLOSED:
+                self.transport.abort()
+                # The TLS layer only reports connection_lost after a completed handshake
+                self.task = None
+                self.connection_lost(e)
+            return
+        finally:
+            if self.task is asyncio.current_task():
+                self.task = None
+
+        if transport is None or self.state == self.CLOSED:
+            return
+
+        self.transport = transport
+        ssl_object = transport.get_extra_info('ssl_object')
+        if ssl_object is None or ssl_object.selected_alpn_protocol() != _ALPN:
+            logger.debug(f"Client {self.remote_addr[0]} did not negotiate ALPN {_ALPN}")
+            transport.abort()
+            return
+
+        self.state = self.READY
+        server._stats["handshakes"] += 1
+        self.last_activity = self.loop.time()
+        # Requests may have arrived while the upgrade was finishing
+        self._process_queue()
+
+    # Dispatch
+
+    def _process_queue(self) -> None:
+        """Handle queued requests in order; async handlers run one at a time per connection"""
+        while self.queue and not self.task and not self.write_paused and self.state == self.READY:
+            request = self.queue.popleft()
+
+            if request.method == GurtMethod.HANDSHAKE:
+                self._write(
+                    GurtResponse.bad_request().with_header("connection", "close")
+                    .with_body("HANDSHAKE received over TLS"),
+                    close=True
+                )
+                return
+
+            if request.body and request.get_header("content-encoding"):
+                error = self.server._decode_request(request)
+                if error is not None:
+                    self._respond(request, error)
+                    continue
+
+            result = self.server._dispatch(ServerContext(request, self.remote_addr))
+
+            if inspect.isawaitable(result):
+                self.task = self.loop.create_task(result)
+                self.task.add_done_callback(lambda task, request=request: self._handler_done(task, request))
+                return
+
+            self._respond(request, result)
+
+        self._update_reading()
+
+    def _handler_done(self, task: asyncio.Task, request: GurtRequest) -> None:
+        self.task = None
+        if self.state == self.CLOSED or task.cancelled():
+            return
+
+        error = task.exception()
+        if error is not None:
+            response = self.server._handler_error(request, error)
+        else:
+            response = task.result()
+
+        self._respond(request, response)
+        self._process_queue()
+
+    def _respond(self, request: GurtRequest, response: GurtResponse) -> None:
+        if not isinstance(response, GurtResponse):
+            response = self.server._handler_error(
+                request, TypeError(f"Handler returned {type(response).__name__}, not GurtResponse")
+            )
+        close = (request.get_header("connection") or "").lower() == "close"
+
+        if request.method == GurtMethod.HEAD and response.body:
+            # Keep the length of the body a HEAD request is not sent
+            response.headers.setdefault('content-length', str(len(response.body)))
+            response.body = b""
+        elif self.server.compression_min_size is not None:
+            self.server._compress_response(request, response)
+
+        self._write(response, close)
+
+    def _write(self, response: GurtResponse, close: bool = False) -> None:
+        if self.state == self.CLOSED:
+            return
+        server = self.server
+        server._stats["requests"] += 1
+        if response.status_code >= 500:
+            server._stats["server_errors"] += 1
+
+        headers = response.headers
+        if 'date' not in headers:
+            headers['date'] = server._date.get()
+
+        body = response.body
+        head = response.head_bytes()
+        if len(body) <= _COALESCE_BODY_SIZE:
+            self.transport.write(head + body if body else head)
+        else:
+            self.transport.write(head)
+            self.transport.write(body)
+
+        self.last_activity = self.loop.time()
+        if close:
+            self.queue.clear()
+            self.transport.close()
+
+
+class GurtServer:
+    """asyncio GURT server
+
+    Clients connect in plaintext and send HANDSHAKE. The server answers
+    101 with the GURT version, encryption and ALPN headers and upgrades
+    the connection to TLS 1.3 with ALPN ``GURT/1.0``. The connection then
+    carries any number of requests, answered in order.
+
+    Handlers take a ServerContext and return a GurtResponse, either
+    directly or from a coroutine. Plain functions are called inline
+    without creating a task, which is the fastest path::
+
+        server = GurtServer().load_tls_certificates("cert.pem", "key.pem")
+
+        @server.get("/")
+        def index(ctx):
+            return GurtResponse.ok().with_body("Hello")
+
+        asyncio.run(server.listen("0.0.0.0", 4878))
+
+    At most ``max_connections`` connections are served at once; further
+    connections are closed right after being accepted. A connection stops
+    being read while its client does not consume responses or while
+    ``max_pipelined`` of its requests are waiting.
+
+    Compressed request bodies are always decoded before dispatch. With
+    ``compression_min_size`` set, 200 responses of at least that many
+    bytes with a text, JSON or other compressible content-type are
+    compressed with the best coding the client accepts.
+    """
+
+    def __init__(
+        self,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        handshake_timeout: float = DEFAULT_HANDSHAKE_TIMEOUT,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_pipelined: int = DEFAULT_MAX_PIPELINED,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        compression_min_size: Optional[int] = None,
+        max_decoded_size: Optional[int] = None
+    ):
+        self.ssl_context = ssl_context
+        self.handshake_timeout = handshake_timeout
+        self.request_timeout = request_timeout
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.max_pipelined = max_pipelined
+        self.max_message_size = max_message_size
+        self.compression_min_size = compression_min_size
+        # Compressed request bodies may not decode to more than a plain request could carry
+        self.max_decoded_size = max_message_size if max_decoded_size is None else max_decoded_size
+        self.router = Router()
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections = set()
+        self._date = _DateCache()
+        self._stats = {
+            "connections": 0,
+            "connections_rejected": 0,
+            "handshakes": 0,
+            "requests": 0,
+            "server_errors": 0,
+        }
+        self._compression = CompressionStats()
+        # Serialized 101 reply, rebuilt when its date header changes
+        self._handshake_date = ""
+        self._handshake_bytes = b""
+
+    def load_tls_certificates(self, cert_path: str, key_path: str) -> 'GurtServer':
+        """Use a certificate chain and private key for the TLS upgrade"""
+        try:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.minimum_version = ssl.TLSVersion.TLSv1_3
+            context.maximum_version = ssl.TLSVersion.TLSv1_3
+            context.set_alpn_protocols([_ALPN])
+            context.load_cert_chain(cert_path, key_path)
+        except (OSError, ssl.SSLError) as e:
+            raise GurtTLSError(f"Failed to load TLS certificates: {e}")
+
+        self.ssl_context = context
+        return self
+
+    # Routes
+
+    def route(self, route: Route, handler: Optional[Handler] = None):
+        """Register ``handler`` for ``route``; without a handler, return a decorator"""
+        if handler is None:
+            def decorator(func: Handler) -> Handler:
+                self.router.add(route, func)
+                return func
+            return decorator
+
+        self.router.add(route, handler)
+        return self
+
+    def get(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.GET, path), handler)
+
+    def post(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.POST, path), handler)
+
+    def put(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.PUT, path), handler)
+
+    def delete(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.DELETE, path), handler)
+
+    def head(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.HEAD, path), handler)
+
+    def options(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.OPTIONS, path), handler)
+
+    def patch(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(GurtMethod.PATCH, path), handler)
+
+    def any(self, path: str, handler: Optional[Handler] = None):
+        return self.route(Route(None, path), handler)
+
+    # Request handling
+
+    def _dispatch(self, context: ServerContext) -> HandlerResult:
+        """Run the matching handler; HEAD falls back to GET and OPTIONS lists allowed methods"""
+        request = context.request
+        router = self.router
+        handler = router.find(request.method, request.path)
+
+        if handler is None:
+            if request.method == GurtMethod.HEAD:
+                handler = router.find(GurtMethod.GET, request.path)
+            elif request.method == GurtMethod.OPTIONS:
+                return self._default_options(request)
+
+        if handler is None:
+            return GurtResponse.not_found().with_body("Not found")
+
+        try:
+            return handler(context)
+        except Exception as e:
+            return self._handler_error(request, e)
+
+    def _default_options(self, request: GurtRequest) -> GurtResponse:
+        return (
+            GurtResponse.ok()
+            .with_header("allow", ", ".join(self.router.allowed_methods(request.path)))
+            .with_header("access-control-allow-origin", "*")
+            .with_header("access-control-allow-methods", ", ".join(_ALL_METHODS))
+            .with_header("access-control-allow-headers", "Content-Type, Authorization")
+        )
+
+    def _handshake_reply(self) -> bytes:
+        date = self._date.get()
+        if date != self._handshake_date:
+            self._handshake_bytes = (
+                GurtResponse(GurtStatusCode.SWITCHING_PROTOCOLS)
+                .with_header("gurt-version", GURT_VERSION)
+                .with_header("encryption", TLS_VERSION)
+                .with_header("alpn", _ALPN)
+                .with_header("date", date)
+                .to_bytes()
+            )
+            self._handshake_date = date
+        return self._handshake_bytes
+
+    def _decode_request(self, request: GurtRequest) -> Optional[GurtResponse]:
+        """Replace a compressed request body with the decoded one; an error response if that fails"""
+        compressed = len(request.body)
+        try:
+            decoder = ContentDecoder(request.headers["content-encoding"], self.max_decoded_size)
+        except GurtProtocolError as e:
+            return GurtResponse(GurtStatusCode.UNSUPPORTED_MEDIA_TYPE).with_body(str(e))
+        try:
+            body = decoder.decode(request.body)
+            decoder.finish()
+        except GurtProtocolError as e:
+            return GurtResponse.bad_request().with_body(str(e))
+
+        request.body = body
+        del request.headers["content-encoding"]
+        request.headers["content-length"] = str(len(body))
+        self._compression.record_received(compressed, len(body))
+        return None
+
+    def _compress_response(self, request: GurtRequest, response: GurtResponse) -> None:
+        """Compress a large, compressible 200 body if the client accepts a supported coding"""
+        if response.status_code != GurtStatusCode.OK or 'content-encoding' in response.headers:
+            return
+        body = response.body
+        if len(body) < self.compression_min_size or not is_compressible(response.get_header("content-type")):
+            return
+        encoding = choose_encoding(request.get_header("accept-encoding"))
+        if encoding is None:
+            return
+
+        compressed = compress(body, encoding)
+        if len(compressed) >= len(body):
+            return
+        response.body = compressed
+        headers = response.headers
+        headers["content-encoding"] = encoding
+        vary = headers.get("vary")
+        if not vary:
+            headers["vary"] = "accept-encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["vary"] = f"{vary}, accept-encoding"
+        if "content-length" in headers:
+            headers["content-length"] = str(len(compressed))
+        self._compression.record_sent(len(body), len(compressed))
+
+    def _handler_error(self, request: GurtRequest, error: BaseException) -> GurtResponse:
+        logger.error(f"Handler error for {request.method.value} {request.path}: {error!r}")
+        return GurtResponse.internal_server_error().with_body("Internal server error")
+
+    # Lifecycle
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, **kwargs) -> None:
+        """Start accepting connections; ``port`` 0 picks a free port (see ``port``)"""
+        if self.ssl_context is None:
+            raise GurtError("GurtServer needs TLS certificates, see load_tls_certificates()")
+
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _GurtServerProtocol(self), host, port, backlog=kwargs.pop('backlog', 1024), **kwargs
+        )
+        logger.info(f"GURT server listening on {host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        """Serve a started server until cancelled, then close it"""
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def listen(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, **kwargs) -> None:
+        """Start the server and serve until cancelled"""
+        await self.start(host, port, **kwargs)
+        await self.serve_forever()
+
+    @property
+    def port(self) -> int:
+        """Port of the first listening socket"""
+        if not self._server or not self._server.sockets:
+            return 0
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop accepting connections and close the open ones"""
+        if self._server:
+            self._server.close()
+            for connection in list(self._connections):
+                connection.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> 'GurtServer':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Connection, request and compression counters"""
+        return dict(self._stats, connections_active=len(self._connections), **self._compression.snapshot())
@@ -0,0 +1,85 @@
+"""
+GURT streamed response bodies
+"""
+
+import io
+import socket
+from typing import Callable
+
+from .message import GurtParser
+from .errors import GurtConnectionError, GurtTimeoutError
+
+
+class GurtBodyStream(io.RawIOBase):
+    """File-like reader for a response body still arriving on its connection
+
+    Bytes are received with ``recv_into`` directly into the caller's buffer.
+    Once the body has been read completely ``on_release(True)`` hands the
+    connection back to its owner (typically the pool); closing the stream
+    early calls ``on_release(False)`` so the connection is discarded.
+    """
+
+    def __init__(self, sock: socket.socket, parser: GurtParser, prefix: bytes,
+                 on_release: Callable[[bool], None]):
+        super().__init__()
+        self._sock = sock
+        self._parser = parser
+        self._prefix = memoryview(prefix)
+        self._on_release = on_release
+        self._released = False
+
+        if parser.is_complete and not self._prefix:
+            self._release(True)
+
+    @property
+    def remaining(self) -> int:
+        """Body bytes not yet returned to the reader"""
+        return len(self._prefix) + self._parser.body_remaining
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast('B')
+        if not view or self._released and not self._prefix:
+            return 0
+
+        # Body bytes that arrived together with the headers
+        if self._prefix:
+            nbytes = min(len(view), len(self._prefix))
+            view[:nbytes] = self._prefix[:nbytes]
+            self._prefix = self._prefix[nbytes:]
+            if not self._prefix and self._parser.is_complete:
+                self._release(True)
+            return nbytes
+
+        try:
+            nbytes = self._sock.recv_into(view, min(len(view), self._parser.body_remaining))
+        except socket.timeout:
+            self._release(False)
+            raise GurtTimeoutError("Timeout while reading body")
+        except OSError as e:
+            self._release(False)
+            raise GurtConnectionError(f"Failed to read body: {e}")
+
+        if not nbytes:
+            self._release(False)
+            raise GurtConnectionError("Connection closed while reading body")
+
+        self._parser.advance_body(nbytes)
+        if self._parser.is_complete:
+            self._release(True)
+
+        return nbytes
+
+    def close(self) -> None:
+        """Stop reading; an unfinished body makes the connection unusable"""
+        if not self._released:
+            self._release(self._parser.is_complete)
+        self._prefix = memoryview(b"")
+        super().close()
+
+    def _release(self, reusable: bool) -> None:
+        if not self._released:
+            self._released = True
+            self._on_release(reusable)
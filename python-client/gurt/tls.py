@@ -0,0 +1,151 @@
+"""
+GURT TLS helpers - shared client contexts and session resumption cache
+"""
+
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+import logging
+
+from .protocol import GURT_ALPN
+from .errors import GurtTLSError
+
+logger = logging.getLogger(__name__)
+
+# TLS session cache defaults
+DEFAULT_SESSION_TTL = 3600  # seconds
+DEFAULT_SESSION_CACHE_SIZE = 256
+
+_ContextKey = Tuple[bool, Optional[str], Tuple[str, ...]]
+
+_contexts: Dict[_ContextKey, ssl.SSLContext] = {}
+_contexts_lock = threading.Lock()
+
+
+def _new_client_context(verify: bool, ca_bundle: Optional[str], alpn: Tuple[str, ...]) -> ssl.SSLContext:
+    if verify:
+        # Loads ca_bundle, or the system CA store when there is none
+        context = ssl.create_default_context(cafile=ca_bundle)
+    else:
+        # No CA store to load when nothing is verified
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        logger.warning("TLS certificate verification disabled - only use for development!")
+
+    context.minimum_version = ssl.TLSVersion.TLSv1_3
+    context.maximum_version = ssl.TLSVersion.TLSv1_3
+    context.set_alpn_protocols(list(alpn))
+    return context
+
+
+def client_context(verify: bool = True, ca_bundle: Optional[str] = None,
+                   alpn: Sequence[str] = (GURT_ALPN.decode('utf-8'),)) -> ssl.SSLContext:
+    """A TLS 1.3 client context, shared by every client with the same settings
+
+    Building a context and loading the CA store takes tens of milliseconds,
+    so each combination of verification, CA bundle and ALPN protocols is
+    built once per process. The context must not be modified by callers.
+    A CA bundle that changes on disk is only read again after
+    clear_context_cache().
+    """
+    key = (verify, ca_bundle, tuple(alpn))
+    context = _contexts.get(key)
+    if context is None:
+        with _contexts_lock:
+            context = _contexts.get(key)
+            if context is None:
+                try:
+                    context = _new_client_context(*key)
+                except (ssl.SSLError, OSError, ValueError) as e:
+                    raise GurtTLSError(f"Failed to create SSL context: {e}")
+                _contexts[key] = context
+    return context
+
+
+def clear_context_cache() -> None:
+    """Forget shared client contexts so the next client builds fresh ones"""
+    with _contexts_lock:
+        _contexts.clear()
+
+
+class TLSSessionCache:
+    """Thread-safe per-(host, port) cache of TLS sessions for resumption
+
+    Entries expire after ``max_age`` seconds or when the server-provided
+    ticket lifetime runs out, whichever comes first.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_SESSION_TTL, max_entries: int = DEFAULT_SESSION_CACHE_SIZE):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._sessions: "OrderedDict[Tuple[str, int], Tuple[ssl.SSLSession, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.offered = 0
+        self.resumed = 0
+        self.full_handshakes = 0
+
+    def get(self, host: str, port: int) -> Optional[ssl.SSLSession]:
+        """Return a resumable session for (host, port), or None"""
+        key = (host, port)
+
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return None
+
+            session, expires_at = entry
+            if time.time() >= expires_at:
+                del self._sessions[key]
+                return None
+
+            self._sessions.move_to_end(key)
+            return session
+
+    def put(self, host: str, port: int, session: Optional[ssl.SSLSession]) -> None:
+        """Store the session of a completed connection if it carries a ticket"""
+        if session is None or not session.has_ticket:
+            return
+
+        # session.time is when the server issued it, session.timeout its lifetime
+        expires_at = min(time.time() + self.max_age, session.time + session.timeout)
+        key = (host, port)
+
+        with self._lock:
+            self._sessions[key] = (session, expires_at)
+            self._sessions.move_to_end(key)
+
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+
+    def discard(self, host: str, port: int) -> None:
+        """Forget the session for (host, port)"""
+        with self._lock:
+            self._sessions.pop((host, port), None)
+
+    def record_handshake(self, offered: bool, reused: bool) -> None:
+        """Count the outcome of a TLS handshake"""
+        with self._lock:
+            if offered:
+                self.offered += 1
+            if reused:
+                self.resumed += 1
+            else:
+                self.full_handshakes += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return handshake counters and the number of cached sessions"""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "offered": self.offered,
+                "resumed": self.resumed,
+                "full_handshakes": self.full_handshakes,
+            }
+
+    def clear(self) -> None:
+        """Drop all cached sessions"""
+        with self._lock:
+            self._sessions.clear()
@@ -6,12 +6,21 @@ A command-line tool for making requests to GURT servers.
 """
 
 import argparse
+import os
 import sys
 import json
 import logging
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from gurt import GurtClient, GurtClientConfig, GurtError
+# Only what the argument parser needs is imported up front, so --help and
+# usage errors stay fast; each command imports the rest of gurt as it runs.
+from gurt.errors import GurtError
+from gurt.protocol import DEFAULT_PORT, DEFAULT_DOWNLOAD_CONNECTIONS, DEFAULT_SEGMENT_SIZE, DEFAULT_SEGMENT_RETRIES
+
+if TYPE_CHECKING:
+    from gurt.client import GurtClient, GurtClientConfig
+    from gurt.diskcache import DiskCacheStore
 
 
 def setup_logging(verbose: bool):
@@ -23,6 +32,56 @@ def setup_logging(verbose: bool):
     )
 
 
+def dns_server(value: str) -> Tuple[str, int]:
+    """Parse --dns-server IP[:PORT], so a bad value is a usage error"""
+    host, colon, port = value.partition(':')
+    if not host:
+        raise argparse.ArgumentTypeError(f"missing host in {value!r}")
+    if not colon:
+        return host, DEFAULT_PORT
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise argparse.ArgumentTypeError(f"invalid port in {value!r}, expected 1-65535")
+    return host, int(port)
+
+
+def create_config(args, **overrides) -> 'GurtClientConfig':
+    """Create a client configuration from the global command-line options"""
+    from gurt.client import GurtClientConfig
+    from gurt.cache import ResponseCache
+    from gurt.dns import GurtDNSResolver
+    
+    resolver = None
+    if args.dns_server:
+        host, port = args.dns_server
+        resolver = GurtDNSResolver(host, port)
+    
+    response_cache = None
+    if args.cache_dir:
+        response_cache = ResponseCache(open_cache_store(args))
+    
+    options = dict(
+        verify_tls=not args.insecure,
+        ca_bundle=args.ca_bundle,
+        request_timeout=args.timeout,
+        resolver=resolver,
+        response_cache=response_cache
+    )
+    options.update(overrides)
+    return GurtClientConfig(**options)
+
+
+def create_client(args) -> 'GurtClient':
+    """Create a client from the global command-line options"""
+    from gurt.client import GurtClient
+    return GurtClient(create_config(args))
+
+
+def open_cache_store(args) -> 'DiskCacheStore':
+    """Open the on-disk response cache named by --cache-dir"""
+    from gurt.diskcache import DiskCacheStore
+    return DiskCacheStore(args.cache_dir, max_bytes=int(args.cache_size * 1024 * 1024))
+
+
 def print_response(response, show_headers: bool = False, format_json: bool = False):
     """Print response in a formatted way"""
     print(f"Status: {response.status_code} {response.status_message}")
@@ -46,15 +105,22 @@ def print_response(response, show_headers: bool = False, format_json: bool = Fal
 
 def cmd_get(args):
     """Handle GET command"""
-    config = GurtClientConfig(
-        verify_tls=not args.insecure,
-        request_timeout=args.timeout
-    )
-    client = GurtClient(config)
+    client = create_client(args)
     
     try:
-        response = client.get(args.url)
-        print_response(response, args.headers, args.json)
+        if args.output:
+            with client.get(args.url, stream=True) as response:
+                print(f"Status: {response.status_code} {response.status_message}")
+                with open(args.output, 'wb') as f:
+                    for chunk in response.iter_content():
+                        f.write(chunk)
+            print(f"Saved to {args.output}")
+        else:
+            response = client.get(args.url)
+            print_response(response, args.headers, args.json)
+    except IOError as e:
+        print(f"Error writing file {args.output}: {e}", file=sys.stderr)
+        return 1
     except GurtError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
@@ -64,11 +130,7 @@ def cmd_get(args):
 
 def cmd_post(args):
     """Handle POST command"""
-    config = GurtClientConfig(
-        verify_tls=not args.insecure,
-        request_timeout=args.timeout
-    )
-    client = GurtClient(config)
+    client = create_client(args)
     
     # Prepare body
     body = ""
@@ -81,13 +143,19 @@ def cmd_post(args):
         body = args.data
         content_type = args.content_type or "text/plain"
     elif args.file:
+        content_type = args.content_type or "text/plain"
         try:
-            with open(args.file, 'r') as f:
-                body = f.read()
-            content_type = args.content_type or "text/plain"
+            # Stream the file instead of reading it into memory
+            with open(args.file, 'rb') as f:
+                response = client.post(args.url, f, content_type)
+            print_response(response, args.headers, args.json)
         except IOError as e:
             print(f"Error reading file {args.file}: {e}", file=sys.stderr)
             return 1
+        except GurtError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
     
     try:
         response = client.post(args.url, body, content_type)
@@ -101,11 +169,7 @@ def cmd_post(args):
 
 def cmd_put(args):
     """Handle PUT command"""
-    config = GurtClientConfig(
-        verify_tls=not args.insecure,
-        request_timeout=args.timeout
-    )
-    client = GurtClient(config)
+    client = create_client(args)
     
     # Prepare body
     body = ""
@@ -118,13 +182,19 @@ def cmd_put(args):
         body = args.data
         content_type = args.content_type or "text/plain"
     elif args.file:
+        content_type = args.content_type or "text/plain"
         try:
-            with open(args.file, 'r') as f:
-                body = f.read()
-            content_type = args.content_type or "text/plain"
+            # Stream the file instead of reading it into memory
+            with open(args.file, 'rb') as f:
+                response = client.put(args.url, f, content_type)
+            print_response(response, args.headers, args.json)
         except IOError as e:
             print(f"Error reading file {args.file}: {e}", file=sys.stderr)
             return 1
+        except GurtError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
     
     try:
         response = client.put(args.url, body, content_type)
@@ -138,11 +208,7 @@ def cmd_put(args):
 
 def cmd_delete(args):
     """Handle DELETE command"""
-    config = GurtClientConfig(
-        verify_tls=not args.insecure,
-        request_timeout=args.timeout
-    )
-    client = GurtClient(config)
+    client = create_client(args)
     
     try:
         response = client.delete(args.url)
@@ -156,11 +222,7 @@ def cmd_delete(args):
 
 def cmd_head(args):
     """Handle HEAD command"""
-    config = GurtClientConfig(
-        verify_tls=not args.insecure,
-        request_timeout=args.timeout
-    )
-    client = GurtClient(config)
+    client = create_client(args)
     
     try:
         response = client.head(args.url)
@@ -172,6 +234,142 @@ def cmd_head(args):
     return 0
 
 
+def cmd_cache(args):
+    """Handle cache command"""
+    if not args.cache_dir:
+        print("Error: --cache-dir is required for the cache command", file=sys.stderr)
+        return 1
+    
+    store = open_cache_store(args)
+    
+    if args.action == "purge":
+        entries = store.stats()["entries"]
+        store.clear()
+        print(f"Removed {entries} cached responses from {store.path}")
+        return 0
+    
+    stats = store.stats()
+    print(f"Cache directory: {store.path}")
+    print(f"Entries: {stats['entries']}")
+    print(f"Size: {stats['disk_size']:,} bytes (limit {store.max_bytes:,})")
+    if args.list:
+        for key in sorted(store.keys()):
+            print(f"  {key}")
+    
+    return 0
+
+
+def cmd_download(args):
+    """Handle download command"""
+    from urllib.parse import urlparse
+    from gurt.client import GurtClient
+    from gurt.download import STATE_SUFFIX
+    
+    output = args.output or os.path.basename(urlparse(args.url).path) or "index"
+    show_progress = sys.stderr.isatty() and not args.json
+    last_update = [0.0]
+    
+    def progress(received: int, size: int):
+        # Called from the download threads; a few updates per second are enough
+        now = time.monotonic()
+        if now - last_update[0] < 0.2 and received < size:
+            return
+        last_update[0] = now
+        percent = f" ({received * 100 // size}%)" if size else ""
+        print(f"\r{received / 1e6:.2f} / {size / 1e6:.2f} MB{percent}", end="", file=sys.stderr, flush=True)
+    
+    # Ranges are never cached, and every connection should stay in the pool
+    client = GurtClient(create_config(
+        args, response_cache=None, max_connections_per_host=max(args.connections, 1)
+    ))
+    
+    try:
+        result = client.download(
+            args.url, output, connections=args.connections,
+            segment_size=int(args.segment_size * 1024 * 1024), resume=not args.no_resume,
+            retries=args.retries, progress=progress if show_progress else None
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except (GurtError, OSError) as e:
+        if show_progress:
+            print(file=sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
+        if os.path.exists(output + STATE_SUFFIX):
+            print("Run the same command again to resume the download", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        client.close()
+    
+    if show_progress:
+        print(file=sys.stderr)
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+        return 0
+    
+    print(f"Downloaded {result.size / 1e6:.2f} MB to {output} in {result.elapsed:.2f}s "
+          f"({result.throughput / 1e6:.2f} MB/s)")
+    if result.ranged:
+        details = f"{result.segments} segments over {result.connections} connections, {result.retries} retries"
+        if result.resumed_bytes:
+            details += f", {result.resumed_bytes / 1e6:.2f} MB resumed"
+        print(f"  {details}")
+    else:
+        print("  Server does not support ranges; downloaded as a single stream")
+    return 0
+
+
+def cmd_bench(args):
+    """Handle bench command"""
+    from gurt.loadgen import LoadGenerator, format_report
+    
+    body = b""
+    content_type = args.content_type or "text/plain"
+    
+    if args.data:
+        body = args.data.encode('utf-8')
+    elif args.file:
+        try:
+            # Sent many times, so read once instead of streaming
+            with open(args.file, 'rb') as f:
+                body = f.read()
+        except IOError as e:
+            print(f"Error reading file {args.file}: {e}", file=sys.stderr)
+            return 1
+    
+    duration = args.duration
+    if duration is None and args.requests is None:
+        duration = 10.0
+    
+    # Measure the server, not the cache; verbose logging would dominate the run
+    config = create_config(args, response_cache=None)
+    if not args.verbose:
+        logging.getLogger("gurt").setLevel(logging.ERROR)
+    
+    try:
+        generator = LoadGenerator(
+            args.url, args.method, body, content_type,
+            concurrency=args.concurrency, duration=duration,
+            requests=args.requests, rate=args.rate, config=config
+        )
+        result = generator.run()
+    except (ValueError, GurtError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    
+    if args.json:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print("\n".join(format_report(result)))
+    
+    return 1 if result.requests and result.error_count == result.requests else 0
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -183,12 +381,20 @@ def main():
                        help="Enable verbose logging")
     parser.add_argument("--insecure", action="store_true",
                        help="Disable TLS certificate verification")
+    parser.add_argument("--ca-bundle", metavar="PEM",
+                       help="Trust the CA certificates in this file instead of the system store")
     parser.add_argument("--timeout", type=float, default=30.0,
                        help="Request timeout in seconds (default: 30)")
     parser.add_argument("--headers", action="store_true",
                        help="Show response headers")
     parser.add_argument("--json", action="store_true",
                        help="Format JSON responses")
+    parser.add_argument("--dns-server", metavar="IP[:PORT]", type=dns_server,
+                       help="Resolve domains through this Gurted DNS server")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                       help="Cache GET responses on disk in this directory")
+    parser.add_argument("--cache-size", type=float, default=256,
+                       help="Maximum size of the disk cache in MB (default: 256)")
     
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -196,6 +402,7 @@ def main():
     # GET command
     get_parser = subparsers.add_parser("get", help="Send a GET request")
     get_parser.add_argument("url", help="GURT URL to request")
+    get_parser.add_argument("-o", "--output", help="Stream the body to this file")
     get_parser.set_defaults(func=cmd_get)
     
     # POST command
@@ -230,6 +437,47 @@ def main():
     head_parser.add_argument("url", help="GURT URL to request")
     head_parser.set_defaults(func=cmd_head)
     
+    # CACHE command
+    cache_parser = subparsers.add_parser("cache", help="Inspect or purge the disk cache")
+    cache_parser.add_argument("action", choices=["info", "purge"], help="Action to perform")
+    cache_parser.add_argument("-l", "--list", action="store_true",
+                             help="List cached keys (info only)")
+    cache_parser.set_defaults(func=cmd_cache)
+    
+    # DOWNLOAD command
+    download_parser = subparsers.add_parser("download", help="Download a file using parallel byte ranges")
+    download_parser.add_argument("url", help="GURT URL to download")
+    download_parser.add_argument("-o", "--output",
+                                help="File to write (default: last part of the URL path)")
+    download_parser.add_argument("-c", "--connections", type=int, default=DEFAULT_DOWNLOAD_CONNECTIONS,
+                                help=f"Parallel connections (default: {DEFAULT_DOWNLOAD_CONNECTIONS})")
+    download_parser.add_argument("--segment-size", type=float, default=DEFAULT_SEGMENT_SIZE / (1024 * 1024),
+                                help=f"Size of each range request in MB (default: {DEFAULT_SEGMENT_SIZE // (1024 * 1024)})")
+    download_parser.add_argument("--retries", type=int, default=DEFAULT_SEGMENT_RETRIES,
+                                help=f"Retries per segment after a dropped connection (default: {DEFAULT_SEGMENT_RETRIES})")
+    download_parser.add_argument("--no-resume", action="store_true",
+                                help="Start over instead of resuming a partial download")
+    download_parser.set_defaults(func=cmd_download)
+    
+    # BENCH command
+    bench_parser = subparsers.add_parser("bench", help="Generate load against a URL and report latency")
+    bench_parser.add_argument("url", help="GURT URL to request")
+    bench_parser.add_argument("-c", "--concurrency", type=int, default=10,
+                             help="Concurrent requests, one connection each (default: 10)")
+    bench_parser.add_argument("-d", "--duration", type=float,
+                             help="Run for this many seconds (default: 10 unless -n is given)")
+    bench_parser.add_argument("-n", "--requests", type=int,
+                             help="Stop after this many requests")
+    bench_parser.add_argument("-r", "--rate", type=float,
+                             help="Target requests per second (open loop); default is as fast as possible")
+    bench_parser.add_argument("-m", "--method", default="GET", type=str.upper,
+                             choices=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
+                             help="Request method (default: GET)")
+    bench_parser.add_argument("--data", help="Request body data")
+    bench_parser.add_argument("-f", "--file", help="Read the request body from file")
+    bench_parser.add_argument("-t", "--content-type", help="Content-Type header")
+    bench_parser.set_defaults(func=cmd_bench)
+    
     # Parse arguments
     args = parser.parse_args()
     
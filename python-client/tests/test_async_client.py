@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio GURT client and its connection pool
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.async_client import AsyncGurtClient
+from gurt.client import GurtClientConfig
+from gurt.errors import GurtConnectionError, GurtTimeoutError
+from gurt.pool import AsyncConnectionPool
+from gurt.protocol import DEFAULT_PORT
+
+
+class TestAsyncGurtClient(unittest.TestCase):
+    """Test async client configuration"""
+    
+    def test_url_parsing(self):
+        """The async client shares URL parsing with the sync client"""
+        client = AsyncGurtClient()
+        
+        host, port, path = client._parse_gurt_url("gurt://example.com/search?q=test")
+        self.assertEqual(host, "example.com")
+        self.assertEqual(port, DEFAULT_PORT)
+        self.assertEqual(path, "/search?q=test")
+    
+    def test_ssl_context_creation(self):
+        """The async client uses the same TLS 1.3 context"""
+        client = AsyncGurtClient(GurtClientConfig(verify_tls=False))
+        self.assertEqual(client._ssl_context.minimum_version.name, "TLSv1_3")
+    
+    def test_send_timeout(self):
+        """A server that never reads the request body times out the send"""
+        class PlainClient(AsyncGurtClient):
+            async def _acquire_connection(self, host, port):
+                reader, writer = await asyncio.open_connection(host, port)
+                return reader, writer, False
+
+        async def scenario():
+            connections = []
+
+            async def handle(reader, writer):
+                connections.append(writer)  # Accepted, but nothing is ever read
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            client = PlainClient(GurtClientConfig(request_timeout=0.2, enable_connection_pooling=False))
+            try:
+                with self.assertRaises(GurtTimeoutError):
+                    await client.post(f"gurt://127.0.0.1:{port}/upload", b"x" * (64 * 1024 * 1024))
+            finally:
+                for writer in connections:
+                    writer.close()
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(asyncio.wait_for(scenario(), 10))
+
+    def test_post_not_resent_after_send(self):
+        """A POST on a pooled connection closed after the send is not sent again"""
+        class PooledClient(AsyncGurtClient):
+            reconnects = 0
+
+            async def _acquire_connection(self, host, port):
+                reader, writer = await asyncio.open_connection(host, port)
+                return reader, writer, True
+
+            async def _open_connection(self, host, port):
+                self.reconnects += 1
+                return await asyncio.open_connection(host, port)
+
+        async def scenario():
+            requests = []
+
+            async def handle(reader, writer):
+                requests.append(await reader.readuntil(b"\r\n\r\n"))
+                writer.close()  # Processed, but no response
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            client = PooledClient(GurtClientConfig(enable_connection_pooling=False))
+            try:
+                with self.assertRaises(GurtConnectionError):
+                    await client.post(f"gurt://127.0.0.1:{port}/orders", b"{}", "application/json")
+                await asyncio.sleep(0.05)
+                self.assertEqual((len(requests), client.reconnects), (1, 0))
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(asyncio.wait_for(scenario(), 10))
+
+    def test_pool_config(self):
+        """Pool settings come from the client configuration"""
+        client = AsyncGurtClient(GurtClientConfig(max_connections_per_host=3))
+        self.assertEqual(client._pool.max_connections_per_host, 3)
+        
+        client = AsyncGurtClient(GurtClientConfig(enable_connection_pooling=False))
+        self.assertIsNone(client._pool)
+
+
+class TestAsyncConnectionPool(unittest.TestCase):
+    """Test async connection reuse and eviction"""
+    
+    def _run(self, coro):
+        return asyncio.run(coro)
+    
+    async def _with_server(self, scenario):
+        server_writers = []
+        
+        async def handle(reader, writer):
+            server_writers.append(writer)
+        
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port, server_writers)
+        finally:
+            server.close()
+            await server.wait_closed()
+    
+    def test_reuse_live_connection(self):
+        """A released connection is handed out again"""
+        async def scenario(port, _):
+            pool = AsyncConnectionPool()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            
+            pool.release("127.0.0.1", port, reader, writer)
+            self.assertEqual(pool.idle_count("127.0.0.1", port), 1)
+            self.assertEqual(pool.acquire("127.0.0.1", port), (reader, writer))
+            self.assertIsNone(pool.acquire("127.0.0.1", port))
+            
+            writer.close()
+        
+        self._run(self._with_server(scenario))
+    
+    def test_closed_by_peer_is_discarded(self):
+        """A connection the server closed is not reused"""
+        async def scenario(port, server_writers):
+            pool = AsyncConnectionPool()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            pool.release("127.0.0.1", port, reader, writer)
+            
+            await asyncio.sleep(0.05)
+            server_writers[0].close()
+            await asyncio.sleep(0.05)
+            
+            self.assertIsNone(pool.acquire("127.0.0.1", port))
+        
+        self._run(self._with_server(scenario))
+    
+    def test_max_connections_per_host(self):
+        """Connections beyond the per-host limit are closed"""
+        async def scenario(port, _):
+            pool = AsyncConnectionPool(max_connections_per_host=1)
+            first = await asyncio.open_connection("127.0.0.1", port)
+            second = await asyncio.open_connection("127.0.0.1", port)
+            
+            pool.release("127.0.0.1", port, *first)
+            pool.release("127.0.0.1", port, *second)
+            
+            self.assertEqual(pool.idle_count("127.0.0.1", port), 1)
+            self.assertTrue(second[1].is_closing())
+            await pool.close()
+            self.assertTrue(first[1].is_closing())
+        
+        self._run(self._with_server(scenario))
+
+
+if __name__ == "__main__":
+    unittest.main()
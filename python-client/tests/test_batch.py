@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent batch requests
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.async_client import AsyncGurtClient
+from gurt.batch import BatchRequest, _Scheduler
+from gurt.client import GurtClient
+from gurt.message import GurtMethod, GurtResponse
+from gurt.errors import GurtConnectionError
+
+
+class RecordingClient(GurtClient):
+    """Client that answers requests locally and records concurrency per host"""
+
+    def __init__(self, config=None, delay=0.05):
+        super().__init__(config)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.peak_total = 0
+
+    def _send_request_internal(self, host, port, request, stream=False):
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+        try:
+            time.sleep(self.delay)
+            if host == "down.example":
+                raise GurtConnectionError("Connection refused")
+            if host == "bug.example":
+                raise RuntimeError("unexpected failure")
+            return GurtResponse.ok().with_body(f"{request.method.value} {request.path}".encode() + request.body)
+        finally:
+            with self.lock:
+                self.active[host] -= 1
+
+
+class TestScheduler(unittest.TestCase):
+    """Test the global and per-host limits"""
+
+    def test_limits(self):
+        """Requests start only while both limits allow it"""
+        scheduler = _Scheduler(max_concurrency=3, per_host_limit=2)
+        for index in range(4):
+            scheduler.add(index, ("a", 4878, "/"))
+        scheduler.add(4, ("b", 4878, "/"))
+
+        started = scheduler.startable()
+        self.assertEqual(sorted(index for index, _ in started), [0, 1, 4])
+        self.assertEqual(scheduler.startable(), [])
+
+        scheduler.finished(("a", 4878, "/"))
+        self.assertEqual([index for index, _ in scheduler.startable()], [2])
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            _Scheduler(max_concurrency=0, per_host_limit=1)
+
+
+class TestFetchMany(unittest.TestCase):
+    """Test the thread-pool batch API"""
+
+    def test_concurrency_and_per_host_limit(self):
+        """Requests overlap up to the limits and every item gets a result"""
+        client = RecordingClient()
+        urls = [f"gurt://a.example/{i}" for i in range(8)] + [f"gurt://b.example/{i}" for i in range(2)]
+
+        start = time.monotonic()
+        results = list(client.fetch_many(urls, max_concurrency=6, per_host_limit=4))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(result.index for result in results), list(range(10)))
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(client.peak["a.example"], 4)
+        self.assertLessEqual(client.peak_total, 6)
+        self.assertLess(elapsed, 10 * client.delay)
+
+    def test_failures_are_per_item(self):
+        """Invalid URLs and failed requests do not abort the batch"""
+        client = RecordingClient()
+        requests = [
+            "gurt://a.example/ok",
+            "http://a.example/wrong-scheme",
+            "gurt://down.example/",
+            BatchRequest("gurt://a.example/upload", GurtMethod.POST, "data"),
+        ]
+
+        results = list(client.fetch_many(requests, ordered=True))
+
+        self.assertEqual([result.index for result in results], [0, 1, 2, 3])
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertIsInstance(results[2].error, GurtConnectionError)
+        self.assertEqual(results[3].response.body, b"POST /uploaddata")
+
+    def test_malformed_url_and_unexpected_errors(self):
+        """Non-Gurt exceptions are recorded on their item like any other failure"""
+        client = RecordingClient(delay=0)
+        requests = ["gurt://a.example/1", "gurt://a.example:notaport/", "gurt://bug.example/", "gurt://a.example/2"]
+
+        results = list(client.fetch_many(requests, ordered=True))
+
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsInstance(results[2].error, RuntimeError)
+
+        async def run():
+            return [result async for result in AsyncGurtClient().fetch_many([requests[1]])]
+
+        self.assertIsInstance(asyncio.run(run())[0].error, ValueError)
+
+    def test_ordered_results(self):
+        """ordered=True yields results in input order even if they finish out of order"""
+        client = RecordingClient(delay=0)
+        results = list(client.fetch_many([f"gurt://h{i % 3}.example/{i}" for i in range(12)], ordered=True))
+        self.assertEqual([result.response.body for result in results],
+                         [f"GET /{i}".encode() for i in range(12)])
+
+
+class TestAsyncFetchMany(unittest.TestCase):
+    """Test the asyncio batch API"""
+
+    def test_async_batch(self):
+        """Requests run as concurrent tasks within the per-host limit"""
+        active = {"now": 0, "peak": 0}
+
+        class Client(AsyncGurtClient):
+            async def _send_request_internal(self, host, port, request):
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                await asyncio.sleep(0.01)
+                active["now"] -= 1
+                if host == "down.example":
+                    raise GurtConnectionError("Connection refused")
+                return GurtResponse.ok().with_body(request.path.encode())
+
+        async def run():
+            client = Client()
+            urls = [f"gurt://a.example/{i}" for i in range(6)] + ["gurt://down.example/"]
+            return [result async for result in client.fetch_many(urls, per_host_limit=3, ordered=True)]
+
+        results = asyncio.run(run())
+
+        self.assertEqual([result.index for result in results], list(range(7)))
+        self.assertEqual(results[5].response.body, b"/5")
+        self.assertFalse(results[6].ok)
+        self.assertEqual(active["peak"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark harness
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import bench_message
+from benchmarks.harness import (
+    Result, HIGHER, LOWER, compare, load_results, percentiles, time_function, write_results
+)
+
+
+class TestHarness(unittest.TestCase):
+    """Test timing, result files and baseline comparison"""
+
+    def test_time_function(self):
+        calls = []
+        timing = time_function(lambda: calls.append(1), min_time=0.01, repeat=3)
+
+        self.assertGreater(timing["loops"], 1)
+        self.assertLessEqual(timing["best"], timing["median"])
+        self.assertGreaterEqual(len(calls), timing["loops"] * 3)
+
+    def test_percentiles(self):
+        stats = percentiles([i / 1000 for i in range(1, 101)])
+        self.assertEqual(stats["p50"], 0.050)
+        self.assertEqual(stats["p99"], 0.099)
+        self.assertEqual(stats["max"], 0.100)
+
+    def test_compare_flags_regressions(self):
+        baseline_results = [
+            Result("micro", "micro", {"best": 1.0}, {"best": LOWER}),
+            Result("e2e", "e2e", {"rps": 1000.0, "p99": 0.01}, {"rps": HIGHER, "p99": LOWER}),
+            Result("removed", "micro", {"best": 1.0}, {"best": LOWER}),
+        ]
+        current = [
+            Result("micro", "micro", {"best": 1.05}, {"best": LOWER}),
+            Result("e2e", "e2e", {"rps": 800.0, "p99": 0.005}, {"rps": HIGHER, "p99": LOWER}),
+            Result("new", "micro", {"best": 1.0}, {"best": LOWER}),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            write_results(path, baseline_results)
+            with open(path) as f:
+                self.assertIn("python", json.load(f)["environment"])
+            comparisons = compare(load_results(path), current, threshold=0.1)
+
+        changes = {(c.name, c.metric): c for c in comparisons}
+        self.assertEqual(len(changes), 3)
+        self.assertFalse(changes[("micro", "best")].regression)
+        self.assertTrue(changes[("e2e", "rps")].regression)
+        self.assertTrue(changes[("e2e", "p99")].improvement)
+
+    def test_micro_cases_run(self):
+        results = bench_message.run(quick=True, selected=lambda name: name.startswith("handshake."))
+        self.assertEqual([r.name for r in results],
+                         ["handshake.request", "handshake.parse", "handshake.read_response", "handshake.cached"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Tests for the GURT response cache
+"""
+
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.cache import CacheEntry, MemoryCacheStore, ResponseCache, parse_cache_control
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.compression import compress
+from gurt.message import GurtRequest, GurtResponse, GurtMethod
+from gurt.protocol import GurtStatusCode
+
+
+def make_entry(body=b"body", **headers):
+    return CacheEntry(200, "OK", {k.replace("_", "-"): v for k, v in headers.items()}, body)
+
+
+class FakeServer:
+    """Answers requests with scripted responses and records what was sent"""
+
+    def __init__(self, cache_control="max-age=60", etag='"v1"', vary=None):
+        self.cache_control = cache_control
+        self.etag = etag
+        self.vary = vary
+        self.requests = []
+
+    def __call__(self, host, port, request, stream=False):
+        self.requests.append(request)
+        if self.etag and request.get_header("if-none-match") == self.etag:
+            response = GurtResponse(GurtStatusCode.NOT_MODIFIED)
+        else:
+            response = GurtResponse.ok().with_body(f"body {len(self.requests)}")
+        if self.cache_control:
+            response.with_header("cache-control", self.cache_control)
+        if self.etag:
+            response.with_header("etag", self.etag)
+        if self.vary:
+            response.with_header("vary", self.vary)
+        return response
+
+
+class TestCacheEntry(unittest.TestCase):
+    """Test freshness calculations"""
+
+    def test_parse_cache_control(self):
+        directives = parse_cache_control('max-age=60, No-Store, private="x"')
+        self.assertEqual(directives, {"max-age": "60", "no-store": None, "private": "x"})
+
+    def test_max_age(self):
+        entry = make_entry(cache_control="max-age=60")
+        self.assertEqual(entry.freshness_lifetime(), 60)
+        self.assertTrue(entry.is_fresh())
+
+        entry.stored_at -= 61
+        self.assertFalse(entry.is_fresh())
+
+    def test_no_cache_and_expires(self):
+        self.assertEqual(make_entry(cache_control="no-cache, max-age=60").freshness_lifetime(), 0)
+
+        entry = make_entry(date="Mon, 01 Jan 2024 00:00:00 GMT", expires="Mon, 01 Jan 2024 00:10:00 GMT")
+        self.assertEqual(entry.freshness_lifetime(), 600)
+
+    def test_heuristic_freshness(self):
+        entry = make_entry(date="Thu, 11 Jan 2024 00:00:00 GMT", last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertEqual(entry.freshness_lifetime(), 24 * 60 * 60)
+
+    def test_stale_while_revalidate(self):
+        entry = make_entry(cache_control="max-age=10, stale-while-revalidate=30")
+        entry.stored_at -= 20
+        self.assertFalse(entry.is_fresh())
+        self.assertTrue(entry.can_serve_stale())
+
+        entry = make_entry(cache_control="max-age=10, stale-while-revalidate=30, must-revalidate")
+        entry.stored_at -= 20
+        self.assertFalse(entry.can_serve_stale())
+
+
+class TestMemoryCacheStore(unittest.TestCase):
+    """Test the size-bounded LRU store"""
+
+    def test_lru_eviction_by_size(self):
+        store = MemoryCacheStore(max_bytes=250)
+        for key in ("a", "b"):
+            store.put(key, make_entry(b"x" * 100))
+
+        store.get("a")
+        store.put("c", make_entry(b"x" * 100))
+
+        self.assertIsNotNone(store.get("a"))
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.stats(), {"entries": 2, "size": 200, "evictions": 1})
+
+    def test_oversized_entry_not_stored(self):
+        store = MemoryCacheStore(max_bytes=10)
+        store.put("a", make_entry(b"x" * 100))
+        self.assertIsNone(store.get("a"))
+
+
+class TestClientCaching(unittest.TestCase):
+    """Test the cache wired into GurtClient"""
+
+    def _client(self, server, cache=None):
+        cache = cache or ResponseCache()
+        client = GurtClient(GurtClientConfig(response_cache=cache, enable_connection_pooling=False))
+        client._send_uncached = server
+        return client, cache
+
+    def test_fresh_hit(self):
+        """Fresh responses are served without touching the network"""
+        server = FakeServer()
+        client, cache = self._client(server)
+
+        first = client.get("gurt://example.com/app.lua")
+        second = client.get("gurt://example.com/app.lua")
+
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(second.body, first.body)
+        self.assertEqual(second.get_header("age"), "0")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_compressed_response(self):
+        """A gzip response is cached decoded, with headers that describe the stored body"""
+        body = b"cached page " * 500
+        compressed = compress(body, "gzip")
+        requests = []
+
+        def server(host, port, request, stream=False):
+            requests.append(request)
+            response = (GurtResponse.ok().with_body(compressed)
+                        .with_header("content-encoding", "gzip")
+                        .with_header("content-length", str(len(compressed)))
+                        .with_header("cache-control", "max-age=60"))
+            client._decode_content(response)  # What _exchange does with a network response
+            return response
+
+        client, cache = self._client(server)
+        first = client.get("gurt://example.com/page.html")
+        second = client.get("gurt://example.com/page.html")
+
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(first.body, body)
+        self.assertEqual(second.body, body)
+        self.assertIsNone(second.get_header("content-encoding"))
+        self.assertEqual(second.get_header("content-length"), str(len(body)))
+
+    def test_revalidation(self):
+        """Stale entries are revalidated with if-none-match and a 304 keeps the body"""
+        server = FakeServer(cache_control="no-cache")
+        client, cache = self._client(server)
+
+        client.get("gurt://example.com/index.html")
+        response = client.get("gurt://example.com/index.html")
+
+        self.assertEqual(server.requests[1].get_header("if-none-match"), '"v1"')
+        self.assertEqual(response.status_code, GurtStatusCode.OK)
+        self.assertEqual(response.body, b"body 1")
+        self.assertEqual(cache.stats()["revalidations"], 1)
+
+    def test_cached_body_cannot_be_changed(self):
+        """Editing a response body does not change what later hits return"""
+        def server(host, port, request, stream=False):
+            # The sync client reads bodies into a bytearray
+            return GurtResponse.ok().with_body(bytearray(b"hello")).with_header("cache-control", "max-age=60")
+
+        client, cache = self._client(server)
+        first = client.get("gurt://example.com/greeting")
+        first.body[0:1] = b"J"
+        second = client.get("gurt://example.com/greeting")
+
+        self.assertEqual(second.body, b"hello")
+        with self.assertRaises(TypeError):
+            second.body[0:1] = b"J"
+
+    def test_conditional_request_is_a_copy(self):
+        """Validators go on a copy; the caller's request is not changed"""
+        server = FakeServer(cache_control="no-cache")
+        client, cache = self._client(server)
+        client.get("gurt://example.com/index.html")
+
+        request = GurtRequest(GurtMethod.GET, "/index.html")
+        entry = cache.lookup("gurt://example.com:4878/index.html", request)
+        conditional = cache.make_conditional(request, entry)
+
+        self.assertEqual(conditional.get_header("if-none-match"), '"v1"')
+        self.assertIsNone(request.get_header("if-none-match"))
+        self.assertNotIn("if-none-match", request.head_bytes().decode().lower())
+
+    def test_no_store(self):
+        server = FakeServer(cache_control="no-store")
+        client, cache = self._client(server)
+
+        client.get("gurt://example.com/")
+        client.get("gurt://example.com/")
+
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_stale_while_revalidate(self):
+        """A stale entry is returned immediately while a background refresh runs"""
+        server = FakeServer(cache_control="max-age=0, stale-while-revalidate=60", etag=None)
+        client, cache = self._client(server)
+
+        client.get("gurt://example.com/style.css")
+        response = client.get("gurt://example.com/style.css")
+        self.assertEqual(response.body, b"body 1")
+
+        for _ in range(100):
+            if len(server.requests) == 2 and not cache._refreshing:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(client.get("gurt://example.com/style.css").body, b"body 2")
+        self.assertEqual(cache.stats()["stale_hits"], 2)
+
+    def test_vary(self):
+        """Responses are keyed by the request headers named in vary"""
+        server = FakeServer(vary="accept-language")
+        cache = ResponseCache()
+        url = "gurt://example.com:4878/"
+
+        def fetch(language):
+            request = GurtRequest(GurtMethod.GET, "/").with_header("Accept-Language", language)
+            entry = cache.lookup(url, request)
+            if entry is not None:
+                return cache.hit(entry)
+            return cache.finish(url, request, server("example.com", 4878, request), entry)
+
+        self.assertEqual(fetch("en").body, b"body 1")
+        self.assertEqual(fetch("fr").body, b"body 2")
+        self.assertEqual(fetch("fr").body, b"body 2")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_unsafe_method_invalidates(self):
+        server = FakeServer()
+        client, cache = self._client(server)
+
+        client.get("gurt://example.com/data")
+        client.put("gurt://example.com/data", "new")
+        client.get("gurt://example.com/data")
+
+        self.assertEqual(len(server.requests), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
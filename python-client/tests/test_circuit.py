@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-host circuit breaker
+"""
+
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.circuit import CircuitBreaker, CircuitState
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.message import GurtResponse
+from gurt.protocol import GurtStatusCode
+from gurt.errors import GurtCircuitOpenError, GurtConnectionError, GurtProtocolError
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test state transitions"""
+
+    def _fail(self, breaker, times, host="example.com"):
+        for _ in range(times):
+            breaker.before_request(host, 4878)
+            breaker.record(host, 4878, error=GurtConnectionError("refused"))
+
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker(failure_rate=0.5, minimum_requests=4)
+
+        for _ in range(2):
+            breaker.before_request("example.com", 4878)
+            breaker.record("example.com", 4878, response=GurtResponse.ok())
+        self._fail(breaker, 1)
+        self.assertEqual(breaker.state("example.com", 4878), CircuitState.CLOSED)
+
+        self._fail(breaker, 1)
+        self.assertEqual(breaker.state("example.com", 4878), CircuitState.OPEN)
+        with self.assertRaises(GurtCircuitOpenError):
+            breaker.before_request("example.com", 4878)
+
+        # Other hosts are unaffected
+        breaker.before_request("other.example", 4878)
+
+    def test_failure_statuses(self):
+        breaker = CircuitBreaker(minimum_requests=1)
+        self.assertTrue(breaker.is_failure(GurtResponse(GurtStatusCode.SERVICE_UNAVAILABLE)))
+        self.assertFalse(breaker.is_failure(GurtResponse(GurtStatusCode.NOT_FOUND)))
+        self.assertFalse(breaker.is_failure(error=GurtProtocolError("bad")))
+
+    def test_half_open_probe_closes(self):
+        changes = []
+        breaker = CircuitBreaker(minimum_requests=1, reset_timeout=0.05,
+                                 on_state_change=lambda host, port, old, new: changes.append(new))
+        self._fail(breaker, 1)
+
+        time.sleep(0.06)
+        breaker.before_request("example.com", 4878)
+        self.assertEqual(breaker.state("example.com", 4878), CircuitState.HALF_OPEN)
+
+        # Only one probe at a time
+        with self.assertRaises(GurtCircuitOpenError):
+            breaker.before_request("example.com", 4878)
+
+        breaker.record("example.com", 4878, response=GurtResponse.ok())
+        self.assertEqual(breaker.state("example.com", 4878), CircuitState.CLOSED)
+        self.assertEqual(changes, [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED])
+
+    def test_half_open_probe_failure_reopens(self):
+        breaker = CircuitBreaker(minimum_requests=1, reset_timeout=0.05)
+        self._fail(breaker, 1)
+
+        time.sleep(0.06)
+        self._fail(breaker, 1)
+
+        self.assertEqual(breaker.state("example.com", 4878), CircuitState.OPEN)
+        self.assertEqual(breaker.stats()["example.com:4878"]["times_opened"], 2)
+
+
+class TestClientCircuitBreaker(unittest.TestCase):
+    """Test fast failure in GurtClient"""
+
+    def test_fail_fast_without_sending(self):
+        calls = []
+
+        def send_once(host, port, request, stream=False):
+            calls.append(request.path)
+            raise GurtConnectionError("Connection timeout")
+
+        breaker = CircuitBreaker(minimum_requests=2)
+        client = GurtClient(GurtClientConfig(circuit_breaker=breaker))
+        client._send_once = send_once
+
+        for _ in range(2):
+            with self.assertRaises(GurtConnectionError):
+                client.get("gurt://example.com/")
+        with self.assertRaises(GurtCircuitOpenError):
+            client.get("gurt://example.com/")
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(client.circuit_state("gurt://example.com/"), CircuitState.OPEN)
+        self.assertEqual(breaker.stats()["example.com:4878"]["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,15 +4,20 @@ Tests for GURT client URL parsing and configuration
 """
 
 import unittest
+import socket
+import subprocess
+import threading
 import sys
 import os
 
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from gurt.client import GurtClient, GurtClientConfig
+from gurt.client import GurtClient, GurtClientConfig, _send_buffers
+from gurt.async_client import AsyncGurtClient
+from gurt.tls import client_context, clear_context_cache
 from gurt.protocol import DEFAULT_PORT
-from gurt.errors import GurtError
+from gurt.errors import GurtError, GurtConnectionError
 
 
 class TestGurtClient(unittest.TestCase):
@@ -92,6 +97,129 @@ class TestGurtClient(unittest.TestCase):
         # Should be configured for TLS 1.3
         self.assertEqual(client._ssl_context.minimum_version.name, "TLSv1_3")
         self.assertEqual(client._ssl_context.maximum_version.name, "TLSv1_3")
+    
+    def test_ssl_context_shared(self):
+        """Clients with the same TLS settings share one context, and the warning is logged once"""
+        clear_context_cache()
+        with self.assertLogs("gurt.tls", "WARNING") as logs:
+            first = GurtClient(GurtClientConfig(verify_tls=False))
+        with self.assertNoLogs("gurt.tls", "WARNING"):
+            second = GurtClient(GurtClientConfig(verify_tls=False, request_timeout=1))
+            async_client = AsyncGurtClient(GurtClientConfig(verify_tls=False))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIs(first._ssl_context, second._ssl_context)
+        self.assertIs(first._ssl_context, async_client._ssl_context)
+        
+        verified = GurtClient(GurtClientConfig(verify_tls=True))
+        self.assertIsNot(verified._ssl_context, first._ssl_context)
+        self.assertTrue(verified._ssl_context.check_hostname)
+        self.assertIsNot(client_context(True, alpn=["other"]), verified._ssl_context)
+        
+        clear_context_cache()
+        self.assertIsNot(GurtClient(GurtClientConfig(verify_tls=True))._ssl_context, verified._ssl_context)
+    
+    def test_package_imports_lazily(self):
+        """Importing the sync client does not load asyncio or the server"""
+        code = (
+            "import sys, gurt\n"
+            "from gurt import GurtClient, GurtError\n"
+            "print(sorted(m for m in ('asyncio', 'gurt.server', 'gurt.async_client') if m in sys.modules))\n"
+            "print(all(getattr(gurt, name) is not None for name in gurt.__all__))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.stdout.split(), ["[]", "True"])
+
+    
+    def test_read_response_into_preallocated_body(self):
+        """Responses are read incrementally with the configured chunk size"""
+        client = GurtClient(GurtClientConfig(read_chunk_size=7))
+        body = bytes(range(256)) * 40
+        raw = f"GURT/1.0.0 200 OK\r\ncontent-length: {len(body)}\r\n\r\n".encode() + body
+        
+        local, remote = socket.socketpair()
+        try:
+            writer = threading.Thread(target=remote.sendall, args=(raw,))
+            writer.start()
+            response = client._read_response(local)
+            writer.join()
+        finally:
+            local.close()
+            remote.close()
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.body, bytearray)
+        self.assertEqual(response.body, body)
+
+    
+    def test_send_buffers_scatter_gather(self):
+        """Separate buffers arrive in order as one stream"""
+        head = b"POST / GURT/1.0.0\r\ncontent-length: 300000\r\n\r\n"
+        body = memoryview(os.urandom(300000))
+        received = bytearray()
+        
+        local, remote = socket.socketpair()
+        try:
+            def reader():
+                while len(received) < len(head) + len(body):
+                    received.extend(remote.recv(65536))
+            
+            thread = threading.Thread(target=reader)
+            thread.start()
+            _send_buffers(local, [head, body])
+            thread.join()
+        finally:
+            local.close()
+            remote.close()
+        
+        self.assertEqual(bytes(received), head + body.tobytes())
+
+
+
+class _ClosedAfterSend:
+    """A pooled connection whose server reads the request and then closes it"""
+    
+    def settimeout(self, timeout):
+        pass
+    
+    def recv_into(self, buffer, nbytes=0):
+        return 0
+    
+    def close(self):
+        pass
+
+
+class StaleConnectionClient(GurtClient):
+    """Every connection is closed by the server once the request has been sent"""
+    
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+    
+    def _acquire_connection(self, host, port, trace=None):
+        return _ClosedAfterSend(), True
+    
+    def _open_connection(self, host, port, trace=None):
+        return _ClosedAfterSend()
+    
+    def _send_request(self, sock, request):
+        self.sent.append(request.method.value)
+
+
+class TestStaleConnections(unittest.TestCase):
+    """Test what is sent again after a pooled connection turns out to be closed"""
+    
+    def test_post_not_resent_after_send(self):
+        client = StaleConnectionClient()
+        with self.assertRaises(GurtConnectionError):
+            client.post("gurt://example.real/orders", b'{"id": 1}', "application/json")
+        self.assertEqual(client.sent, ["POST"])
+    
+    def test_idempotent_resent_once(self):
+        client = StaleConnectionClient()
+        with self.assertRaises(GurtConnectionError):
+            client.get("gurt://example.real/orders")
+        self.assertEqual(client.sent, ["GET", "GET"])
 
 
 if __name__ == "__main__":
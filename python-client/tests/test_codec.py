@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for JSON codecs and streaming JSON array decoding
+"""
+
+import io
+import json
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.codec import JSONCodec, StdlibJSONCodec, OrjsonCodec, iter_json_items
+from gurt.message import GurtRequest, GurtResponse, GurtMethod
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LISTING = {
+    "page": 1,
+    "domains": [{"name": f"site{i}", "tld": "web", "note": "é" * (i % 3), "score": i / 4} for i in range(200)],
+    "limit": 15,
+}
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class CountingCodec(StdlibJSONCodec):
+    """Counts calls so tests can see which codec was used"""
+
+    name = "counting"
+
+    def __init__(self):
+        super().__init__()
+        self.dumped = 0
+        self.loaded = 0
+
+    def dumps(self, data):
+        self.dumped += 1
+        return super().dumps(data)
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+class TestCodecs(unittest.TestCase):
+    """Test encoding to bytes and decoding from buffers"""
+
+    def _round_trip(self, codec: JSONCodec):
+        encoded = codec.dumps(LISTING)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(json.loads(encoded), LISTING)
+        for data in (encoded, bytearray(encoded), memoryview(b"xx" + encoded)[2:], encoded.decode('utf-8')):
+            self.assertEqual(codec.loads(data), LISTING)
+
+    def test_stdlib(self):
+        codec = StdlibJSONCodec()
+        self._round_trip(codec)
+        self.assertEqual(codec.dumps({"a": [1, 2]}), b'{"a":[1,2]}')
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson(self):
+        self._round_trip(OrjsonCodec())
+
+    def test_response_json_memoized(self):
+        codec = CountingCodec()
+        response = GurtResponse.ok().with_json_body(LISTING, codec=codec)
+        response.body = memoryview(response.body)
+        response.codec = codec
+
+        self.assertIs(response.json(), response.json())
+        self.assertEqual(response.json(), LISTING)
+        self.assertEqual((codec.dumped, codec.loaded), (1, 1))
+
+        response.body = b"[1]"
+        self.assertEqual(response.json(), [1])
+
+    def test_request_json_body(self):
+        request = GurtRequest(GurtMethod.POST, "/resolve").with_json_body({"domain": "example.real"})
+        self.assertEqual(json.loads(request.body), {"domain": "example.real"})
+        self.assertEqual(request.headers["content-type"], "application/json")
+
+
+class CodecClient(GurtClient):
+    """Answers every request with the JSON body it was sent"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.sent = []
+
+    def _send_cached(self, host, port, request, stream=False):
+        self.sent.append(request)
+        return GurtResponse.ok().with_body(bytes(request.body))
+
+
+class TestClientCodec(unittest.TestCase):
+    """Test the json_codec client setting"""
+
+    def test_configured_codec(self):
+        codec = CountingCodec()
+        client = CodecClient(GurtClientConfig(json_codec=codec))
+
+        response = client.post_json("gurt://example.real/echo", {"id": 1})
+        self.assertEqual(client.sent[0].headers["content-type"], "application/json")
+        self.assertIs(response.codec, codec)
+        self.assertEqual(response.json(), {"id": 1})
+        self.assertEqual((codec.dumped, codec.loaded), (1, 1))
+
+    def test_default_codec(self):
+        client = CodecClient(GurtClientConfig())
+        response = client.post_json("gurt://example.real/echo", [1, "two"])
+        self.assertIsNone(response.codec)
+        self.assertEqual(response.json(), [1, "two"])
+        self.assertIsInstance(client.json_codec, StdlibJSONCodec)  # orjson only when selected
+
+
+class TestIterJsonItems(unittest.TestCase):
+    """Test incremental decoding of JSON arrays"""
+
+    def test_chunk_sizes(self):
+        for indent in (None, 2):
+            data = json.dumps(LISTING, indent=indent).encode('utf-8')
+            for size in (1, 3, 64, 4096, len(data)):
+                with self.subTest(indent=indent, size=size):
+                    items = list(iter_json_items(_chunks(data, size), "domains"))
+                    self.assertEqual(items, LISTING["domains"])
+
+    def test_values_split_across_chunks(self):
+        self.assertEqual(list(iter_json_items([b"[1", b"2, 3", b"4", b"]"])), [12, 34])
+        self.assertEqual(list(iter_json_items([b'["\xc3', b'\xa9", tr', b"ue]"])), ["é", True])
+        self.assertEqual(list(iter_json_items([b" [ ", b"] "])), [])
+
+    def test_nested_path(self):
+        data = b'{"meta": {"n": [1, 2]}, "result": {"skip": {}, "items": [[1], {"a": null}]}}'
+        self.assertEqual(list(iter_json_items(_chunks(data, 5), ("result", "items"))), [[1], {"a": None}])
+
+    def test_stops_after_array(self):
+        def chunks():
+            yield b'{"domains": ["a", "b"], "rest": '
+            raise AssertionError("read past the array")
+
+        self.assertEqual(list(iter_json_items(chunks(), "domains")), ["a", "b"])
+
+    def test_malformed(self):
+        for data in (b"", b'{"a": 1}', b"[1,", b"[1 2]", b"[1,]", b'[{"a": }]', b"[tru"):
+            with self.subTest(data=data):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_items(_chunks(data, 2)))
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_items([b'{"a": []}'], "domains"))
+
+    def test_response_iter_json(self):
+        data = json.dumps(LISTING).encode('utf-8')
+
+        response = GurtResponse.ok().with_body(data)
+        self.assertEqual(list(response.iter_json("domains")), LISTING["domains"])
+
+        streamed = GurtResponse.ok()
+        streamed.raw = io.BytesIO(data)
+        self.assertEqual(list(streamed.iter_json("domains", chunk_size=100)), LISTING["domains"])
+        self.assertIsNone(streamed.raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for content-encoding negotiation and decompression
+"""
+
+import gzip
+import io
+import os
+import unittest
+import sys
+import zlib
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.compression import (
+    CompressionStats, ContentDecoder, DecodingStream,
+    choose_encoding, compress, decode_response, is_compressible, supported_encodings
+)
+from gurt.message import GurtResponse
+from gurt.errors import GurtProtocolError
+
+TEXT = b"".join(b"line %d of a fairly repetitive document\n" % i for i in range(2000))
+
+
+def _decode(encoding: str, data: bytes, max_size: int = 10 * 1024 * 1024, chunk: int = 0) -> bytes:
+    decoder = ContentDecoder(encoding, max_size)
+    chunks = [data[i:i + chunk] for i in range(0, len(data), chunk)] if chunk else [data]
+    output = b"".join(decoder.decode(piece) for piece in chunks)
+    decoder.finish()
+    return output
+
+
+class TestCodings(unittest.TestCase):
+    """Test compressing and decoding whole and chunked bodies"""
+
+    def test_round_trips(self):
+        for encoding in supported_encodings():
+            compressed = compress(TEXT, encoding)
+            self.assertLess(len(compressed), len(TEXT) // 5)
+            for chunk in (0, 1, 100):
+                with self.subTest(encoding=encoding, chunk=chunk):
+                    self.assertEqual(_decode(encoding, compressed, chunk=chunk), TEXT)
+
+    def test_interoperable_formats(self):
+        self.assertEqual(_decode("gzip", gzip.compress(TEXT)), TEXT)
+        self.assertEqual(_decode("deflate", zlib.compress(TEXT)), TEXT)
+        raw = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.assertEqual(_decode("deflate", raw.compress(TEXT) + raw.flush()), TEXT)
+        # Codings are undone in the reverse of the order they are listed
+        self.assertEqual(_decode("deflate, gzip", gzip.compress(zlib.compress(TEXT))), TEXT)
+        self.assertEqual(_decode("identity", TEXT), TEXT)
+
+    def test_deflate_header_split_across_reads(self):
+        raw = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        for data in (zlib.compress(TEXT), raw.compress(TEXT) + raw.flush()):
+            decoder = ContentDecoder("deflate", len(TEXT))
+            output = decoder.decode(data[:1]) + decoder.decode(b"") + decoder.decode(data[1:])
+            decoder.finish()
+            self.assertEqual(output, TEXT)
+        with self.assertRaises(GurtProtocolError):
+            _decode("deflate", zlib.compress(TEXT)[:1])
+
+    def test_errors(self):
+        compressed = compress(TEXT, "gzip")
+        with self.assertRaises(GurtProtocolError):
+            ContentDecoder("compress", 1024)
+        with self.assertRaises(GurtProtocolError):
+            _decode("gzip", b"not gzip at all")
+        with self.assertRaises(GurtProtocolError):
+            _decode("gzip", compressed[:-20])
+        with self.assertRaises(GurtProtocolError):
+            _decode("gzip", compressed, max_size=len(TEXT) - 1)
+        with self.assertRaises(GurtProtocolError):
+            _decode("gzip", compressed, max_size=len(TEXT) - 1, chunk=50)
+        self.assertEqual(_decode("gzip", compressed, max_size=len(TEXT)), TEXT)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(choose_encoding("deflate;q=0.5, gzip;q=0"), "deflate")
+        self.assertEqual(choose_encoding("*"), supported_encodings()[0])
+        self.assertEqual(choose_encoding("*, gzip;q=0, deflate;q=0"),
+                         None if supported_encodings() == ["gzip", "deflate"] else supported_encodings()[0])
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding(None))
+
+    def test_is_compressible(self):
+        for content_type in ("text/html; charset=utf-8", "application/json", "application/ld+json", "image/svg+xml"):
+            self.assertTrue(is_compressible(content_type), content_type)
+        for content_type in ("image/png", "application/octet-stream", "application/zip", None):
+            self.assertFalse(is_compressible(content_type), content_type)
+
+
+class TestResponseDecoding(unittest.TestCase):
+    """Test decoding attached to responses"""
+
+    def test_lazy_body(self):
+        stats = CompressionStats()
+        compressed = compress(TEXT, "gzip")
+        response = GurtResponse.ok().with_body(compressed)
+        decode_response(response, "gzip", len(TEXT), stats)
+
+        self.assertEqual(stats.snapshot()["received_compressed"], 0)  # Nothing is decoded until used
+        self.assertEqual(response.text(), TEXT.decode())
+        self.assertEqual(response.body, TEXT)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["received_compressed"], 1)
+        self.assertEqual(snapshot["received_bytes_compressed"], len(compressed))
+        self.assertAlmostEqual(snapshot["received_ratio"], len(TEXT) / len(compressed))
+
+    def test_client_decoded_size_limit(self):
+        response = GurtResponse.ok().with_body(compress(b"\0" * 2_000_000, "gzip"))
+        response.headers["content-encoding"] = "gzip"
+        client = GurtClient(GurtClientConfig(max_decoded_size=1_000_000))
+        client._decode_content(response)
+        with self.assertRaises(GurtProtocolError):
+            response.body
+
+    def test_unsupported_coding_left_alone(self):
+        response = GurtResponse.ok().with_body(b"opaque")
+        decode_response(response, "x-custom", 1024)
+        self.assertEqual(response.body, b"opaque")
+
+    def test_stream(self):
+        stats = CompressionStats()
+        response = GurtResponse.ok()
+        response.raw = io.BytesIO(compress(TEXT, "deflate"))
+        decode_response(response, "deflate", len(TEXT), stats)
+
+        self.assertIsInstance(response.raw, DecodingStream)
+        self.assertEqual(b"".join(response.iter_content(chunk_size=333)), TEXT)
+        self.assertEqual(stats.snapshot()["received_bytes_uncompressed"], len(TEXT))
+
+    def test_stream_truncated(self):
+        stream = DecodingStream(io.BytesIO(compress(TEXT, "gzip")[:100]), ContentDecoder("gzip", len(TEXT)),
+                                chunk_size=16)
+        with self.assertRaises(GurtProtocolError):
+            stream.read()
+
+
+class CompressionClient(GurtClient):
+    """Records requests instead of sending them"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.sent = []
+
+    def _send_cached(self, host, port, request, stream=False):
+        self.sent.append(request)
+        return GurtResponse.ok()
+
+
+class TestRequestCompression(unittest.TestCase):
+    """Test the client's request body compression"""
+
+    def test_accept_encoding(self):
+        client = CompressionClient(GurtClientConfig())
+        client.get("gurt://example.real/")
+        self.assertEqual(client.sent[0].headers["accept-encoding"], ", ".join(supported_encodings()))
+
+        client = CompressionClient(GurtClientConfig(enable_compression=False))
+        client.get("gurt://example.real/")
+        self.assertNotIn("accept-encoding", client.sent[0].headers)
+
+    def test_off_by_default(self):
+        client = CompressionClient(GurtClientConfig())
+        client.post("gurt://example.real/", TEXT, content_type="text/plain")
+        self.assertNotIn("content-encoding", client.sent[0].headers)
+
+    def test_threshold_and_types(self):
+        client = CompressionClient(GurtClientConfig(compress_requests_min_size=1024))
+        url = "gurt://example.real/upload"
+        client.post(url, TEXT, content_type="text/plain")
+        client.post(url, TEXT[:1000], content_type="text/plain")
+        client.post(url, TEXT, content_type="image/png")
+        client.post(url, os.urandom(4096))  # Left alone when compression does not help
+        client.post(url, io.BytesIO(TEXT), content_type="text/plain", content_length=len(TEXT))
+
+        encodings = [request.get_header("content-encoding") for request in client.sent]
+        self.assertEqual(encodings, ["gzip", None, None, None, None])
+        self.assertEqual(gzip.decompress(client.sent[0].body), TEXT)
+
+        stats = client.compression_stats()
+        self.assertEqual(stats["sent_compressed"], 1)
+        self.assertEqual(stats["sent_bytes_uncompressed"], len(TEXT))
+        self.assertEqual(stats["sent_bytes_compressed"], len(client.sent[0].body))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk response cache store
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.cache import CacheEntry, ResponseCache
+from gurt.diskcache import DiskCacheStore
+from gurt.message import GurtRequest, GurtResponse, GurtMethod
+
+
+def make_entry(body, **headers):
+    return CacheEntry(200, "OK", dict({"cache-control": "max-age=60"}, **headers), body)
+
+
+class TestDiskCacheStore(unittest.TestCase):
+    """Test storage, eviction and sharing of the disk store"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_round_trip_is_memory_mapped(self):
+        """Bodies come back as memoryviews over the blob file"""
+        store = DiskCacheStore(self.path)
+        store.put("GET gurt://example.com:4878/app.lua", make_entry(b"print('hi')", etag='"a"'))
+
+        entry = store.get("GET gurt://example.com:4878/app.lua")
+
+        self.assertIsInstance(entry.body, memoryview)
+        self.assertEqual(bytes(entry.body), b"print('hi')")
+        self.assertEqual(entry.headers["etag"], '"a"')
+        self.assertIsNone(store.get("GET gurt://example.com:4878/missing"))
+
+    def test_shared_between_instances(self):
+        """A second store on the same directory (another process) sees the entries"""
+        first = DiskCacheStore(self.path)
+        second = DiskCacheStore(self.path)
+
+        first.put("a", make_entry(b"one"))
+        self.assertEqual(bytes(second.get("a").body), b"one")
+
+        second.put("b", make_entry(b"two"))
+        first.delete("a")
+        self.assertEqual(sorted(second.keys()), ["b"])
+        self.assertEqual(sorted(first.keys()), ["b"])
+
+    def test_identical_bodies_share_a_blob(self):
+        store = DiskCacheStore(self.path)
+        store.put("a", make_entry(b"same"))
+        store.put("b", make_entry(b"same"))
+
+        self.assertEqual(store.stats()["blobs"], 1)
+
+        store.delete("a")
+        self.assertEqual(bytes(store.get("b").body), b"same")
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted once the size limit is passed"""
+        store = DiskCacheStore(self.path, max_bytes=250)
+        store.put("a", make_entry(b"a" * 100))
+        store.put("b", make_entry(b"b" * 100))
+        store.get("a")
+        store.put("c", make_entry(b"c" * 100))
+
+        self.assertEqual(sorted(store.keys()), ["a", "c"])
+        self.assertEqual(store.stats()["evictions"], 1)
+        self.assertEqual(store.stats()["disk_size"], 200)
+
+    def test_clear(self):
+        store = DiskCacheStore(self.path)
+        store.put("a", make_entry(b"x"))
+        store.clear()
+
+        self.assertEqual(store.stats()["entries"], 0)
+        self.assertEqual(os.listdir(os.path.join(self.path, "blobs", os.listdir(os.path.join(self.path, "blobs"))[0])), [])
+
+    def test_response_cache_on_disk(self):
+        """Responses cached by one ResponseCache are served by a fresh one"""
+        url = "gurt://example.com:4878/data.json"
+        request = GurtRequest(GurtMethod.GET, "/data.json")
+        response = GurtResponse.ok().with_header("cache-control", "max-age=60").with_body(b'{"a": 1}')
+
+        ResponseCache(DiskCacheStore(self.path)).finish(url, request, response, None)
+
+        cache = ResponseCache(DiskCacheStore(self.path))
+        entry = cache.lookup(url, request)
+        self.assertTrue(entry.is_fresh())
+        self.assertEqual(cache.hit(entry).json(), {"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
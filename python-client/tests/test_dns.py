@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for Gurted DNS resolution and caching
+"""
+
+import argparse
+import json
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.dns import GurtDNSResolver
+from gurt.message import GurtResponse
+from gurt.errors import GurtDNSError
+from gurt_cli import dns_server
+
+
+class FakeDNSClient:
+    """Answers /resolve-full requests from a fixed table"""
+    
+    def __init__(self, records, delay=0.0):
+        self.records = records
+        self.delay = delay
+        self.requests = []
+    
+    def post(self, url, body, content_type):
+        self.requests.append(json.loads(body)["domain"])
+        time.sleep(self.delay)
+        
+        domain = json.loads(body)["domain"]
+        if domain not in self.records:
+            return GurtResponse.not_found().with_json_body({"error": "Domain not found"})
+        return GurtResponse.ok().with_json_body({"records": self.records[domain]})
+
+
+class TestGurtDNSResolver(unittest.TestCase):
+    """Test resolution, caching and request coalescing"""
+    
+    def test_resolve_a_record(self):
+        """A records are resolved and cached"""
+        client = FakeDNSClient({"example.real": [{"type": "A", "value": "10.0.0.1", "ttl": 60}]})
+        resolver = GurtDNSResolver(client=client)
+        
+        self.assertEqual(resolver.resolve("example.real"), "10.0.0.1")
+        self.assertEqual(resolver.resolve("EXAMPLE.real"), "10.0.0.1")
+        self.assertEqual(client.requests, ["example.real"])
+        
+        stats = resolver.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+    
+    def test_static_addresses(self):
+        """IP addresses and localhost skip the DNS server"""
+        client = FakeDNSClient({})
+        resolver = GurtDNSResolver(client=client)
+        
+        self.assertEqual(resolver.resolve("192.168.1.10"), "192.168.1.10")
+        self.assertEqual(resolver.resolve("localhost"), "127.0.0.1")
+        self.assertEqual(client.requests, [])
+    
+    def test_ttl_expiry(self):
+        """Records are looked up again once their TTL has passed"""
+        client = FakeDNSClient({"example.real": [{"type": "A", "value": "10.0.0.1", "ttl": 0}]})
+        resolver = GurtDNSResolver(client=client)
+        
+        resolver.resolve("example.real")
+        resolver.resolve("example.real")
+        self.assertEqual(len(client.requests), 2)
+    
+    def test_negative_caching(self):
+        """Unknown domains are cached as failures"""
+        client = FakeDNSClient({"cname.real": [{"type": "CNAME", "value": "other.real", "ttl": 60}]})
+        resolver = GurtDNSResolver(client=client)
+        
+        for _ in range(2):
+            with self.assertRaises(GurtDNSError):
+                resolver.resolve("missing.real")
+            with self.assertRaises(GurtDNSError):
+                resolver.resolve("cname.real")
+        
+        self.assertEqual(client.requests, ["missing.real", "cname.real"])
+        self.assertEqual(resolver.stats()["negative_hits"], 2)
+    
+    def test_lru_bound(self):
+        """The cache never holds more than max_entries names"""
+        records = {f"host{i}.real": [{"type": "A", "value": f"10.0.0.{i}"}] for i in range(3)}
+        resolver = GurtDNSResolver(client=FakeDNSClient(records), max_entries=2)
+        
+        for name in records:
+            resolver.resolve(name)
+        self.assertEqual(resolver.stats()["entries"], 2)
+        self.assertIsNone(resolver.cached("host0.real"))
+        self.assertEqual(resolver.cached("host2.real"), "10.0.0.2")
+    
+    def test_concurrent_misses_coalesced(self):
+        """Concurrent lookups of one name share a single DNS request"""
+        client = FakeDNSClient({"example.real": [{"type": "A", "value": "10.0.0.1"}]}, delay=0.1)
+        resolver = GurtDNSResolver(client=client)
+        results = []
+        
+        threads = [
+            threading.Thread(target=lambda: results.append(resolver.resolve("example.real")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results, ["10.0.0.1"] * 8)
+        self.assertEqual(client.requests, ["example.real"])
+        stats = resolver.stats()
+        self.assertEqual(stats["coalesced"] + stats["hits"], 7)
+
+
+
+class TestDNSServerOption(unittest.TestCase):
+    """Test parsing of the CLI's --dns-server IP[:PORT]"""
+    
+    def test_parse(self):
+        self.assertEqual(dns_server("10.0.0.1"), ("10.0.0.1", 4878))
+        self.assertEqual(dns_server("10.0.0.1:53"), ("10.0.0.1", 53))
+        for value in ("foo:bar", "10.0.0.1:", "10.0.0.1:70000", ":53"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                dns_server(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for segmented, resumable downloads
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import sys
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.download import Downloader, parse_content_range, PART_SUFFIX, STATE_SUFFIX
+from gurt.message import GurtResponse
+from gurt.protocol import GurtStatusCode
+from gurt.errors import GurtConnectionError, GurtDownloadError, GurtProtocolError
+
+
+class FlakyBody(io.RawIOBase):
+    """A body that fails with a connection error after ``fail_after`` bytes"""
+
+    def __init__(self, data: bytes, fail_after=None):
+        super().__init__()
+        self._data = io.BytesIO(data)
+        self._fail_after = fail_after
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._fail_after is not None:
+            if self._fail_after <= 0:
+                raise GurtConnectionError("Connection reset")
+            buffer = memoryview(buffer)[:self._fail_after]
+        nbytes = self._data.readinto(buffer)
+        if self._fail_after is not None:
+            self._fail_after -= nbytes
+        return nbytes
+
+
+class RangeClient(GurtClient):
+    """Serves ``data`` with byte ranges instead of sending requests"""
+
+    def __init__(self, data: bytes, ranges: bool = True, etag: str = '"v1"', fail=None):
+        super().__init__(GurtClientConfig(read_chunk_size=8192))
+        self.data = data
+        self.ranges = ranges
+        self.etag = etag
+        self.fail = fail  # fail(start) -> bytes to send before failing, or None
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def _send_request_internal(self, host, port, request, stream=False):
+        header = request.get_header("range")
+        with self._lock:
+            self.requested.append(header)
+        size = len(self.data)
+
+        if not (self.ranges and header):
+            response = GurtResponse.ok()
+            body = self.data
+            start = 0
+        else:
+            first, _, last = header[len("bytes="):].partition("-")
+            start, end = int(first), min(int(last), size - 1)
+            if start >= size:
+                response = GurtResponse(GurtStatusCode.RANGE_NOT_SATISFIABLE)
+                response.headers["content-range"] = f"bytes */{size}"
+                return response
+            response = GurtResponse(GurtStatusCode.PARTIAL_CONTENT)
+            response.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            body = self.data[start:end + 1]
+
+        response.headers["content-length"] = str(len(body))
+        response.headers["etag"] = self.etag
+        response.raw = FlakyBody(body, self.fail(start) if self.fail else None)
+        return response
+
+
+class TestContentRange(unittest.TestCase):
+    """Test content-range parsing"""
+
+    def test_parse(self):
+        self.assertEqual(parse_content_range("bytes 0-99/1000"), (0, 99, 1000))
+        self.assertEqual(parse_content_range("bytes 10-19/*"), (10, 19, None))
+        self.assertEqual(parse_content_range("bytes */0"), (None, None, 0))
+        for value in (None, "", "bytes 5-1/10", "bytes 0-10/10", "items 0-1/2", "bytes 0-1", "bytes a-b/3"):
+            with self.assertRaises(GurtProtocolError):
+                parse_content_range(value)
+
+
+class TestDownloader(unittest.TestCase):
+    """Test segmented downloads against a fake ranged server"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "artifact.bin")
+        self.data = os.urandom(1_000_003)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _read(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def _leftovers(self):
+        return [name for name in os.listdir(self.directory) if name != "artifact.bin"]
+
+    def test_segmented(self):
+        client = RangeClient(self.data)
+        updates = []
+        result = client.download("gurt://example.real/artifact.bin", self.path, connections=4,
+                                 segment_size=100_000, progress=lambda received, size: updates.append(received))
+
+        self.assertEqual(self._read(), self.data)
+        self.assertTrue(result.ranged)
+        self.assertEqual((result.size, result.segments, result.connections), (len(self.data), 11, 4))
+        self.assertEqual((result.bytes_received, result.resumed_bytes, result.retries), (len(self.data), 0, 0))
+        self.assertEqual(max(updates), len(self.data))
+        self.assertEqual(len(client.requested), 11)  # The first range doubles as the probe
+        self.assertEqual(self._leftovers(), [])
+
+    def test_server_ignores_ranges(self):
+        client = RangeClient(self.data, ranges=False)
+        result = client.download("gurt://example.real/artifact.bin", self.path, segment_size=100_000)
+
+        self.assertEqual(self._read(), self.data)
+        self.assertFalse(result.ranged)
+        self.assertEqual(result.segments, 1)
+        self.assertEqual(self._leftovers(), [])
+
+    def test_empty_resource(self):
+        client = RangeClient(b"")
+        result = client.download("gurt://example.real/artifact.bin", self.path)
+        self.assertEqual(self._read(), b"")
+        self.assertEqual(result.size, 0)
+
+    def test_segments_retry_from_where_they_stopped(self):
+        failed = set()
+
+        def fail(start):
+            # Every segment drops once, part-way through
+            if start % 100_000 == 0 and start not in failed:
+                failed.add(start)
+                return 30_000
+            return None
+
+        client = RangeClient(self.data, fail=fail)
+        result = client.download("gurt://example.real/artifact.bin", self.path, segment_size=100_000)
+
+        self.assertEqual(self._read(), self.data)
+        self.assertEqual(result.retries, 10)  # The last segment is shorter than 30 KB
+        self.assertEqual(result.bytes_received, len(self.data))
+        self.assertIn("bytes=130000-199999", client.requested)
+
+    def test_resume_after_failure(self):
+        url = "gurt://example.real/artifact.bin"
+        broken = RangeClient(self.data, fail=lambda start: 10_000 if start >= 500_000 else None)
+        with self.assertRaises(GurtConnectionError):
+            broken.download(url, self.path, connections=1, segment_size=100_000, retries=1)
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(self.path + PART_SUFFIX))
+        self.assertTrue(os.path.exists(self.path + STATE_SUFFIX))
+
+        client = RangeClient(self.data)
+        result = client.download(url, self.path, segment_size=100_000)
+
+        self.assertEqual(self._read(), self.data)
+        # Later segments may have started before the failure stopped the download
+        self.assertGreaterEqual(result.resumed_bytes, 520_000)
+        self.assertEqual(result.bytes_received, len(self.data) - result.resumed_bytes)
+        self.assertEqual(client.requested[0], "bytes=520000-599999")
+        self.assertEqual(self._leftovers(), [])
+
+    def test_resume_from_checkpoint_after_crash(self):
+        url = "gurt://example.real/artifact.bin"
+        client = RangeClient(self.data)
+        original = client._send_request_internal
+        snapshot = {}
+
+        def send(host, port, request, stream=False):
+            if request.get_header("range") == "bytes=600000-699999":
+                # The process dies here: keep the files exactly as they are on disk now
+                for suffix in (PART_SUFFIX, STATE_SUFFIX):
+                    with open(self.path + suffix, 'rb') as f:
+                        snapshot[suffix] = f.read()
+            return original(host, port, request, stream)
+
+        client._send_request_internal = send
+        downloader = Downloader(client, url, self.path, connections=1, segment_size=100_000)
+        downloader.checkpoint_size = 150_000
+        downloader.run()
+
+        os.remove(self.path)
+        for suffix, data in snapshot.items():
+            with open(self.path + suffix, 'wb') as f:
+                f.write(data)
+
+        resumed = RangeClient(self.data)
+        result = resumed.download(url, self.path, segment_size=100_000)
+
+        self.assertEqual(self._read(), self.data)
+        # Checkpoints land on read boundaries: at least 3 x 150_000 bytes were saved before the crash
+        self.assertGreaterEqual(result.resumed_bytes, 450_000)
+        self.assertLess(result.resumed_bytes, 600_000)
+        self.assertEqual(result.bytes_received, len(self.data) - result.resumed_bytes)
+        self.assertEqual(self._leftovers(), [])
+
+    def test_changed_resource_starts_over(self):
+        url = "gurt://example.real/artifact.bin"
+        broken = RangeClient(self.data, fail=lambda start: 0 if start >= 300_000 else None)
+        with self.assertRaises(GurtConnectionError):
+            broken.download(url, self.path, connections=1, segment_size=100_000, retries=0)
+
+        changed = bytes(reversed(self.data))
+        result = RangeClient(changed, etag='"v2"').download(url, self.path, segment_size=100_000)
+
+        self.assertEqual(self._read(), changed)
+        self.assertEqual(result.resumed_bytes, 0)
+        self.assertEqual(result.bytes_received, len(changed))
+
+    def test_resource_changed_during_download(self):
+        client = RangeClient(self.data)
+        original = client._send_request_internal
+
+        def send(host, port, request, stream=False):
+            if len(client.requested) == 1:
+                client.ranges = False  # Answers the If-Range check with the whole, new resource
+            return original(host, port, request, stream)
+
+        client._send_request_internal = send
+        with self.assertRaises(GurtDownloadError):
+            client.download("gurt://example.real/artifact.bin", self.path, connections=1, segment_size=100_000)
+
+    def test_invalid_arguments(self):
+        client = RangeClient(self.data)
+        with self.assertRaises(ValueError):
+            client.download("gurt://example.real/a", self.path, connections=0)
+        with self.assertRaises(ValueError):
+            client.download("gurt://example.real/a", self.path, segment_size=64 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the GURT header collection
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.headers import GurtHeaders
+from gurt.message import GurtResponse, GurtParser
+from gurt.protocol import GurtStatusCode
+from gurt.errors import GurtProtocolError
+
+
+class TestGurtHeaders(unittest.TestCase):
+    """Test lookup, repeated headers and serialization"""
+
+    def test_case_insensitive_and_ordered(self):
+        headers = GurtHeaders({"Content-Type": "text/plain", "X-Id": "1"})
+        headers["content-length"] = "4"
+
+        self.assertEqual(headers["CONTENT-TYPE"], "text/plain")
+        self.assertIn("x-ID", headers)
+        self.assertEqual(headers.content_type, "text/plain")
+        self.assertEqual(headers.content_length, 4)
+        self.assertEqual(list(headers), ["content-type", "x-id", "content-length"])
+        self.assertEqual(headers, {"content-type": "text/plain", "x-id": "1", "content-length": "4"})
+
+    def test_repeated_headers(self):
+        headers = GurtHeaders([("Set-Cookie", "a=1"), ("Vary", "accept")])
+        headers.add("set-cookie", "b=2")
+
+        self.assertEqual(headers["set-cookie"], "a=1")
+        self.assertEqual(headers.get_all("SET-COOKIE"), ["a=1", "b=2"])
+        self.assertEqual(headers.to_bytes(), b"set-cookie: a=1\r\nvary: accept\r\nset-cookie: b=2\r\n")
+
+        headers["set-cookie"] = "c=3"
+        self.assertEqual(headers.items(), [("set-cookie", "c=3"), ("vary", "accept")])
+
+        del headers["vary"]
+        self.assertEqual(len(headers), 1)
+        self.assertIsNone(headers.get("vary"))
+        self.assertEqual(headers.get_all("vary"), [])
+        with self.assertRaises(KeyError):
+            headers["vary"]
+
+    def test_parsed_names_lowercased_on_use(self):
+        headers = GurtHeaders.parse_lines(["Content-Type : text/html", "no colon here", "ETag: \"v1\""])
+
+        self.assertEqual(headers.items(), [("content-type", "text/html"), ("etag", '"v1"')])
+        self.assertEqual(headers.setdefault("etag", "other"), '"v1"')
+        self.assertEqual(headers.setdefault("age", "0"), "0")
+        with self.assertRaises(ValueError):
+            headers.setdefault("vary", None)
+        self.assertNotIn("vary", headers)
+        self.assertEqual(headers.to_str(), 'content-type: text/html\r\netag: "v1"\r\nage: 0\r\n')
+
+    def test_raw_block_lookups(self):
+        block = "Content-Type: text/html\r\nX-Note: café\r\nSet-Cookie: a=1\r\nset-cookie : b=2\r\nx-set-cookie: c"
+        for raw in (block, block.encode()):
+            headers = GurtHeaders.from_raw(raw)
+            self.assertEqual(headers.get("SET-COOKIE"), "a=1")
+            self.assertEqual(headers.get_all("set-cookie"), ["a=1", "b=2"])
+            self.assertEqual(headers["x-note"], "café")
+            self.assertNotIn("cookie", headers)
+            self.assertEqual(headers.get("missing", "-"), "-")
+
+            # Everything else parses the block, with the same results
+            self.assertEqual(len(headers), 5)
+            self.assertEqual(headers.get_all("set-cookie"), ["a=1", "b=2"])
+
+        ascii_only = GurtHeaders.from_raw("A: 1\r\nb:2\r\nAB: 3")
+        self.assertEqual([ascii_only.get(k) for k in ("a", "b", "ab")], ["1", "2", "3"])
+        ascii_only["b"] = "4"
+        self.assertEqual(ascii_only.to_str(), "a: 1\r\nb: 4\r\nab: 3\r\n")
+
+    def test_indented_names_found_by_every_lookup(self):
+        for block in ("a: 1\r\n  b: 2\r\n\tB : 3\r\nxb: 4", "a: é\r\n  b: 2\r\n\tB : 3\r\nxb: 4"):
+            raw = GurtHeaders.from_raw(block)
+            lookups = (raw.get("b"), raw.get_all("b"), "b" in raw)
+            self.assertEqual(lookups, ("2", ["2", "3"], True))
+
+            parsed = GurtHeaders.from_raw(block)
+            self.assertEqual([value for name, value in parsed.items() if name == "b"], ["2", "3"])
+            self.assertEqual((parsed.get("b"), parsed.get_all("b"), "b" in parsed), lookups)
+
+    def test_copy_is_independent(self):
+        headers = GurtHeaders({"a": "1"})
+        copy = headers.copy()
+        copy["b"] = "2"
+
+        self.assertNotIn("b", headers)
+        self.assertEqual(GurtHeaders().to_bytes(), b"")
+
+    def test_messages_keep_repeated_headers(self):
+        data = (b"GURT/1.0.0 200 OK\r\nSet-Cookie: a=1\r\nset-cookie: b=2\r\n"
+                b"content-length: 2\r\ncontent-length: 2\r\n\r\nok")
+        response = GurtResponse.parse(data)
+        self.assertEqual(response.headers.get_all("set-cookie"), ["a=1", "b=2"])
+
+        parser = GurtParser()
+        parser.feed(data)
+        self.assertTrue(parser.is_complete)
+        self.assertEqual(parser.content_length, 2)
+
+        serialized = GurtResponse.from_head(parser.start_line, parser.headers).with_body(b"ok").to_bytes()
+        self.assertIn(b"set-cookie: a=1\r\nset-cookie: b=2\r\n", serialized)
+
+    def test_conflicting_content_length(self):
+        with self.assertRaises(GurtProtocolError):
+            GurtParser().feed(b"GURT/1.0.0 200 OK\r\ncontent-length: 2\r\ncontent-length: 3\r\n\r\nok")
+
+    def test_response_defaults(self):
+        response = GurtResponse(GurtStatusCode.OK).with_header("Server", "custom").with_body("hi")
+        head = response.head_bytes()
+
+        self.assertIn(b"server: custom\r\n", head)
+        self.assertEqual(head.count(b"server:"), 1)
+        self.assertIn(b"content-length: 2\r\n", head)
+        self.assertNotIn("content-length", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
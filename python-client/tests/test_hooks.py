@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for request hooks and latency histograms
+"""
+
+import socket
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.hooks import Hooks, LatencyCollector, LatencyHistogram
+from gurt.message import GurtResponse
+from gurt.errors import GurtConnectionError
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test percentile estimates"""
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        self.assertEqual(snapshot["max"], 0.1)
+        self.assertAlmostEqual(snapshot["p50"], 0.050, delta=0.050 * 0.06)
+        self.assertAlmostEqual(snapshot["p90"], 0.090, delta=0.090 * 0.06)
+        self.assertAlmostEqual(snapshot["p99"], 0.099, delta=0.099 * 0.06)
+        self.assertAlmostEqual(snapshot["mean"], 0.0505)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.001, count=3)
+        second.record(0.010)
+
+        first.merge(second)
+        self.assertEqual(first.count, 4)
+        self.assertEqual(first.max, 0.010)
+        self.assertAlmostEqual(first.percentile(75), 0.001, delta=0.001 * 0.06)
+
+    def test_coordinated_omission_correction(self):
+        histogram = LatencyHistogram(growth=1.01)
+        histogram.record(0.001, count=99)
+        histogram.record(0.100)
+
+        corrected = histogram.corrected(expected_interval=0.001)
+        # The 100ms stall hid 98 requests that would have waited 99ms, 98ms, ... 2ms
+        self.assertEqual(corrected.count, 100 + 98)
+        self.assertGreater(corrected.percentile(90), 0.050)
+        self.assertAlmostEqual(histogram.percentile(90), 0.001, delta=0.001 * 0.02)
+
+
+class TestHooks(unittest.TestCase):
+    """Test events fired by GurtClient"""
+
+    def setUp(self):
+        self.sockets = []
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+
+    def _client(self, hooks, response_bytes):
+        local, remote = socket.socketpair()
+        self.sockets.extend([local, remote])
+        remote.sendall(response_bytes)
+
+        client = GurtClient(GurtClientConfig(
+            hooks=hooks, enable_connection_pooling=False, enable_tls_session_cache=False
+        ))
+        client._open_connection = lambda host, port, trace=None: local
+        return client
+
+    def test_unknown_event(self):
+        with self.assertRaises(ValueError):
+            Hooks().add("tls_done", print)
+
+    def test_no_trace_without_callbacks(self):
+        hooks = Hooks()
+        self.assertIsNone(hooks.start("example.com", 4878, None))
+
+    def test_request_events(self):
+        hooks = Hooks()
+        events = []
+        for event in ("request_start", "request_sent", "first_byte", "request_end"):
+            hooks.add(event, lambda trace, event=event: events.append(event))
+        collector = LatencyCollector().install(hooks)
+
+        client = self._client(hooks, GurtResponse.ok().with_body(b"x" * 1000).to_bytes())
+        client.get("gurt://example.com/")
+
+        self.assertEqual(events, ["request_start", "request_sent", "first_byte", "request_end"])
+
+        snapshot = collector.snapshot()["example.com:4878"]
+        self.assertEqual(snapshot["counters"]["requests"], 1)
+        self.assertGreater(snapshot["counters"]["bytes_received"], 1000)
+        remote = self.sockets[1]
+        remote.settimeout(1)
+        self.assertEqual(snapshot["counters"]["bytes_sent"], len(remote.recv(65536)))
+        self.assertEqual(snapshot["total"]["count"], 1)
+        self.assertIn("ttfb", snapshot)
+
+    def test_failed_request(self):
+        hooks = Hooks()
+        traces = []
+        hooks.add("request_end", traces.append)
+
+        client = self._client(hooks, b"")
+        self.sockets[1].close()
+        with self.assertRaises(GurtConnectionError):
+            client.get("gurt://example.com/")
+
+        self.assertIsInstance(traces[0].error, GurtConnectionError)
+        self.assertIsNone(traces[0].status_code)
+
+    def test_failing_callback_is_ignored(self):
+        hooks = Hooks()
+        hooks.add("request_start", lambda trace: 1 / 0)
+
+        client = self._client(hooks, GurtResponse.ok().to_bytes())
+        self.assertEqual(client.get("gurt://example.com/").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the load generator behind gurt_cli.py bench
+"""
+
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClientConfig
+from gurt.hooks import Hooks
+from gurt.loadgen import LoadGenerator, format_report
+from gurt.message import GurtResponse, GurtMethod
+from gurt.protocol import GurtStatusCode
+from gurt.errors import GurtTimeoutError
+
+
+class ScriptedLoad(LoadGenerator):
+    """Answers from a script instead of the network"""
+
+    def __init__(self, outcomes, **kwargs):
+        super().__init__("gurt://example.com/", **kwargs)
+        self.outcomes = outcomes
+        self.sent = []
+
+    def _send(self, prepared):
+        with self._lock:
+            outcome = self.outcomes[len(self.sent) % len(self.outcomes)]
+            self.sent.append(time.perf_counter())
+        if isinstance(outcome, Exception):
+            raise outcome
+        return GurtResponse(outcome).with_body(b"ok")
+
+
+class TestLoadGenerator(unittest.TestCase):
+    """Test request accounting and pacing"""
+
+    def test_request_count_and_breakdown(self):
+        load = ScriptedLoad(
+            [GurtStatusCode.OK, GurtStatusCode.OK, GurtStatusCode.SERVICE_UNAVAILABLE, GurtTimeoutError("slow")],
+            concurrency=3, requests=40
+        )
+        result = load.run()
+
+        self.assertEqual(result.requests, 40)
+        self.assertEqual(result.statuses, {200: 20, 503: 10})
+        self.assertEqual(result.errors, {"GurtTimeoutError": 10})
+        self.assertEqual(result.bytes_received, 60)
+        self.assertGreaterEqual(result.latency.count, result.service_time.count)
+        self.assertIn("  GurtTimeoutError: 10", format_report(result))
+
+    def test_open_loop_pacing(self):
+        load = ScriptedLoad([GurtStatusCode.OK], concurrency=2, requests=11, rate=100)
+        result = load.run()
+
+        self.assertEqual(result.requests, 11)
+        self.assertGreaterEqual(max(load.sent) - min(load.sent), 0.1 * 0.9)
+        self.assertEqual(result.to_dict()["rate"], 100)
+
+    def test_duration(self):
+        result = ScriptedLoad([GurtStatusCode.OK], concurrency=1, duration=0.05).run()
+        self.assertGreater(result.requests, 0)
+        self.assertLess(result.elapsed, 1)
+
+    def test_caller_config_unchanged(self):
+        hooks = Hooks()
+        hooks.add("connect", lambda trace: None)
+        config = GurtClientConfig(hooks=hooks, max_connections_per_host=2)
+        ScriptedLoad([GurtStatusCode.OK], concurrency=8, requests=4, config=config).run()
+
+        self.assertIs(config.hooks, hooks)
+        self.assertEqual(len(hooks._callbacks["connect"]), 1)
+        self.assertNotIn("tls", hooks._callbacks)
+        self.assertEqual(config.max_connections_per_host, 2)
+
+    def test_needs_a_limit(self):
+        with self.assertRaises(ValueError):
+            LoadGenerator("gurt://example.com/", GurtMethod.GET)
+
+
+if __name__ == "__main__":
+    unittest.main()
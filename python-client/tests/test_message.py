@@ -10,7 +10,10 @@ import os
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from gurt.message import GurtRequest, GurtResponse, GurtMethod
+from gurt.message import (
+    GurtRequest, GurtResponse, GurtMethod, GurtParser,
+    StartLine, Headers, BodyChunk, MessageComplete
+)
 from gurt.protocol import GurtStatusCode, GURT_VERSION
 from gurt.errors import GurtProtocolError
 
@@ -50,6 +53,53 @@ class TestGurtRequest(unittest.TestCase):
         self.assertIn("content-type: application/json", data_str)
         self.assertIn('{"test": true}', data_str)
     
+    def test_request_file_body(self):
+        """File bodies are streamed with their size as content-length"""
+        import tempfile
+        
+        with tempfile.TemporaryFile() as f:
+            f.write(b"0123456789" * 1000)
+            f.seek(0)
+            
+            request = GurtRequest(GurtMethod.PUT, "/upload").with_body(f)
+            self.assertEqual(request.body_size(), 10000)
+            self.assertIn(b"content-length: 10000", request.head_bytes())
+            self.assertFalse(request.head_bytes().endswith(b"0123"))
+            
+            chunks = [bytes(chunk) for chunk in request.iter_body(4096)]
+            self.assertEqual([len(chunk) for chunk in chunks], [4096, 4096, 1808])
+            self.assertEqual(b"".join(chunks), b"0123456789" * 1000)
+            
+            # Seekable files can be sent again
+            self.assertTrue(request.rewind_body())
+            self.assertEqual(b"".join(bytes(c) for c in request.iter_body()), b"0123456789" * 1000)
+    
+    def test_request_iterator_body(self):
+        """Iterator bodies need a content length that matches what they yield"""
+        with self.assertRaises(GurtProtocolError):
+            GurtRequest(GurtMethod.POST, "/").with_body(iter([b"abc"]))
+        
+        request = GurtRequest(GurtMethod.POST, "/").with_body(iter([b"ab", b"c"]), content_length=3)
+        self.assertEqual(list(request.iter_body()), [b"ab", b"c"])
+        self.assertFalse(request.rewind_body())
+        
+        with self.assertRaises(GurtProtocolError):
+            request.to_bytes()
+        
+        request = GurtRequest(GurtMethod.POST, "/").with_body(iter([b"ab"]), content_length=3)
+        with self.assertRaises(GurtProtocolError):
+            list(request.iter_body())
+    
+    def test_request_memoryview_body(self):
+        """Buffer bodies are kept without copying"""
+        data = bytearray(b"payload")
+        view = memoryview(data)[3:]
+        request = GurtRequest(GurtMethod.POST, "/").with_body(view)
+        
+        self.assertIs(request.body, view)
+        self.assertEqual(request.body_size(), 4)
+        self.assertTrue(request.to_bytes().endswith(b"\r\n\r\nload"))
+    
     def test_request_parsing(self):
         """Test parsing a GURT request"""
         raw_request = f"GET /test GURT/{GURT_VERSION}\r\nHost: example.com\r\nAccept: text/html\r\n\r\ntest body"
@@ -121,6 +171,37 @@ class TestGurtResponse(unittest.TestCase):
         self.assertEqual(response.text(), "<html></html>")
         self.assertTrue(response.is_success())
     
+    def test_response_parsing_is_lazy(self):
+        """Parsed responses refer to the raw data and decode headers and body on use"""
+        data = (f"GURT/{GURT_VERSION} 200 OK\r\nContent-Type: application/json\r\n"
+                f"ETag :  \"v1\"\r\ncontent-length: 9\r\n\r\n{{\"a\": 1}}").encode()
+        response = GurtResponse.parse(data)
+        
+        self.assertEqual(response.status_code, GurtStatusCode.OK)
+        self.assertEqual(response.get_header("etag"), '"v1"')
+        self.assertEqual(response.headers.content_length, 9)
+        self.assertIsNotNone(response.headers._raw)  # Still unparsed after single lookups
+        
+        self.assertIsInstance(response.body, memoryview)
+        self.assertIs(response.body.obj, data)
+        self.assertEqual(response.content, b'{"a": 1}')
+        self.assertIs(response.json(), response.json())
+        self.assertIs(response.text(), response.text())
+        
+        self.assertEqual(response.headers.items(),
+                         [("content-type", "application/json"), ("etag", '"v1"'), ("content-length", "9")])
+        
+        response.body = b"[1]"
+        self.assertEqual(response.json(), [1])
+        self.assertEqual(response.content, b"[1]")
+    
+    def test_response_parsing_without_body(self):
+        """A message with no body or headers parses to empty ones"""
+        response = GurtResponse.parse(f"GURT/{GURT_VERSION} 204 NO_CONTENT".encode())
+        self.assertEqual(response.status_code, GurtStatusCode.NO_CONTENT)
+        self.assertEqual(len(response.headers), 0)
+        self.assertEqual(response.body, b"")
+    
     def test_status_code_methods(self):
         """Test status code helper methods"""
         # Success
@@ -142,5 +223,109 @@ class TestGurtResponse(unittest.TestCase):
         self.assertTrue(response.is_server_error())
 
 
+
+class TestGurtParser(unittest.TestCase):
+    """Test incremental message parsing"""
+    
+    RAW = f"GURT/{GURT_VERSION} 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 11\r\n\r\nhello world".encode()
+    
+    def _feed_all(self, parser, data, step):
+        events = []
+        for i in range(0, len(data), step):
+            events.extend(parser.feed(data[i:i + step]))
+        return events
+    
+    def test_single_feed(self):
+        """A complete message produces all events at once"""
+        parser = GurtParser()
+        events = parser.feed(self.RAW)
+        
+        self.assertEqual([type(e) for e in events], [StartLine, Headers, BodyChunk, MessageComplete])
+        self.assertEqual(events[0].line, f"GURT/{GURT_VERSION} 200 OK")
+        self.assertEqual(events[1].headers["content-type"], "text/plain")
+        self.assertEqual(events[2].data, b"hello world")
+        self.assertTrue(parser.is_complete)
+    
+    def test_byte_at_a_time(self):
+        """The header terminator is found even when split across feeds"""
+        parser = GurtParser()
+        events = self._feed_all(parser, self.RAW, 1)
+        
+        body = b"".join(e.data for e in events if isinstance(e, BodyChunk))
+        self.assertEqual(body, b"hello world")
+        self.assertIsInstance(events[-1], MessageComplete)
+        
+        response = GurtResponse.from_head(parser.start_line, parser.headers)
+        self.assertEqual(response.status_code, GurtStatusCode.OK)
+    
+    def test_trailing_bytes(self):
+        """Bytes after the end of the message are kept"""
+        parser = GurtParser()
+        parser.feed(self.RAW + b"GURT/")
+        self.assertEqual(parser.trailing, b"GURT/")
+    
+    def test_trailing_bytes_from_reused_buffer(self):
+        """Trailing bytes are copied out of a read buffer that is about to be reused"""
+        head, _, body = self.RAW.partition(b"\r\n\r\n")
+        parser = GurtParser()
+        parser.feed(head + b"\r\n\r\n")
+        
+        buffer = bytearray(body + b"GURT/")
+        parser.feed(memoryview(buffer))
+        buffer[:] = b"x" * len(buffer)  # The next socket read
+        parser.feed(memoryview(b"1.0"))
+        self.assertEqual(parser.trailing, b"GURT/1.0")
+    
+    def test_no_body(self):
+        """Messages without content-length, or HEAD responses, complete after the headers"""
+        parser = GurtParser()
+        events = parser.feed(f"GURT/{GURT_VERSION} 204 NO_CONTENT\r\n\r\n".encode())
+        self.assertIsInstance(events[-1], MessageComplete)
+        
+        parser = GurtParser(expect_body=False)
+        events = parser.feed(self.RAW[:self.RAW.index(b"hello")])
+        self.assertIsInstance(events[-1], MessageComplete)
+        self.assertEqual(parser.content_length, 0)
+    
+    def test_request_parsing(self):
+        """Requests are parsed with the same state machine"""
+        raw = f"POST /api GURT/{GURT_VERSION}\r\ncontent-length: 4\r\n\r\nbody".encode()
+        parser = GurtParser()
+        parser.feed(raw)
+        
+        request = GurtRequest.from_head(parser.start_line, parser.headers)
+        self.assertEqual(request.method, GurtMethod.POST)
+        self.assertEqual(request.path, "/api")
+        self.assertEqual(request.get_header("content-length"), "4")
+    
+    def test_advance_body(self):
+        """Body bytes read outside the parser still complete the message"""
+        parser = GurtParser()
+        events = parser.feed(self.RAW[:-5])
+        self.assertEqual(events[-1].data, b"hello ")
+        self.assertEqual(parser.body_remaining, 5)
+        
+        self.assertEqual(parser.advance_body(3), [])
+        self.assertIsInstance(parser.advance_body(2)[0], MessageComplete)
+        self.assertTrue(parser.is_complete)
+        
+        with self.assertRaises(GurtProtocolError):
+            parser.advance_body(1)
+    
+    def test_limits(self):
+        """Size and header limits are enforced while feeding"""
+        with self.assertRaises(GurtProtocolError):
+            GurtParser(max_header_size=16).feed(b"GURT/1.0.0 200 OK\r\nx-long: " + b"a" * 32)
+        
+        with self.assertRaises(GurtProtocolError):
+            GurtParser(max_message_size=16).feed(b"GURT/1.0.0 200 OK\r\ncontent-length: 100\r\n\r\n")
+        
+        with self.assertRaises(GurtProtocolError):
+            GurtParser(max_header_count=1).feed(b"GURT/1.0.0 200 OK\r\na: 1\r\nb: 2\r\n\r\n")
+        
+        with self.assertRaises(GurtProtocolError):
+            GurtParser().feed(b"GURT/1.0.0 200 OK\r\ncontent-length: abc\r\n\r\n")
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
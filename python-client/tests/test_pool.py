@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the GURT connection pool
+"""
+
+import unittest
+import socket
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.pool import ConnectionPool
+from gurt.protocol import MAX_POOL_SIZE, POOL_IDLE_TIMEOUT
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test connection reuse and eviction"""
+
+    def setUp(self):
+        self.sockets = []
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+
+    def _socket_pair(self):
+        local, remote = socket.socketpair()
+        self.sockets.extend([local, remote])
+        return local, remote
+
+    def test_reuse_live_connection(self):
+        """A released connection is handed out again"""
+        pool = ConnectionPool()
+        local, _ = self._socket_pair()
+
+        self.assertIsNone(pool.acquire("example.com", 4878))
+        pool.release("example.com", 4878, local)
+        self.assertEqual(pool.idle_count("example.com", 4878), 1)
+
+        self.assertIs(pool.acquire("example.com", 4878), local)
+        self.assertIsNone(pool.acquire("example.com", 4878))
+
+    def test_pool_keyed_by_host_and_port(self):
+        """Connections are not shared between ports"""
+        pool = ConnectionPool()
+        local, _ = self._socket_pair()
+
+        pool.release("example.com", 4878, local)
+        self.assertIsNone(pool.acquire("example.com", 8080))
+        self.assertIsNone(pool.acquire("other.com", 4878))
+
+    def test_closed_by_peer_is_discarded(self):
+        """A connection the server closed is not reused"""
+        pool = ConnectionPool()
+        local, remote = self._socket_pair()
+
+        pool.release("example.com", 4878, local)
+        remote.close()
+
+        self.assertIsNone(pool.acquire("example.com", 4878))
+        self.assertEqual(local.fileno(), -1)
+
+    def test_idle_timeout(self):
+        """Connections idle past the timeout are discarded"""
+        pool = ConnectionPool(idle_timeout=0)
+        local, _ = self._socket_pair()
+
+        pool.release("example.com", 4878, local)
+        self.assertIsNone(pool.acquire("example.com", 4878))
+
+    def test_max_connections_per_host(self):
+        """Connections beyond the per-host limit are closed"""
+        pool = ConnectionPool(max_connections_per_host=1)
+        first, _ = self._socket_pair()
+        second, _ = self._socket_pair()
+
+        pool.release("example.com", 4878, first)
+        pool.release("example.com", 4878, second)
+
+        self.assertEqual(pool.idle_count("example.com", 4878), 1)
+        self.assertEqual(second.fileno(), -1)
+
+    def test_close(self):
+        """Closing the pool closes idle connections"""
+        pool = ConnectionPool()
+        local, _ = self._socket_pair()
+
+        pool.release("example.com", 4878, local)
+        pool.close()
+
+        self.assertEqual(local.fileno(), -1)
+        self.assertEqual(pool.idle_count("example.com", 4878), 0)
+
+    def test_client_pool_config(self):
+        """Pool settings come from the client configuration"""
+        client = GurtClient(GurtClientConfig())
+        self.assertEqual(client._pool.max_connections_per_host, MAX_POOL_SIZE)
+        self.assertEqual(client._pool.idle_timeout, POOL_IDLE_TIMEOUT)
+
+        client = GurtClient(GurtClientConfig(enable_connection_pooling=False))
+        self.assertIsNone(client._pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
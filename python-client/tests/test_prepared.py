@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for prepared requests and cached handshake bytes
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.message import GurtRequest, GurtResponse, GurtMethod
+
+
+class RecordingClient(GurtClient):
+    """Records requests instead of sending them"""
+
+    def __init__(self):
+        super().__init__(GurtClientConfig())
+        self.sent = []
+
+    def _send_request_internal(self, host, port, request, stream=False):
+        self.sent.append((host, port, request, stream))
+        return GurtResponse.ok()
+
+
+class TestPreparedRequest(unittest.TestCase):
+    """Test that prepared requests serialize exactly like regular ones"""
+
+    def setUp(self):
+        self.client = RecordingClient()
+        self.url = "gurt://example.real:9000/api/items?page=1"
+
+    def _regular(self, method, body=None, content_type=None, **headers) -> GurtRequest:
+        host, _, path = self.client._parse_gurt_url(self.url)
+        request = self.client._build_request(method, host, path, body, content_type)
+        for key, value in headers.items():
+            request.with_header(key, value)
+        return request
+
+    def test_matches_regular_request(self):
+        prepared = self.client.prepare("post", self.url, content_type="application/json")
+        self.assertEqual((prepared.host, prepared.port, prepared.path), ("example.real", 9000, "/api/items?page=1"))
+
+        for body in (None, b"", '{"id": 1}', b"x" * 100):
+            expected = self._regular(GurtMethod.POST, body, "application/json").to_bytes()
+            self.assertEqual(prepared.build(body).to_bytes(), expected)
+            # Uses the pre-serialized block rather than the generic path
+            self.assertIsNotNone(prepared.build(body)._head_prefix)
+
+    def test_extra_headers(self):
+        prepared = self.client.prepare(GurtMethod.GET, self.url, headers={"Accept": "text/plain"})
+        request = prepared.build(headers={"X-Trace": "abc"})
+
+        expected = self._regular(GurtMethod.GET, **{"Accept": "text/plain", "X-Trace": "abc"})
+        self.assertEqual(request.to_bytes(), expected.to_bytes())
+        self.assertNotIn("x-trace", prepared.headers)
+
+    def test_overridden_header_falls_back(self):
+        prepared = self.client.prepare(GurtMethod.GET, self.url)
+        request = prepared.build(headers={"User-Agent": "custom/1.0"})
+
+        self.assertIsNone(request._head_prefix)
+        self.assertIn(b"user-agent: custom/1.0\r\n", request.to_bytes())
+        self.assertEqual(request.to_bytes().count(b"user-agent"), 1)
+
+    def test_header_changed_after_build(self):
+        prepared = self.client.prepare(GurtMethod.GET, self.url)
+        request = prepared.build().with_header("If-None-Match", '"v1"')
+
+        self.assertIn(b'if-none-match: "v1"\r\n', request.to_bytes())
+        self.assertEqual(request.to_bytes(), self._regular(GurtMethod.GET, **{"If-None-Match": '"v1"'}).to_bytes())
+        self.assertNotIn(b"if-none-match", prepared.build().to_bytes())
+
+    def test_send_goes_through_client(self):
+        prepared = self.client.prepare(GurtMethod.PUT, self.url, content_type="text/plain")
+        prepared.send("one")
+        prepared.send("two", stream=True)
+
+        self.assertEqual([(h, p, r.body, s) for h, p, r, s in self.client.sent],
+                         [("example.real", 9000, b"one", False), ("example.real", 9000, b"two", True)])
+
+
+class TestClientCaches(unittest.TestCase):
+    """Test URL parsing and handshake serialization are reused"""
+
+    def test_handshake_bytes_cached_per_host(self):
+        client = GurtClient(GurtClientConfig())
+        data = client._handshake_data("example.real")
+
+        self.assertEqual(data, client._create_handshake_request("example.real").to_bytes())
+        self.assertIs(client._handshake_data("example.real"), data)
+        self.assertNotEqual(client._handshake_data("other.real"), data)
+
+    def test_url_parse_reused(self):
+        client = GurtClient(GurtClientConfig())
+        self.assertEqual(client._parse_gurt_url("gurt://example.real/a"), ("example.real", 4878, "/a"))
+        self.assertIs(client._parse_gurt_url("gurt://example.real/a"), client._parse_gurt_url("gurt://example.real/a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
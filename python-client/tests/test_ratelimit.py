@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the client-side rate limiter
+"""
+
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.async_client import AsyncGurtClient
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.message import GurtResponse
+from gurt.protocol import GurtStatusCode
+from gurt.ratelimit import RateLimiter, TokenBucket
+from gurt.errors import GurtRateLimitError
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test token accounting and AIMD adjustment"""
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        # Later reservations queue up one token interval apart
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.02)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.02)
+
+    def test_max_wait(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        self.assertEqual(bucket.reserve(max_wait=0), 0)
+        self.assertIsNone(bucket.reserve(max_wait=0))
+        # A refused reservation does not take a token
+        self.assertAlmostEqual(bucket.reserve(), 1, delta=0.05)
+
+    def test_throttle_and_recover(self):
+        bucket = TokenBucket(rate=10, capacity=10, recovery_time=0.1)
+
+        bucket.throttle()
+        bucket.throttle()  # Same burst of 429s, only one decrease
+        self.assertAlmostEqual(bucket.stats()["rate"], 5, delta=0.5)
+
+        time.sleep(0.12)
+        self.assertEqual(bucket.stats()["rate"], 10)
+
+    def test_throttle_retry_after(self):
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.throttle(retry_after=0.5)
+        self.assertGreaterEqual(bucket.reserve(), 0.45)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test per-host and per-prefix limits in the clients"""
+
+    def _client(self, limiter, status=GurtStatusCode.OK):
+        sent = []
+
+        def send_once(host, port, request, stream=False):
+            sent.append((time.monotonic(), request.path))
+            return GurtResponse(status)
+
+        client = GurtClient(GurtClientConfig(rate_limiter=limiter))
+        client._send_once = send_once
+        return client, sent
+
+    def test_blocking_pacing(self):
+        client, sent = self._client(RateLimiter(rate=50, burst=1))
+
+        for _ in range(4):
+            client.get("gurt://example.com/")
+
+        self.assertGreaterEqual(sent[-1][0] - sent[0][0], 3 / 50 * 0.9)
+
+    def test_fail_fast(self):
+        client, sent = self._client(RateLimiter(rate=1, burst=2, max_wait=0))
+
+        client.get("gurt://example.com/")
+        client.get("gurt://example.com/")
+        with self.assertRaises(GurtRateLimitError):
+            client.get("gurt://example.com/")
+        self.assertEqual(len(sent), 2)
+
+    def test_hosts_and_prefixes_are_separate(self):
+        limiter = RateLimiter(rate=1, burst=1, path_limits={"/domain": (1, 1)}, max_wait=0)
+        client, sent = self._client(limiter)
+
+        client.get("gurt://a.example/")
+        client.get("gurt://b.example/")
+        client.post("gurt://a.example/domain", "{}")
+        with self.assertRaises(GurtRateLimitError):
+            client.post("gurt://a.example/domain", "{}")
+
+        self.assertEqual(len(sent), 3)
+        self.assertEqual(sorted(limiter.stats()), ["a.example:4878", "a.example:4878/domain", "b.example:4878"])
+
+    def test_429_lowers_rate(self):
+        limiter = RateLimiter(rate=100, burst=10)
+        client, _ = self._client(limiter, GurtStatusCode.TOO_MANY_REQUESTS)
+
+        client.get("gurt://example.com/")
+
+        stats = limiter.stats()["example.com:4878"]
+        self.assertEqual(stats["throttled"], 1)
+        self.assertLess(stats["rate"], 100)
+
+    def test_async_client_awaits_token(self):
+        sent = []
+
+        class Client(AsyncGurtClient):
+            async def _send_once(self, host, port, request):
+                sent.append(time.monotonic())
+                return GurtResponse.ok()
+
+        async def run():
+            client = Client(GurtClientConfig(rate_limiter=RateLimiter(rate=50, burst=1)))
+            await asyncio.gather(*(client.get("gurt://example.com/") for _ in range(4)))
+
+        asyncio.run(run())
+        self.assertGreaterEqual(max(sent) - min(sent), 3 / 50 * 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the GURT retry policy
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.async_client import AsyncGurtClient
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.message import GurtResponse
+from gurt.protocol import GurtStatusCode
+from gurt.retry import RetryBudget, RetryPolicy, parse_retry_after
+from gurt.errors import GurtConnectionError, GurtTLSError
+
+
+class ScriptedServer:
+    """Returns (or raises) the scripted outcomes in order"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self, host, port, request, stream=False):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = GurtResponse(GurtStatusCode(outcome[0]))
+        for key, value in outcome[1].items():
+            response.with_header(key, value)
+        return response
+
+
+def unavailable(**headers):
+    return (503, headers)
+
+
+OK = (200, {})
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test retry decisions through the blocking client"""
+
+    def _client(self, server, **policy_args):
+        attempts = []
+        policy_args.setdefault("backoff_base", 0)
+        policy = RetryPolicy(on_attempt=attempts.append, **policy_args)
+        client = GurtClient(GurtClientConfig(retry_policy=policy, enable_connection_pooling=False))
+        client._send_once = server
+        return client, policy, attempts
+
+    def test_retries_transient_status_and_errors(self):
+        server = ScriptedServer(unavailable(), GurtConnectionError("reset"), OK)
+        client, policy, attempts = self._client(server)
+
+        response = client.get("gurt://example.com/")
+
+        self.assertEqual(response.status_code, GurtStatusCode.OK)
+        self.assertEqual(server.calls, 3)
+        self.assertEqual([a.outcome for a in attempts], ["503", "GurtConnectionError", "200"])
+        self.assertEqual([a.will_retry for a in attempts], [True, True, False])
+        self.assertEqual(policy.stats()["retries"], 2)
+
+    def test_gives_up_after_max_attempts(self):
+        server = ScriptedServer(unavailable(), unavailable(), unavailable())
+        client, policy, _ = self._client(server, max_attempts=2)
+
+        self.assertEqual(client.get("gurt://example.com/").status_code, GurtStatusCode.SERVICE_UNAVAILABLE)
+        self.assertEqual(server.calls, 2)
+        self.assertEqual(policy.stats()["exhausted"], 1)
+
+    def test_non_idempotent_and_non_retryable(self):
+        """POST and TLS errors are not retried by default"""
+        client, _, _ = self._client(ScriptedServer(unavailable(), OK))
+        self.assertEqual(client.post("gurt://example.com/", "x").status_code, GurtStatusCode.SERVICE_UNAVAILABLE)
+
+        client, _, _ = self._client(ScriptedServer(GurtTLSError("bad certificate"), OK))
+        with self.assertRaises(GurtTLSError):
+            client.get("gurt://example.com/")
+
+    def test_unreplayable_body_not_retried(self):
+        server = ScriptedServer(unavailable(), OK)
+        client, _, _ = self._client(server)
+
+        client.put("gurt://example.com/", iter([b"data"]), content_length=4)
+        self.assertEqual(server.calls, 1)
+
+    def test_retry_after(self):
+        server = ScriptedServer(unavailable(**{"retry-after": "0"}), unavailable(**{"retry-after": "3600"}), OK)
+        client, _, attempts = self._client(server, max_attempts=5)
+
+        response = client.get("gurt://example.com/")
+
+        # The second wait is longer than max_retry_after, so the response is returned instead
+        self.assertEqual(response.status_code, GurtStatusCode.SERVICE_UNAVAILABLE)
+        self.assertEqual([a.delay for a in attempts], [0, 0])
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+        self.assertEqual(parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+    def test_full_jitter_backoff(self):
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.5)
+        for attempt in range(1, 10):
+            delay = policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(0.5, 0.1 * 2 ** (attempt - 1)))
+
+
+class TestRetryBudget(unittest.TestCase):
+    """Test the client-wide retry cap"""
+
+    def test_ratio_of_requests(self):
+        budget = RetryBudget(ratio=0.5, min_retries_per_second=0)
+        for _ in range(4):
+            budget.record_request()
+
+        self.assertEqual([budget.try_acquire() for _ in range(3)], [True, True, False])
+
+    def test_budget_stops_retries(self):
+        server = ScriptedServer(unavailable(), unavailable())
+        budget = RetryBudget(ratio=0, min_retries_per_second=0)
+        client = GurtClient(GurtClientConfig(retry_policy=RetryPolicy(backoff_base=0, budget=budget)))
+        client._send_once = server
+
+        client.get("gurt://example.com/")
+
+        self.assertEqual(server.calls, 1)
+        self.assertEqual(client.config.retry_policy.stats()["budget_exhausted"], 1)
+
+
+class TestAsyncRetry(unittest.TestCase):
+    """Test retries in the asyncio client"""
+
+    def test_async_retry(self):
+        server = ScriptedServer(GurtConnectionError("refused"), OK)
+
+        async def send_once(host, port, request):
+            return server(host, port, request)
+
+        client = AsyncGurtClient(GurtClientConfig(retry_policy=RetryPolicy(backoff_base=0)))
+        client._send_once = send_once
+
+        response = asyncio.run(client.get("gurt://example.com/"))
+        self.assertEqual(response.status_code, GurtStatusCode.OK)
+        self.assertEqual(server.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
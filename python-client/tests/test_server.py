@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio GURT server
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.async_client import AsyncGurtClient
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.compression import compress
+from gurt.message import GurtResponse, GurtMethod
+from gurt.protocol import GurtStatusCode
+from gurt.server import GurtServer, Route, Router
+from gurt.errors import GurtError
+
+
+class TestRouter(unittest.TestCase):
+    """Test route matching"""
+
+    def test_exact_prefix_and_any(self):
+        router = Router()
+        router.add(Route(GurtMethod.GET, "/"), "index")
+        router.add(Route(GurtMethod.GET, "/api/*"), "api")
+        router.add(Route(GurtMethod.GET, "/api/v2/*"), "v2")
+        router.add(Route(None, "/api/status"), "status")
+
+        self.assertEqual(router.find(GurtMethod.GET, "/?page=2"), "index")
+        self.assertEqual(router.find(GurtMethod.GET, "/api/users"), "api")
+        self.assertEqual(router.find(GurtMethod.GET, "/api/v2/users"), "v2")
+        self.assertEqual(router.find(GurtMethod.POST, "/api/status"), "status")
+        self.assertIsNone(router.find(GurtMethod.POST, "/"))
+        self.assertEqual(router.allowed_methods("/"), ["GET", "OPTIONS"])
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is needed to create a test certificate")
+class TestGurtServer(unittest.TestCase):
+    """Test the server against the sync and async clients"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.cert = os.path.join(cls.directory, "cert.pem")
+        cls.key = os.path.join(cls.directory, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1",
+             "-nodes", "-keyout", cls.key, "-out", cls.cert, "-days", "1", "-subj", "/CN=localhost"],
+            check=True, capture_output=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        if getattr(self, "server", None):
+            self._run(self.server.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def _start(self, **kwargs) -> str:
+        self.server = GurtServer(**kwargs).load_tls_certificates(self.cert, self.key)
+
+        @self.server.get("/")
+        def index(ctx):
+            return GurtResponse.ok().with_body(f"hello {ctx.client_ip}")
+
+        @self.server.post("/echo")
+        async def echo(ctx):
+            await asyncio.sleep(0)
+            return GurtResponse.ok().with_header("content-type", ctx.header("content-type")).with_body(ctx.body)
+
+        @self.server.get("/fail")
+        def fail(ctx):
+            raise RuntimeError("broken")
+
+        self._run(self.server.start("127.0.0.1", 0))
+        return f"gurt://127.0.0.1:{self.server.port}"
+
+    def _client(self, **kwargs) -> GurtClient:
+        client = GurtClient(GurtClientConfig(**kwargs))
+        self.clients.append(client)
+        return client
+
+    def test_requests_share_one_connection(self):
+        base = self._start()
+        client = self._client()
+
+        self.assertEqual(client.get(base + "/").text(), "hello 127.0.0.1")
+        response = client.post(base + "/echo", b"\x00payload", content_type="application/octet-stream")
+        self.assertEqual(response.body, b"\x00payload")
+        self.assertEqual(response.get_header("content-type"), "application/octet-stream")
+        self.assertEqual(client.get(base + "/missing").status_code, 404)
+        self.assertEqual(client.get(base + "/fail").status_code, 500)
+
+        stats = self.server.stats()
+        self.assertEqual(stats["handshakes"], 1)
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["server_errors"], 1)
+
+    def test_handler_returning_none(self):
+        base = self._start()
+
+        @self.server.get("/nothing")
+        def nothing(ctx):
+            return None
+
+        @self.server.get("/nothing-async")
+        async def nothing_async(ctx):
+            return None
+
+        client = self._client()
+        self.assertEqual(client.get(base + "/nothing").status_code, 500)
+        self.assertEqual(client.get(base + "/nothing-async").status_code, 500)
+        self.assertEqual(client.get(base + "/").status_code, 200)  # The connection is still usable
+
+    def test_handshake_date_is_current(self):
+        server = GurtServer()
+        dates = iter(["Mon, 01 Jan 2029 00:00:00 GMT", "Mon, 01 Jan 2029 00:00:00 GMT", "Mon, 01 Jan 2029 00:00:01 GMT"])
+        server._date.get = lambda: next(dates)
+
+        first = server._handshake_reply()
+        self.assertIn(b"date: Mon, 01 Jan 2029 00:00:00 GMT", first)
+        self.assertIs(server._handshake_reply(), first)  # Reused within the same second
+        self.assertIn(b"date: Mon, 01 Jan 2029 00:00:01 GMT", server._handshake_reply())
+
+    def test_head_and_options(self):
+        base = self._start()
+        client = self._client()
+
+        head = client.head(base + "/")
+        self.assertEqual(head.body, b"")
+        self.assertEqual(head.get_header("content-length"), str(len("hello 127.0.0.1")))
+
+        options = client.options(base + "/echo")
+        self.assertEqual(options.get_header("allow"), "OPTIONS, POST")
+
+    def test_large_body(self):
+        base = self._start()
+        body = os.urandom(3 * 1024 * 1024)
+        self.assertEqual(self._client().post(base + "/echo", body).body, body)
+
+    def test_async_client_concurrency(self):
+        base = self._start()
+
+        async def run():
+            async with AsyncGurtClient(GurtClientConfig(max_connections_per_host=4)) as client:
+                return await asyncio.gather(*(client.post(base + "/echo", str(i)) for i in range(20)))
+
+        responses = asyncio.run(run())
+        self.assertEqual([r.text() for r in responses], [str(i) for i in range(20)])
+
+    def test_connection_limit(self):
+        base = self._start(max_connections=1)
+        self._client().get(base + "/")
+
+        with self.assertRaises(GurtError):
+            self._client().get(base + "/")
+        self.assertEqual(self.server.stats()["connections_rejected"], 1)
+
+    def test_ranged_download(self):
+        base = self._start()
+        data = os.urandom(2 * 1024 * 1024 + 17)
+
+        @self.server.get("/artifact")
+        def artifact(ctx):
+            first, _, last = (ctx.header("range") or "bytes=0-").partition("=")[2].partition("-")
+            start, end = int(first), min(int(last or len(data) - 1), len(data) - 1)
+            return (GurtResponse(GurtStatusCode.PARTIAL_CONTENT)
+                    .with_header("content-range", f"bytes {start}-{end}/{len(data)}")
+                    .with_body(data[start:end + 1]))
+
+        path = os.path.join(self.directory, "artifact.bin")
+        result = self._client().download(base + "/artifact", path, connections=3, segment_size=256 * 1024)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), data)
+        self.assertEqual((result.segments, result.connections), (9, 3))
+        self.assertLessEqual(self.server.stats()["handshakes"], 3)
+
+    def test_compression(self):
+        base = self._start(compression_min_size=1024, max_decoded_size=100_000)
+        listing = [{"name": f"site{i}", "tld": "web"} for i in range(500)]
+
+        @self.server.get("/domains")
+        def domains(ctx):
+            return GurtResponse.ok().with_json_body(listing)
+
+        client = self._client(compress_requests_min_size=1024)
+        response = client.get(base + "/domains")
+        self.assertEqual(response.get_header("content-encoding"), "gzip")
+        self.assertEqual(response.get_header("vary"), "accept-encoding")
+        self.assertEqual(response.json(), listing)
+
+        text = "compressible text " * 1000
+        echoed = client.post(base + "/echo", text, content_type="text/plain")
+        self.assertEqual(echoed.text(), text)  # Decoded by the server, compressed again on the way back
+        binary = os.urandom(4096)
+        self.assertEqual(client.post(base + "/echo", binary, content_type="application/octet-stream").body, binary)
+        self.assertIsNone(client.head(base + "/domains").get_header("content-encoding"))
+
+        stats = client.compression_stats()
+        self.assertEqual((stats["sent_compressed"], stats["received_compressed"]), (1, 2))
+        self.assertGreater(stats["received_ratio"], 5)
+        server_stats = self.server.stats()
+        self.assertEqual((server_stats["sent_compressed"], server_stats["received_compressed"]), (2, 1))
+        self.assertEqual(server_stats["received_bytes_uncompressed"], len(text))
+
+        bomb = compress(b"\0" * 200_000, "gzip")  # Decodes past the server's max_decoded_size
+        upload = client.prepare("POST", base + "/echo", "application/octet-stream", {"content-encoding": "gzip"})
+        self.assertEqual(upload.send(bomb).status_code, GurtStatusCode.BAD_REQUEST)
+
+        plain = self._client(enable_compression=False).get(base + "/domains")
+        self.assertIsNone(plain.get_header("content-encoding"))
+        self.assertEqual(plain.json(), listing)
+
+    def test_rejects_request_without_handshake(self):
+        self._start()
+
+        async def run():
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+            writer.write(b"GET / GURT/1.0.0\r\n\r\n")
+            data = await reader.read()
+            writer.close()
+            return data
+
+        self.assertTrue(asyncio.run(run()).startswith(b"GURT/1.0.0 400"))
+
+
+if __name__ == "__main__":
+    unittest.main()
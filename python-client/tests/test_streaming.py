@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed response bodies
+"""
+
+import socket
+import threading
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.message import GurtResponse
+from gurt.streaming import GurtBodyStream
+from gurt.errors import GurtConnectionError
+
+
+class TestGurtBodyStream(unittest.TestCase):
+    """Test reading bodies that are still on the connection"""
+    
+    def setUp(self):
+        self.local, self.remote = socket.socketpair()
+        self.released = []
+    
+    def tearDown(self):
+        self.local.close()
+        self.remote.close()
+    
+    def _stream(self, body, sent_with_headers):
+        """Read the head of a response whose body is only partly sent"""
+        client = GurtClient(GurtClientConfig(read_chunk_size=1024))
+        head = f"GURT/1.0.0 200 OK\r\ncontent-length: {len(body)}\r\n\r\n".encode()
+        self.remote.sendall(head + body[:sent_with_headers])
+        
+        response, parser, body_parts = client._read_head(self.local)
+        response.raw = GurtBodyStream(self.local, parser, b"".join(body_parts), self.released.append)
+        return response
+    
+    def test_iter_content(self):
+        """The body is delivered in chunks and the connection released at the end"""
+        body = os.urandom(50000)
+        response = self._stream(body, 100)
+        sender = threading.Thread(target=self.remote.sendall, args=(body[100:],))
+        sender.start()
+        
+        chunks = list(response.iter_content(4096))
+        sender.join()
+        
+        self.assertEqual(b"".join(chunks), body)
+        self.assertTrue(all(len(chunk) <= 4096 for chunk in chunks))
+        self.assertEqual(self.released, [True])
+    
+    def test_text_reads_remaining_body(self):
+        """text() drains a streamed body"""
+        response = self._stream(b"hello world", 5)
+        self.remote.sendall(b" world")
+        
+        self.assertEqual(response.text(), "hello world")
+        self.assertIsNone(response.raw)
+        self.assertEqual(self.released, [True])
+    
+    def test_early_close_discards_connection(self):
+        """Closing before the body is drained makes the connection unusable"""
+        response = self._stream(b"0123456789", 2)
+        self.assertEqual(response.raw.read(1), b"0")
+        
+        response.close()
+        self.assertEqual(self.released, [False])
+    
+    def test_connection_closed_mid_body(self):
+        """A truncated body raises and discards the connection"""
+        response = self._stream(b"0123456789", 0)
+        self.remote.sendall(b"0123")
+        self.remote.close()
+        
+        with self.assertRaises(GurtConnectionError):
+            response.read()
+        self.assertEqual(self.released, [False])
+    
+    def test_complete_with_headers(self):
+        """A body received with the headers releases once it is read"""
+        response = self._stream(b"abc", 3)
+        self.assertEqual(self.released, [])
+        self.assertEqual(response.read(), b"abc")
+        self.assertEqual(self.released, [True])
+    
+    def test_iter_content_buffered(self):
+        """iter_content also works on fully buffered responses"""
+        response = GurtResponse.ok().with_body(b"abcdefg")
+        self.assertEqual(list(response.iter_content(3)), [b"abc", b"def", b"g"])
+
+
+if __name__ == "__main__":
+    unittest.main()
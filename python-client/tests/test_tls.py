@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the TLS session resumption cache
+"""
+
+import time
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gurt.client import GurtClient, GurtClientConfig
+from gurt.tls import TLSSessionCache
+
+
+class FakeSession:
+    """Stand-in for ssl.SSLSession"""
+    
+    def __init__(self, has_ticket=True, lifetime=7200):
+        self.has_ticket = has_ticket
+        self.time = int(time.time())
+        self.timeout = lifetime
+
+
+class TestTLSSessionCache(unittest.TestCase):
+    """Test session storage, expiry and counters"""
+    
+    def test_store_and_get(self):
+        """Sessions are stored per (host, port)"""
+        cache = TLSSessionCache()
+        session = FakeSession()
+        
+        cache.put("example.com", 4878, session)
+        self.assertIs(cache.get("example.com", 4878), session)
+        self.assertIsNone(cache.get("example.com", 8080))
+    
+    def test_sessions_without_ticket_ignored(self):
+        """Sessions that cannot be resumed are not cached"""
+        cache = TLSSessionCache()
+        cache.put("example.com", 4878, FakeSession(has_ticket=False))
+        cache.put("example.com", 4878, None)
+        self.assertIsNone(cache.get("example.com", 4878))
+    
+    def test_expiry(self):
+        """Sessions expire with the cache max age or the ticket lifetime"""
+        cache = TLSSessionCache(max_age=0)
+        cache.put("example.com", 4878, FakeSession())
+        self.assertIsNone(cache.get("example.com", 4878))
+        
+        cache = TLSSessionCache()
+        cache.put("example.com", 4878, FakeSession(lifetime=0))
+        self.assertIsNone(cache.get("example.com", 4878))
+    
+    def test_max_entries(self):
+        """The least recently used session is evicted"""
+        cache = TLSSessionCache(max_entries=2)
+        cache.put("a.com", 4878, FakeSession())
+        cache.put("b.com", 4878, FakeSession())
+        cache.get("a.com", 4878)
+        cache.put("c.com", 4878, FakeSession())
+        
+        self.assertIsNotNone(cache.get("a.com", 4878))
+        self.assertIsNone(cache.get("b.com", 4878))
+    
+    def test_counters(self):
+        """Handshake outcomes are counted"""
+        cache = TLSSessionCache()
+        cache.record_handshake(offered=False, reused=False)
+        cache.record_handshake(offered=True, reused=True)
+        cache.record_handshake(offered=True, reused=False)
+        
+        stats = cache.stats()
+        self.assertEqual(stats["offered"], 2)
+        self.assertEqual(stats["resumed"], 1)
+        self.assertEqual(stats["full_handshakes"], 2)
+    
+    def test_client_config(self):
+        """The session cache can be disabled"""
+        client = GurtClient(GurtClientConfig(enable_tls_session_cache=False))
+        self.assertIsNone(client._session_cache)
+        self.assertEqual(client.tls_session_stats()["resumed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()